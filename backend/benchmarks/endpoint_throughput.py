@@ -0,0 +1,91 @@
+"""
+Load-tests API endpoints end to end without spending Riot API quota.
+
+Record a cassette once against the real API, then start the API in replay
+mode and point this script at it:
+
+    RIOT_API_CASSETTE_MODE=record uvicorn main:app
+    # ...hit the endpoints you want to benchmark once...
+
+    RIOT_API_CASSETTE_MODE=replay RIOT_API_CASSETTE_LATENCY=0.08 \\
+        RIOT_API_CASSETTE_429_RATE=0.01 uvicorn main:app
+
+    python -m benchmarks.endpoint_throughput --clear-cache \\
+        --path /v2/account/?region=EUW&username=name&tag=tag \\
+        --path /v2/league/<puuid>
+
+--clear-cache empties the Redis and in-memory caches first, so the run
+includes the Firestore and Riot API tiers instead of only L1 hits.
+"""
+
+import argparse
+import asyncio
+import collections
+import statistics
+import time
+
+import httpx
+
+
+async def run(
+    base_url: str, paths: list[str], requests: int, concurrency: int
+) -> tuple[float, list[float], collections.Counter]:
+    latencies: list[float] = []
+    statuses: collections.Counter = collections.Counter()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0) as client:
+
+        async def fetch(index: int):
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(paths[index % len(paths)])
+                    statuses[response.status_code] += 1
+                except httpx.HTTPError as e:
+                    statuses[type(e).__name__] += 1
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(fetch(index) for index in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    return elapsed, latencies, statuses
+
+
+async def clear_cache(base_url: str) -> None:
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        response = await client.post("/admin/clear-cache")
+        response.raise_for_status()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--path", action="append", required=True, dest="paths")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--clear-cache", action="store_true")
+    args = parser.parse_args()
+
+    if args.clear_cache:
+        asyncio.run(clear_cache(args.base_url))
+
+    elapsed, latencies, statuses = asyncio.run(
+        run(args.base_url, args.paths, args.requests, args.concurrency)
+    )
+    percentiles = statistics.quantiles(latencies, n=100)
+
+    print(f"{args.requests / elapsed:.0f} req/s ({args.requests} in {elapsed:.2f}s)")
+    print(
+        f"latency p50={percentiles[49] * 1000:.1f}ms "
+        f"p95={percentiles[94] * 1000:.1f}ms p99={percentiles[98] * 1000:.1f}ms"
+    )
+    print(
+        "statuses: "
+        + ", ".join(f"{k}={v}" for k, v in sorted(statuses.items(), key=str))
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Compares FirestoreClient.batch_get with the per-document loop it replaced,
+on a cold match-history page (up to 100 match documents).
+
+Run from the backend directory:
+
+    python -m benchmarks.firestore_batch_get --rtt 0.02
+
+Firestore is replaced by InMemoryFirestoreClient, which charges one round
+trip per RPC, so the numbers show how many round trips each strategy waits
+on rather than real Firestore latency.
+"""
+
+import argparse
+import asyncio
+import time
+import typing
+
+from utils import in_memory_firestore
+
+
+async def sequential_batch_get(
+    client: in_memory_firestore.InMemoryFirestoreClient,
+    collection: str,
+    document_ids: list[str],
+) -> list[typing.Optional[dict[str, typing.Any]]]:
+    return [await client.get_document(collection, doc_id) for doc_id in document_ids]
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rtt", type=float, default=0.02)
+    parser.add_argument("--hit-rate", type=float, default=0.9)
+    args = parser.parse_args()
+
+    for count in (10, 20, 100, 250):
+        document_ids = [f"EUW1_{index}" for index in range(count)]
+        stored = document_ids[: int(count * args.hit_rate)]
+
+        client = in_memory_firestore.InMemoryFirestoreClient(latency=args.rtt)
+        for doc_id in stored:
+            client.get_raw_client().store.setdefault("m", {})[doc_id] = {
+                "metadata": {"matchId": doc_id}
+            }
+
+        timings = {}
+        for name, run in (
+            ("sequential", lambda: sequential_batch_get(client, "m", document_ids)),
+            ("get_all", lambda: client.batch_get("m", document_ids)),
+        ):
+            rpcs = client.rpc_count
+            start = time.perf_counter()
+            results = await run()
+            timings[name] = (time.perf_counter() - start, client.rpc_count - rpcs)
+
+            assert [doc["metadata"]["matchId"] for doc in results if doc] == stored
+
+        print(
+            f"{count:>4} ids: "
+            + ", ".join(
+                f"{name} {elapsed * 1000:7.1f} ms / {rpcs:>3} RPCs"
+                for name, (elapsed, rpcs) in timings.items()
+            )
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,56 @@
+"""
+Measures an L1 hit on a match-history page, storing dumped dicts that are
+re-validated on every hit versus storing the MatchHistory instances.
+
+Run from the backend directory:
+
+    python -m benchmarks.l1_match_history --page-size 20
+"""
+
+import argparse
+import json
+import timeit
+
+from benchmarks import match_decoding
+from modules.match import models, repository
+from utils import cache_client
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    payload = json.loads(match_decoding.build_synthetic_payload())
+    matches = []
+    for index in range(args.page_size):
+        payload["metadata"]["matchId"] = f"EUW1_{index}"
+        matches.append(models.MatchHistory(**payload))
+    match_ids = [match.metadata.matchId for match in matches]
+
+    dumped = {
+        match.metadata.matchId: match.model_dump(mode="json") for match in matches
+    }
+
+    def dict_hit() -> dict[str, models.MatchHistory]:
+        return {
+            match_id: models.MatchHistory(**dumped[match_id]) for match_id in match_ids
+        }
+
+    cache_client.clear_all_caches()
+    match_cache = repository.MatchCache()
+    match_cache.set_match_history(matches)
+
+    for name, hit in (
+        ("dumped dicts", dict_hit),
+        ("model instances", lambda: match_cache.get_match_history(match_ids)),
+    ):
+        assert len(hit()) == args.page_size
+
+        elapsed = min(timeit.repeat(hit, number=args.number, repeat=3))
+        print(f"{name:>16}: {elapsed / args.number * 1_000_000:9.1f} us per page")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Compares ways of turning a match-v5 response body into a MatchHistory.
+
+Run from the backend directory, against a cassette recorded with
+RIOT_API_CASSETTE_MODE=record:
+
+    python -m benchmarks.match_decoding --cassette-dir cassettes
+
+Without recorded matches a synthetic payload of realistic size is used
+(match-v5 sends ~150 fields per participant; the model keeps ~40).
+"""
+
+import argparse
+import glob
+import json
+import os
+import timeit
+
+from modules.match import models
+from utils import json_codec
+
+
+def load_recorded_payloads(directory: str) -> list[bytes]:
+    payloads = []
+
+    for path in glob.glob(os.path.join(directory, "*", "*.json")):
+        with open(path, encoding="utf-8") as file:
+            cassette = json.load(file)
+
+        if (
+            cassette["status_code"] == 200
+            and "/lol/match/v5/matches/" in cassette["url"]
+            and not cassette["url"].split("?")[0].endswith("/ids")
+        ):
+            payloads.append(cassette["body"].encode("utf-8"))
+
+    return payloads
+
+
+def build_synthetic_payload() -> bytes:
+    perks = {
+        "statPerks": {"defense": 5001, "flex": 5008, "offense": 5005},
+        "styles": [
+            {
+                "description": "primaryStyle",
+                "selections": [
+                    {"perk": 8010, "var1": 1, "var2": 2, "var3": 3} for _ in range(4)
+                ],
+                "style": 8000,
+            },
+            {
+                "description": "subStyle",
+                "selections": [
+                    {"perk": 8210, "var1": 1, "var2": 2, "var3": 3} for _ in range(2)
+                ],
+                "style": 8200,
+            },
+        ],
+    }
+    participant = {
+        **{name: 1 for name in models.ParticipantStats.model_fields},
+        **{f"unusedStat{index}": index for index in range(110)},
+        "championName": "Ahri",
+        "perks": perks,
+        "puuid": "p" * 78,
+        "riotIdGameName": "name",
+        "riotIdTagline": "tag",
+        "summonerName": "name",
+        "teamPosition": "MIDDLE",
+        "win": True,
+        "gameEndedInEarlySurrender": False,
+    }
+    objective = {"first": True, "kills": 3}
+    team = {
+        "bans": [{"championId": 1, "pickTurn": turn} for turn in range(5)],
+        "objectives": {
+            name: objective for name in ("baron", "champion", "dragon", "tower")
+        },
+        "teamId": 100,
+        "win": True,
+    }
+    payload = {
+        "metadata": {"matchId": "EUW1_1", "participants": ["p" * 78] * 10},
+        "info": {
+            "gameDuration": 1800,
+            "gameMode": "CLASSIC",
+            "gameStartTimestamp": 1700000000000,
+            "gameType": "MATCHED_GAME",
+            "gameVersion": "14.1.1",
+            "mapId": 11,
+            "participants": [participant] * 10,
+            "platformId": "EUW1",
+            "queueId": 420,
+            "teams": [team, {**team, "teamId": 200, "win": False}],
+        },
+    }
+
+    return json.dumps(payload).encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cassette-dir", default="cassettes")
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    payloads = load_recorded_payloads(args.cassette_dir) or [build_synthetic_payload()]
+    average_size = sum(len(payload) for payload in payloads) / len(payloads)
+    print(f"{len(payloads)} payload(s), {average_size / 1024:.1f} KB on average")
+
+    strategies = {
+        "json + MatchHistory(**data)": lambda payload: models.MatchHistory(
+            **json.loads(payload)
+        ),
+        "json_codec + MatchHistory(**data)": lambda payload: models.MatchHistory(
+            **json_codec.loads(payload)
+        ),
+        "model_validate_json(bytes)": models.MatchHistory.model_validate_json,
+    }
+
+    for name, decode in strategies.items():
+        elapsed = min(
+            timeit.repeat(
+                lambda: [decode(payload) for payload in payloads],
+                number=args.number,
+                repeat=3,
+            )
+        )
+        per_payload = elapsed / (args.number * len(payloads)) * 1_000_000
+        print(f"{name:>36}: {per_payload:8.1f} us per match")
+
+    print(f"orjson available: {json_codec.HAS_ORJSON}")
+
+
+if __name__ == "__main__":
+    main()
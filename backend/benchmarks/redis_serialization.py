@@ -0,0 +1,87 @@
+"""
+Measures the CPU cost of one match-history Redis hit per serializer: turning
+the stored bytes back into a MatchHistory, excluding the network round trip.
+Every variant goes through RedisClient._decode, the path get_json takes.
+
+Run from the backend directory:
+
+    python -m benchmarks.redis_serialization --cassette-dir cassettes
+
+Uses recorded match payloads when a cassette is available. Every stat in the
+synthetic fallback from benchmarks.match_decoding is the same small integer,
+so its numbers only show which way a change goes, not by how much.
+"""
+
+import argparse
+import json
+import statistics
+import timeit
+
+from benchmarks import match_decoding
+from modules.match import models
+from utils import redis_client, serializers
+
+
+def legacy_hit(stored: bytes) -> models.MatchHistory:
+    # decode_responses=True connection, then stdlib json, then validation.
+    return models.MatchHistory(**json.loads(stored.decode("utf-8")))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cassette-dir", default="cassettes")
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=7)
+    args = parser.parse_args()
+
+    payloads = match_decoding.load_recorded_payloads(args.cassette_dir)
+    if payloads:
+        print(f"{len(payloads)} recorded match(es)")
+    else:
+        payloads = [match_decoding.build_synthetic_payload()]
+        print("no recorded matches, using the synthetic payload")
+
+    # Redis stores the validated model, not the raw Riot response.
+    cached_values = [
+        models.MatchHistory.model_validate_json(payload).model_dump(mode="json")
+        for payload in payloads
+    ]
+
+    variants = {
+        "legacy (str + json)": (
+            [json.dumps(value).encode("utf-8") for value in cached_values],
+            legacy_hit,
+        )
+    }
+    for name in serializers.SERIALIZERS:
+        client = redis_client.RedisClient(serializer=serializers.get_serializer(name))
+        variants[f"{name} (bytes)"] = (
+            [client._encode("match_history", value) for value in cached_values],
+            lambda value, client=client: models.MatchHistory(
+                **client._decode("match_history", value)
+            ),
+        )
+
+    # Rounds alternate between variants so drift in CPU frequency or cache
+    # state spreads over all of them instead of favouring whichever runs last.
+    timings: dict[str, list[float]] = {name: [] for name in variants}
+    for _ in range(args.rounds):
+        for name, (stored, hit) in variants.items():
+            elapsed = timeit.timeit(
+                lambda: [hit(value) for value in stored], number=args.number
+            )
+            timings[name].append(elapsed / (args.number * len(stored)) * 1_000_000)
+
+    baseline = statistics.median(timings["legacy (str + json)"])
+    for name, (stored, _) in variants.items():
+        per_hit = statistics.median(timings[name])
+        spread = max(timings[name]) - min(timings[name])
+        size = sum(len(value) for value in stored) / len(stored) / 1024
+        print(
+            f"{name:>20}: {per_hit:8.1f} us per hit (+/- {spread / 2:5.1f}), "
+            f"{size:6.1f} KB stored, {(per_hit / baseline - 1) * 100:+6.1f}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Measures RiotAPIClient request throughput against a local stub server.
+
+Run from the backend directory:
+
+    python -m benchmarks.riot_client_throughput --requests 2000 --concurrency 100 --tls
+
+The stub (uvicorn) only speaks HTTP/1.1, so the numbers compare connection
+reuse and pool sizing. --tls serves a throwaway self-signed certificate, which
+makes every new connection pay for a handshake like it does against Riot.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import subprocess
+import tempfile
+import time
+import typing
+
+import structlog
+import uvicorn
+
+os.environ.setdefault("RIOT_API_KEY", "benchmark")
+os.environ.setdefault("RIOT_APP_RATE_LIMIT", "1000000:1")
+
+from utils import connection_pool, riot_api_client  # noqa: E402
+
+structlog.configure(
+    wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+)
+
+MATCH_PAYLOAD = json.dumps(
+    {
+        "metadata": {"matchId": "EUW1_1", "participants": ["puuid"] * 10},
+        "info": {"gameDuration": 1800, "participants": [{"kills": 1}] * 10},
+    }
+).encode()
+
+
+async def stub_app(scope, receive, send):
+    if scope["type"] != "http":
+        return
+
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/json")],
+        }
+    )
+    await send({"type": "http.response.body", "body": MATCH_PAYLOAD})
+
+
+def create_certificate(directory: str) -> tuple[str, str]:
+    keyfile = os.path.join(directory, "key.pem")
+    certfile = os.path.join(directory, "cert.pem")
+
+    subprocess.run(
+        [
+            "openssl",
+            "req",
+            "-x509",
+            "-newkey",
+            "rsa:2048",
+            "-nodes",
+            "-subj",
+            "/CN=127.0.0.1",
+            "-addext",
+            "subjectAltName=IP:127.0.0.1",
+            "-days",
+            "1",
+            "-keyout",
+            keyfile,
+            "-out",
+            certfile,
+        ],
+        check=True,
+        capture_output=True,
+    )
+
+    return keyfile, certfile
+
+
+def start_stub_server(
+    certificate: typing.Optional[tuple[str, str]] = None,
+) -> tuple[multiprocessing.Process, str]:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    ssl_kwargs = (
+        {"ssl_keyfile": certificate[0], "ssl_certfile": certificate[1]}
+        if certificate
+        else {}
+    )
+
+    # The stub runs in its own process so it does not compete with the client
+    # for the GIL.
+    server = multiprocessing.Process(
+        target=uvicorn.run,
+        args=(stub_app,),
+        kwargs={
+            "port": port,
+            "log_level": "warning",
+            "access_log": False,
+            **ssl_kwargs,
+        },
+        daemon=True,
+    )
+    server.start()
+
+    while True:
+        with socket.socket() as sock:
+            if sock.connect_ex(("127.0.0.1", port)) == 0:
+                break
+        time.sleep(0.05)
+
+    scheme = "https" if certificate else "http"
+
+    return server, f"{scheme}://127.0.0.1:{port}"
+
+
+async def run(
+    base_url: str,
+    pool: connection_pool.HostConnectionPool,
+    requests: int,
+    concurrency: int,
+) -> float:
+    client = riot_api_client.RiotAPIClient(pool, base_urls={"europe": base_url})
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(index: int):
+        async with semaphore:
+            await client.get("europe", f"/lol/match/v5/matches/EUW1_{index}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(fetch(index) for index in range(requests)))
+    elapsed = time.perf_counter() - start
+
+    await pool.aclose()
+
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--tls", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        certificate = create_certificate(directory) if args.tls else None
+        server, base_url = start_stub_server(certificate)
+        verify = certificate[1] if certificate else True
+
+        scenarios = {
+            "no keep-alive": {"max_connections": 100, "max_keepalive_connections": 0},
+            "httpx defaults": {
+                "max_connections": 100,
+                "max_keepalive_connections": 20,
+                "keepalive_expiry": 5.0,
+            },
+            "per-host pool": {"max_connections": 20, "max_keepalive_connections": 10},
+            "small pool": {"max_connections": 10, "max_keepalive_connections": 10},
+        }
+
+        for name, pool_kwargs in scenarios.items():
+            pool = connection_pool.HostConnectionPool(**pool_kwargs, verify=verify)
+            elapsed = asyncio.run(run(base_url, pool, args.requests, args.concurrency))
+            print(
+                f"{name:>16}: {args.requests / elapsed:8.0f} req/s "
+                f"({args.requests} requests in {elapsed:.2f}s)"
+            )
+
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -21,7 +21,7 @@ dotenv.load_dotenv()
 
 @contextlib.asynccontextmanager
 async def lifespan(app: fastapi.FastAPI):
-    utils.get_redis_client()
+    utils.get_redis_client().start_near_cache()
     utils.get_firestore_client()
     utils.get_http_client()
     utils.get_riot_api_client()
@@ -67,9 +67,14 @@ if os.getenv("ENVIRONMENT", "development") == "development":
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor"],
     )
 
 app.add_middleware(GZipMiddleware, minimum_size=500)
+app.add_middleware(
+    utils.DeadlineMiddleware,
+    seconds=float(os.getenv("REQUEST_DEADLINE_SECONDS", "5")),
+)
 
 ledger_client = ledger.LedgerClient(api_key=os.getenv("LEDGER_API_KEY"))  # type: ignore
 app.add_middleware(
@@ -101,9 +106,30 @@ async def health_check():
     redis_client = utils.get_redis_client()
     redis_healthy = await redis_client.ping()
 
+    riot_api_client = utils.get_riot_api_client()
+
     return {
         "status": "healthy",
         "redis": "connected" if redis_healthy else "disconnected",
+        "riot_api": {
+            "requests": riot_api_client.get_coalescing_stats(),
+            "circuit_breakers": riot_api_client.get_circuit_breaker_states(),
+            "connection_pools": riot_api_client.get_connection_pool_stats(),
+        },
+        "firestore": {
+            "retries": utils.get_firestore_client().get_retry_stats(),
+        },
+    }
+
+
+@app.get("/admin/cache-stats")
+async def cache_stats():
+    redis_client = utils.get_redis_client()
+
+    return {
+        "redis": redis_client.get_compression_stats(),
+        "near_cache": redis_client.get_near_cache_stats(),
+        "stampede": utils.get_stampede_guard().get_stats(),
     }
 
 
@@ -2,6 +2,8 @@ import pydantic
 
 
 class Account(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
     gameName: str
     tagLine: str
     puuid: str
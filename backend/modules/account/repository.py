@@ -35,18 +35,16 @@ class AccountCache:
 
         cached_data = self.cache_account.get(cache_key)
         if cached_data is not None:
-            return models.Account(**cached_data)
+            return cached_data
 
         return None
 
     def set_account(self, account: models.Account) -> None:
-        account_data = account.model_dump(mode='json')
-
         cache_key_puuid = f"{self.cache_prefix}:puuid:{account.puuid}"
-        self.cache_account.set(cache_key_puuid, account_data)
+        self.cache_account.set(cache_key_puuid, account)
 
         cache_key_username = f"{self.cache_prefix}:username:{account.gameName}#{account.tagLine}:region={account.region.upper()}"
-        self.cache_account.set(cache_key_username, account_data)
+        self.cache_account.set(cache_key_username, account)
 
 
 class AccountRedis:
@@ -79,10 +77,12 @@ class AccountRedis:
         ttl = CACHE_SETTINGS["ttl"]
 
         redis_key_puuid = f"{self.cache_prefix}:puuid:{account.puuid}"
-        await self.redis_client.set_json(redis_key_puuid, account_data, ex=ttl)
-
         redis_key_username = f"{self.cache_prefix}:username:{account.gameName}#{account.tagLine}:region={account.region.upper()}"
-        await self.redis_client.set_json(redis_key_username, account_data, ex=ttl)
+
+        await self.redis_client.set_many_json(
+            {redis_key_puuid: account_data, redis_key_username: account_data},
+            ex=ttl,
+        )
 
 
 class AccountFirestore:
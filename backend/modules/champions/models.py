@@ -6,26 +6,45 @@ from modules.pro_players import models as pro_players_models
 
 
 class ChampionName(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
     title: str = ""
     value: str = ""
 
 
 class ChampionStats(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
     games: int = 0
     wins: int = 0
     losses: int = 0
 
 
 class ChampionMastery(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
     championId: int = 0
     championLevel: int = 0
     championPoints: int = 0
 
 
 class ChampionHistory(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
     player: pro_players_models.ProPlayer
     match: match_models.MatchHistory
     enemy: typing.Optional[int] = None
     lane: typing.Optional[
         typing.Literal["TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY"]
     ] = None
+
+
+class ChampionHistoryPage(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
+    matches: list[ChampionHistory]
+    next_cursor: typing.Optional[str] = None
+
+
+class ChampionMatchesCount(pydantic.BaseModel):
+    count: int
@@ -33,6 +33,45 @@ CACHE_SETTINGS = {
 }
 
 
+def champion_matches_count_cache_key(
+    champion_id: int,
+    lane: typing.Optional[str] = None,
+    versus: typing.Optional[str] = None,
+) -> str:
+    cache_key = (
+        f"{CACHE_SETTINGS['champion_matches']['cache_prefix']}:count:{champion_id}"
+    )
+
+    if lane:
+        cache_key += f":{lane}"
+
+    if versus:
+        cache_key += f":{versus}"
+
+    return cache_key
+
+
+def champion_matches_cache_key(
+    champion_id: int,
+    limit: int,
+    lane: typing.Optional[str] = None,
+    versus: typing.Optional[str] = None,
+    cursor: typing.Optional[str] = None,
+) -> str:
+    cache_key = f"{CACHE_SETTINGS['champion_matches']['cache_prefix']}:page:{champion_id}:{limit}"
+
+    if lane:
+        cache_key += f":{lane}"
+
+    if versus:
+        cache_key += f":{versus}"
+
+    if cursor:
+        cache_key += f":{cursor}"
+
+    return cache_key
+
+
 class ChampionsCache:
     def __init__(self):
         self.cache_champions_names = utils.get_ttl_cache_client(
@@ -122,39 +161,46 @@ class ChampionsCache:
         limit: int,
         lane: typing.Optional[str] = None,
         versus: typing.Optional[str] = None,
-    ) -> list[models.ChampionHistory]:
-        cache_prefix = f"{CACHE_SETTINGS['champion_matches']['cache_prefix']}:{champion_id}:{limit}"
-
-        if lane:
-            cache_prefix += f":{lane}"
-
-        if versus:
-            cache_prefix += f":{versus}"
-
-        cached_data = self.cache_champions_matches.get(cache_prefix)
+        cursor: typing.Optional[str] = None,
+    ) -> typing.Optional[models.ChampionHistoryPage]:
+        cache_key = champion_matches_cache_key(champion_id, limit, lane, versus, cursor)
+        cached_data = self.cache_champions_matches.get(cache_key)
 
         if cached_data is not None:
             return cached_data
 
-        return []
+        return None
 
     def set_champion_matches(
         self,
         champion_id: int,
-        champion_matches: list[models.ChampionHistory],
+        champion_matches: models.ChampionHistoryPage,
         limit: int,
         lane: typing.Optional[str] = None,
         versus: typing.Optional[str] = None,
+        cursor: typing.Optional[str] = None,
     ) -> None:
-        cache_prefix = f"{CACHE_SETTINGS['champion_matches']['cache_prefix']}:{champion_id}:{limit}"
+        cache_key = champion_matches_cache_key(champion_id, limit, lane, versus, cursor)
+        self.cache_champions_matches.set(cache_key, champion_matches)
 
-        if lane:
-            cache_prefix += f":{lane}"
-
-        if versus:
-            cache_prefix += f":{versus}"
+    def get_champion_matches_count(
+        self,
+        champion_id: int,
+        lane: typing.Optional[str] = None,
+        versus: typing.Optional[str] = None,
+    ) -> typing.Optional[int]:
+        cache_key = champion_matches_count_cache_key(champion_id, lane, versus)
+        return self.cache_champions_matches.get(cache_key)
 
-        self.cache_champions_matches.set(cache_prefix, champion_matches)
+    def set_champion_matches_count(
+        self,
+        champion_id: int,
+        count: int,
+        lane: typing.Optional[str] = None,
+        versus: typing.Optional[str] = None,
+    ) -> None:
+        cache_key = champion_matches_count_cache_key(champion_id, lane, versus)
+        self.cache_champions_matches.set(cache_key, count)
 
     def get_champion_positions(self) -> dict[str, str]:
         cache_prefix = CACHE_SETTINGS["champion_positions"]["cache_prefix"]
@@ -265,42 +311,51 @@ class ChampionsRedis:
         limit: int,
         lane: typing.Optional[str] = None,
         versus: typing.Optional[str] = None,
-    ) -> list[models.ChampionHistory]:
-        cache_prefix = f"{CACHE_SETTINGS['champion_matches']['cache_prefix']}:{champion_id}:{limit}"
-
-        if lane:
-            cache_prefix += f":{lane}"
-
-        if versus:
-            cache_prefix += f":{versus}"
-
-        cached_data = await self.redis_client.get_json(cache_prefix)
+        cursor: typing.Optional[str] = None,
+    ) -> typing.Optional[models.ChampionHistoryPage]:
+        cache_key = champion_matches_cache_key(champion_id, limit, lane, versus, cursor)
+        cached_data = await self.redis_client.get_json(cache_key)
 
         if cached_data is not None:
-            return cached_data
+            return models.ChampionHistoryPage(**cached_data)
 
-        return []
+        return None
 
     async def set_champion_matches(
         self,
         champion_id: int,
-        champion_matches: list[models.ChampionHistory],
+        champion_matches: models.ChampionHistoryPage,
         limit: int,
         lane: typing.Optional[str] = None,
         versus: typing.Optional[str] = None,
+        cursor: typing.Optional[str] = None,
     ) -> None:
-        cache_prefix = f"{CACHE_SETTINGS['champion_matches']['cache_prefix']}:{champion_id}:{limit}"
-
-        if lane:
-            cache_prefix += f":{lane}"
+        cache_key = champion_matches_cache_key(champion_id, limit, lane, versus, cursor)
+        await self.redis_client.set_json(
+            cache_key,
+            champion_matches.model_dump(mode="json"),
+            ex=CACHE_SETTINGS["champion_matches"]["ttl"],
+        )
 
-        if versus:
-            cache_prefix += f":{versus}"
+    async def get_champion_matches_count(
+        self,
+        champion_id: int,
+        lane: typing.Optional[str] = None,
+        versus: typing.Optional[str] = None,
+    ) -> typing.Optional[int]:
+        cache_key = champion_matches_count_cache_key(champion_id, lane, versus)
+        return await self.redis_client.get_json(cache_key)
 
+    async def set_champion_matches_count(
+        self,
+        champion_id: int,
+        count: int,
+        lane: typing.Optional[str] = None,
+        versus: typing.Optional[str] = None,
+    ) -> None:
+        cache_key = champion_matches_count_cache_key(champion_id, lane, versus)
         await self.redis_client.set_json(
-            cache_prefix,
-            [match.model_dump(mode="json") for match in champion_matches],
-            ex=CACHE_SETTINGS["champion_matches"]["ttl"],
+            cache_key, count, ex=CACHE_SETTINGS["champion_matches"]["ttl"]
         )
 
     async def get_champion_positions(self) -> dict[str, str]:
@@ -408,16 +463,16 @@ class ChampionsFirestore:
     async def get_champion_matches(
         self,
         champion_id: int,
-        start_after: typing.Optional[str] = None,
+        cursor: typing.Optional[str] = None,
         limit: int = 10,
         lane: typing.Optional[str] = None,
         versus: typing.Optional[str] = None,
-    ) -> list[models.ChampionHistory]:
+    ) -> models.ChampionHistoryPage:
         collection_name = f"champion_history/{str(champion_id)}/matches"
 
-        documents = await self.firestore_client.query_collection(
+        documents, next_cursor = await self.firestore_client.query_collection_page(
             collection_name,
-            start_after=start_after,
+            cursor=cursor,
             limit=limit,
             lane=lane,
             enemy=int(versus) if versus is not None else None,
@@ -427,7 +482,40 @@ class ChampionsFirestore:
 
         matches = [models.ChampionHistory(**document) for document in documents]
 
-        return matches
+        return models.ChampionHistoryPage(matches=matches, next_cursor=next_cursor)
+
+    async def stream_champion_matches(
+        self,
+        champion_id: int,
+        lane: typing.Optional[str] = None,
+        versus: typing.Optional[str] = None,
+    ) -> typing.AsyncIterator[models.ChampionHistory]:
+        collection_name = f"champion_history/{str(champion_id)}/matches"
+
+        documents = self.firestore_client.stream_collection(
+            collection_name,
+            lane=lane,
+            enemy=int(versus) if versus is not None else None,
+            order_by="match.info.gameStartTimestamp",
+            order_direction="DESCENDING",
+        )
+
+        async for document in documents:
+            yield models.ChampionHistory(**document)
+
+    async def get_champion_matches_count(
+        self,
+        champion_id: int,
+        lane: typing.Optional[str] = None,
+        versus: typing.Optional[str] = None,
+    ) -> int:
+        collection_name = f"champion_history/{str(champion_id)}/matches"
+
+        return await self.firestore_client.get_collection_count(
+            collection_name,
+            lane=lane,
+            enemy=int(versus) if versus is not None else None,
+        )
 
     async def get_champion_match(
         self,
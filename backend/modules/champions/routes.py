@@ -11,6 +11,13 @@ logger = structlog.get_logger(__name__)
 router = fastapi.APIRouter(prefix="/v2/champions")
 
 
+def _check_versus(versus: typing.Optional[str]) -> None:
+    if versus is not None and not versus.lstrip("-").isdigit():
+        raise fastapi.HTTPException(
+            status_code=400, detail=f"Invalid champion ID: {versus}"
+        )
+
+
 @router.get(
     "/list",
     response_model=dict[int, models.ChampionName],
@@ -59,7 +66,10 @@ async def get_champion_stats(
 )
 async def get_champion_matches(
     champion_id: int,
-    start_after: typing.Optional[str] = None,
+    response: fastapi.Response,
+    cursor: typing.Optional[str] = fastapi.Query(
+        None, description="X-Next-Cursor of the previous page"
+    ),
     limit: int = fastapi.Query(10, ge=1, le=100),
     lane: typing.Optional[str] = None,
     versus: typing.Optional[str] = None,
@@ -72,19 +82,95 @@ async def get_champion_matches(
         limit=limit,
         lane=lane,
         versus=versus,
+        cursor=cursor,
     )
 
+    _check_versus(versus)
+
     champion_service = service.ChampionService(firestore=firestore, redis=redis)
-    champion_matches = await champion_service.get_champion_matches(
-        champion_id, start_after, limit, lane, versus
-    )
 
-    if not champion_matches:
+    try:
+        champion_matches = await champion_service.get_champion_matches(
+            champion_id, cursor, limit, lane, versus
+        )
+    except utils.InvalidCursorError:
+        raise fastapi.HTTPException(status_code=400, detail="Invalid cursor")
+
+    if not champion_matches.matches:
         raise fastapi.HTTPException(
             status_code=404, detail="Champion matches not found"
         )
 
-    return champion_matches
+    if champion_matches.next_cursor:
+        response.headers["X-Next-Cursor"] = champion_matches.next_cursor
+
+    return champion_matches.matches
+
+
+@router.get(
+    "/{champion_id}/matches/count",
+    response_model=models.ChampionMatchesCount,
+    status_code=200,
+)
+async def get_champion_matches_count(
+    champion_id: int,
+    lane: typing.Optional[str] = None,
+    versus: typing.Optional[str] = None,
+    redis: utils.RedisClient = fastapi.Depends(utils.get_redis_client),
+    firestore: utils.FirestoreClient = fastapi.Depends(utils.get_firestore_client),
+) -> models.ChampionMatchesCount:
+    logger.info(
+        "get_champion_matches_count_endpoint_called",
+        champion_id=champion_id,
+        lane=lane,
+        versus=versus,
+    )
+
+    _check_versus(versus)
+
+    champion_service = service.ChampionService(firestore=firestore, redis=redis)
+    count = await champion_service.get_champion_matches_count(champion_id, lane, versus)
+
+    return models.ChampionMatchesCount(count=count)
+
+
+@router.get(
+    "/{champion_id}/matches/stream",
+    response_class=fastapi.responses.StreamingResponse,
+    status_code=200,
+)
+async def stream_champion_matches(
+    champion_id: int,
+    lane: typing.Optional[str] = None,
+    versus: typing.Optional[str] = None,
+    redis: utils.RedisClient = fastapi.Depends(utils.get_redis_client),
+    firestore: utils.FirestoreClient = fastapi.Depends(utils.get_firestore_client),
+) -> fastapi.responses.StreamingResponse:
+    """All matches of a champion as newline-delimited JSON, newest first."""
+    logger.info(
+        "stream_champion_matches_endpoint_called",
+        champion_id=champion_id,
+        lane=lane,
+        versus=versus,
+    )
+
+    # The status line is sent before the first document is read, so the
+    # arguments have to be checked up front.
+    _check_versus(versus)
+
+    champion_service = service.ChampionService(firestore=firestore, redis=redis)
+
+    async def encode_matches() -> typing.AsyncIterator[bytes]:
+        champion_matches = champion_service.stream_champion_matches(
+            champion_id, lane, versus
+        )
+
+        async for champion_match in champion_matches:
+            yield champion_match.model_dump_json().encode("utf-8") + b"\n"
+
+    return fastapi.responses.StreamingResponse(
+        encode_matches(), media_type="application/x-ndjson"
+    )
 
 
 @router.get(
@@ -17,6 +17,7 @@ class ChampionService:
         self.cache_repo = repository.ChampionsCache()
         self.redis_repo = repository.ChampionsRedis(redis)
         self.firestore_repo = repository.ChampionsFirestore(firestore)
+        self.stampede = utils.get_stampede_guard()
 
     async def get_champions_names(self) -> dict[int, models.ChampionName]:
         cache_champions = self.cache_repo.get_all_champions_names()
@@ -24,18 +25,15 @@ class ChampionService:
         if cache_champions:
             return cache_champions
 
-        redis_champions = await self.redis_repo.get_all_champions_names()
-
-        if redis_champions:
-            self.cache_repo.set_all_champions_names(redis_champions)
-            return redis_champions
+        champions = await self.stampede.fetch(
+            key=f"{repository.CACHE_SETTINGS['champion_names']['cache_prefix']}:all",
+            load=self.redis_repo.get_all_champions_names,
+            rebuild=self._rebuild_champions_names,
+        )
 
-        firestore_champions = await self.firestore_repo.get_all_champions_names()
-
-        if firestore_champions:
-            await self.redis_repo.set_all_champions_names(firestore_champions)
-            self.cache_repo.set_all_champions_names(firestore_champions)
-            return firestore_champions
+        if champions:
+            self.cache_repo.set_all_champions_names(champions)
+            return champions
 
         return {}
 
@@ -47,34 +45,32 @@ class ChampionService:
         if cache_champion_stats is not None:
             return cache_champion_stats
 
-        redis_champion_stats = await self.redis_repo.get_champion_stats(champion_id)
-
-        if redis_champion_stats is not None:
-            self.cache_repo.set_champion_stats(champion_id, redis_champion_stats)
-            return redis_champion_stats
+        champion_stats = await self.stampede.fetch(
+            key=f"{repository.CACHE_SETTINGS['champion_stats']['cache_prefix']}:{champion_id}",
+            load=lambda: self.redis_repo.get_champion_stats(champion_id),
+            rebuild=lambda: self._rebuild_champion_stats(champion_id),
+        )
 
-        firestore_champion_stats = await self.firestore_repo.get_champion_stats(champion_id)
-
-        if firestore_champion_stats is not None:
-            await self.redis_repo.set_champion_stats(champion_id, firestore_champion_stats)
-            self.cache_repo.set_champion_stats(champion_id, firestore_champion_stats)
-            return firestore_champion_stats
+        if champion_stats is not None:
+            self.cache_repo.set_champion_stats(champion_id, champion_stats)
+            return champion_stats
 
         return None
 
     async def get_champion_matches(
         self,
         champion_id: int,
-        start_after: str | None = None,
+        cursor: str | None = None,
         limit: int = 10,
         lane: str | None = None,
         versus: str | None = None,
-    ) -> list[models.ChampionHistory]:
+    ) -> models.ChampionHistoryPage:
         cache_champion_matches = self.cache_repo.get_champion_matches(
             champion_id=champion_id,
             limit=limit,
             lane=lane,
             versus=versus,
+            cursor=cursor,
         )
 
         if cache_champion_matches:
@@ -85,6 +81,7 @@ class ChampionService:
             limit=limit,
             lane=lane,
             versus=versus,
+            cursor=cursor,
         )
 
         if redis_champion_matches:
@@ -94,24 +91,26 @@ class ChampionService:
                 limit=limit,
                 lane=lane,
                 versus=versus,
+                cursor=cursor,
             )
             return redis_champion_matches
 
         firestore_champion_matches = await self.firestore_repo.get_champion_matches(
             champion_id=champion_id,
-            start_after=start_after,
+            cursor=cursor,
             limit=limit,
             lane=lane,
             versus=versus,
         )
 
-        if firestore_champion_matches:
+        if firestore_champion_matches.matches:
             await self.redis_repo.set_champion_matches(
                 champion_id=champion_id,
                 champion_matches=firestore_champion_matches,
                 limit=limit,
                 lane=lane,
                 versus=versus,
+                cursor=cursor,
             )
             self.cache_repo.set_champion_matches(
                 champion_id=champion_id,
@@ -119,10 +118,59 @@ class ChampionService:
                 limit=limit,
                 lane=lane,
                 versus=versus,
+                cursor=cursor,
             )
-            return firestore_champion_matches
 
-        return []
+        return firestore_champion_matches
+
+    def stream_champion_matches(
+        self,
+        champion_id: int,
+        lane: str | None = None,
+        versus: str | None = None,
+    ) -> typing.AsyncIterator[models.ChampionHistory]:
+        # Full exports bypass the caches; only pages are worth caching.
+        return self.firestore_repo.stream_champion_matches(
+            champion_id=champion_id,
+            lane=lane,
+            versus=versus,
+        )
+
+    async def get_champion_matches_count(
+        self,
+        champion_id: int,
+        lane: str | None = None,
+        versus: str | None = None,
+    ) -> int:
+        cache_count = self.cache_repo.get_champion_matches_count(
+            champion_id=champion_id, lane=lane, versus=versus
+        )
+
+        if cache_count is not None:
+            return cache_count
+
+        redis_count = await self.redis_repo.get_champion_matches_count(
+            champion_id=champion_id, lane=lane, versus=versus
+        )
+
+        if redis_count is not None:
+            self.cache_repo.set_champion_matches_count(
+                champion_id=champion_id, count=redis_count, lane=lane, versus=versus
+            )
+            return redis_count
+
+        firestore_count = await self.firestore_repo.get_champion_matches_count(
+            champion_id=champion_id, lane=lane, versus=versus
+        )
+
+        await self.redis_repo.set_champion_matches_count(
+            champion_id=champion_id, count=firestore_count, lane=lane, versus=versus
+        )
+        self.cache_repo.set_champion_matches_count(
+            champion_id=champion_id, count=firestore_count, lane=lane, versus=versus
+        )
+
+        return firestore_count
 
     async def get_champion_positions(
         self,
@@ -176,6 +224,7 @@ class ChampionService:
         puuid: str,
         region: str,
         riot_api_client: utils.RiotAPIClient,
+        lane: utils.RequestLane = utils.RequestLane.INTERACTIVE,
     ) -> list[models.ChampionMastery]:
         cache_champions_mastery = self.cache_repo.get_champions_mastery(puuid)
 
@@ -196,6 +245,7 @@ class ChampionService:
         response = await riot_api_client.get(
             mapped_region,
             f"/lol/champion-mastery/v4/champion-masteries/by-puuid/{puuid}",
+            lane=lane,
         )
 
         if response:
@@ -211,6 +261,24 @@ class ChampionService:
 
         return []
 
+    async def _rebuild_champions_names(self) -> dict[int, models.ChampionName]:
+        firestore_champions = await self.firestore_repo.get_all_champions_names()
+
+        if firestore_champions:
+            await self.redis_repo.set_all_champions_names(firestore_champions)
+
+        return firestore_champions
+
+    async def _rebuild_champion_stats(
+        self, champion_id: int
+    ) -> typing.Optional[models.ChampionStats]:
+        firestore_champion_stats = await self.firestore_repo.get_champion_stats(champion_id)
+
+        if firestore_champion_stats is not None:
+            await self.redis_repo.set_champion_stats(champion_id, firestore_champion_stats)
+
+        return firestore_champion_stats
+
     def _find_highest_playrate_role(self, champion_data: dict, champion_id: str) -> str:
         roles = champion_data.get(champion_id, None)
 
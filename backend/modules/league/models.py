@@ -1,7 +1,11 @@
+import typing
+
 import pydantic
 
 
 class LeagueEntry(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
     leagueId: str
     queueType: str
     tier: str
@@ -17,6 +21,8 @@ class LeagueEntry(pydantic.BaseModel):
 
 
 class LeaderboardEntry(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
     gameName: str
     tagLine: str
     puuid: str
@@ -25,3 +31,17 @@ class LeaderboardEntry(pydantic.BaseModel):
     wins: int
     losses: int
     league: str
+
+
+class LeaderboardPage(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
+    entries: list[LeaderboardEntry]
+    next_cursor: typing.Optional[str] = None
+
+
+class LeaderboardStats(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
+    count: int
+    average_league_points: typing.Optional[float] = None
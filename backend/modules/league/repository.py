@@ -1,3 +1,5 @@
+import typing
+
 import utils
 
 from . import models
@@ -5,6 +7,7 @@ from . import models
 CACHE_SETTINGS = {
     "league_entries": {
         "cache_name": "league_entries",
+        "soft_ttl": 600,  # 10 minutes, served stale and refreshed after this
         "ttl": 1800,  # 30 minutes
         "cache_prefix": "league_entries",
     },
@@ -16,11 +19,23 @@ CACHE_SETTINGS = {
 }
 
 
+def leaderboard_cache_key(
+    region: str, limit: int, page: int, cursor: typing.Optional[str] = None
+) -> str:
+    # A cursor identifies the page on its own; page numbers are only used by
+    # clients that have not moved to cursors yet.
+    position = cursor or page
+    return f"{CACHE_SETTINGS['leaderboard']['cache_prefix']}:page:{region}:{limit}:{position}"
+
+
 class LeagueCache:
     def __init__(self):
+        # L1 is checked before the stampede guard, so it expires at the soft
+        # TTL; for the full ttl it would serve entries up to 30 minutes old that
+        # never reach the stale-while-revalidate check.
         self.league_entries_cache = utils.get_ttl_cache_client(
             name=CACHE_SETTINGS["league_entries"]["cache_name"],
-            ttl=CACHE_SETTINGS["league_entries"]["ttl"],
+            ttl=CACHE_SETTINGS["league_entries"]["soft_ttl"],
         )
         self.leaderboard_cache = utils.get_ttl_cache_client(
             name=CACHE_SETTINGS["leaderboard"]["cache_name"],
@@ -35,7 +50,7 @@ class LeagueCache:
         cached_data = self.league_entries_cache.get(cache_key)
 
         if cached_data is not None:
-            return [models.LeagueEntry(**entry) for entry in cached_data]
+            return list(cached_data)
 
         return []
 
@@ -45,33 +60,53 @@ class LeagueCache:
         league_entries: list[models.LeagueEntry],
     ) -> None:
         cache_key = f"{CACHE_SETTINGS['league_entries']['cache_prefix']}:{puuid}"
-        entries_data = [entry.model_dump(mode='json') for entry in league_entries]
-        self.league_entries_cache.set(cache_key, entries_data)
+        self.league_entries_cache.set(cache_key, tuple(league_entries))
 
     def get_leaderboard(
         self,
         region: str,
         limit: int,
         page: int,
-    ) -> list[models.LeaderboardEntry]:
-        cache_key = f"{CACHE_SETTINGS['leaderboard']['cache_prefix']}:leaderboard:{region}:{limit}:{page}"
+        cursor: typing.Optional[str] = None,
+    ) -> typing.Optional[models.LeaderboardPage]:
+        cache_key = leaderboard_cache_key(region, limit, page, cursor)
         cached_data = self.leaderboard_cache.get(cache_key)
 
         if cached_data is not None:
-            return [models.LeaderboardEntry(**entry) for entry in cached_data]
+            return cached_data
 
-        return []
+        return None
 
     def set_leaderboard(
         self,
         region: str,
         limit: int,
         page: int,
-        leaderboard: list[models.LeaderboardEntry],
+        leaderboard: models.LeaderboardPage,
+        cursor: typing.Optional[str] = None,
     ) -> None:
-        cache_key = f"{CACHE_SETTINGS['leaderboard']['cache_prefix']}:leaderboard:{region}:{limit}:{page}"
-        leaderboard_data = [entry.model_dump(mode='json') for entry in leaderboard]
-        self.leaderboard_cache.set(cache_key, leaderboard_data)
+        cache_key = leaderboard_cache_key(region, limit, page, cursor)
+        self.leaderboard_cache.set(cache_key, leaderboard)
+
+    def get_leaderboard_stats(
+        self,
+        region: str,
+    ) -> typing.Optional[models.LeaderboardStats]:
+        cache_key = f"{CACHE_SETTINGS['leaderboard']['cache_prefix']}:stats:{region}"
+        cached_data = self.leaderboard_cache.get(cache_key)
+
+        if cached_data is not None:
+            return cached_data
+
+        return None
+
+    def set_leaderboard_stats(
+        self,
+        region: str,
+        leaderboard_stats: models.LeaderboardStats,
+    ) -> None:
+        cache_key = f"{CACHE_SETTINGS['leaderboard']['cache_prefix']}:stats:{region}"
+        self.leaderboard_cache.set(cache_key, leaderboard_stats)
 
 
 class LeagueRedis:
@@ -106,28 +141,54 @@ class LeagueRedis:
         region: str,
         limit: int,
         page: int,
-    ) -> list[models.LeaderboardEntry]:
-        redis_key = f"{CACHE_SETTINGS['leaderboard']['cache_prefix']}:leaderboard:{region}:{limit}:{page}"
+        cursor: typing.Optional[str] = None,
+    ) -> typing.Optional[models.LeaderboardPage]:
+        redis_key = leaderboard_cache_key(region, limit, page, cursor)
         cached_data = await self.redis_client.get_json(redis_key)
 
         if cached_data is not None:
-            return [models.LeaderboardEntry(**entry) for entry in cached_data]
+            return models.LeaderboardPage(**cached_data)
 
-        return []
+        return None
 
     async def set_leaderboard(
         self,
         region: str,
         limit: int,
         page: int,
-        leaderboard: list[models.LeaderboardEntry],
+        leaderboard: models.LeaderboardPage,
+        cursor: typing.Optional[str] = None,
     ) -> None:
-        redis_key = f"{CACHE_SETTINGS['leaderboard']['cache_prefix']}:leaderboard:{region}:{limit}:{page}"
-        leaderboard_data = [entry.model_dump(mode='json') for entry in leaderboard]
+        redis_key = leaderboard_cache_key(region, limit, page, cursor)
+        leaderboard_data = leaderboard.model_dump(mode='json')
         await self.redis_client.set_json(
             redis_key, leaderboard_data, ex=CACHE_SETTINGS["leaderboard"]["ttl"]
         )
 
+    async def get_leaderboard_stats(
+        self,
+        region: str,
+    ) -> typing.Optional[models.LeaderboardStats]:
+        redis_key = f"{CACHE_SETTINGS['leaderboard']['cache_prefix']}:stats:{region}"
+        cached_data = await self.redis_client.get_json(redis_key)
+
+        if cached_data is not None:
+            return models.LeaderboardStats(**cached_data)
+
+        return None
+
+    async def set_leaderboard_stats(
+        self,
+        region: str,
+        leaderboard_stats: models.LeaderboardStats,
+    ) -> None:
+        redis_key = f"{CACHE_SETTINGS['leaderboard']['cache_prefix']}:stats:{region}"
+        await self.redis_client.set_json(
+            redis_key,
+            leaderboard_stats.model_dump(mode='json'),
+            ex=CACHE_SETTINGS["leaderboard"]["ttl"],
+        )
+
 
 class LeagueFirestore:
     def __init__(self, firestore_client: utils.FirestoreClient):
@@ -138,15 +199,36 @@ class LeagueFirestore:
         region: str,
         limit: int,
         page: int,
-    ) -> list[models.LeaderboardEntry]:
+        cursor: typing.Optional[str] = None,
+    ) -> models.LeaderboardPage:
         collection_path = f"leaderboard/{region.upper()}/CHALLENGER"
 
-        response = await self.firestore_client.query_collection(
+        response, next_cursor = await self.firestore_client.query_collection_page(
             collection=collection_path,
             order_by="rank",
             order_direction="ASCENDING",
             limit=limit,
-            offset=(page - 1) * limit,
+            cursor=cursor,
+            offset=None if cursor else (page - 1) * limit,
         )
 
-        return [models.LeaderboardEntry(**doc) for doc in response]
+        return models.LeaderboardPage(
+            entries=[models.LeaderboardEntry(**doc) for doc in response],
+            next_cursor=next_cursor,
+        )
+
+    async def get_leaderboard_stats(
+        self,
+        region: str,
+    ) -> models.LeaderboardStats:
+        collection_path = f"leaderboard/{region.upper()}/CHALLENGER"
+
+        result = await self.firestore_client.aggregate(
+            collection=collection_path,
+            aggregations=[("count", None), ("avg", "leaguePoints")],
+        )
+
+        return models.LeaderboardStats(
+            count=result["count"],
+            average_league_points=result["avg_leaguePoints"],
+        )
@@ -1,3 +1,5 @@
+import typing
+
 import constants
 import fastapi
 import structlog
@@ -44,25 +46,63 @@ async def get_league_entries(
 )
 async def get_leaderboard(
     region: constants.Region,
+    response: fastapi.Response,
     limit: int = fastapi.Query(100, ge=1, le=500),
     page: int = fastapi.Query(1, ge=1),
+    cursor: typing.Optional[str] = fastapi.Query(
+        None, description="X-Next-Cursor of the previous page; overrides page"
+    ),
     redis: utils.RedisClient = fastapi.Depends(utils.get_redis_client),
     firestore: utils.FirestoreClient = fastapi.Depends(utils.get_firestore_client),
 ) -> list[models.LeaderboardEntry]:
     logger.info(
-        "get_leaderboard_endpoint_called", region=region, limit=limit, page=page
+        "get_leaderboard_endpoint_called",
+        region=region,
+        limit=limit,
+        page=page,
+        cursor=cursor,
     )
 
     league_service = service.LeagueService(
         redis_client=redis, firestore_client=firestore
     )
-    leaderboard = await league_service.get_leaderboard(
-        region=region.value, limit=limit, page=page
-    )
 
-    logger.info("leaderboard", leaderboard=leaderboard)
+    try:
+        leaderboard = await league_service.get_leaderboard(
+            region=region.value, limit=limit, page=page, cursor=cursor
+        )
+    except utils.InvalidCursorError:
+        raise fastapi.HTTPException(status_code=400, detail="Invalid cursor")
+
+    logger.info("leaderboard", leaderboard=leaderboard.entries)
+
+    if not leaderboard.entries:
+        raise fastapi.HTTPException(status_code=404, detail="Leaderboard not found")
+
+    if leaderboard.next_cursor:
+        response.headers["X-Next-Cursor"] = leaderboard.next_cursor
+
+    return leaderboard.entries
+
+
+@router.get(
+    "/leaderboard/{region}/stats",
+    response_model=models.LeaderboardStats,
+    status_code=200,
+)
+async def get_leaderboard_stats(
+    region: constants.Region,
+    redis: utils.RedisClient = fastapi.Depends(utils.get_redis_client),
+    firestore: utils.FirestoreClient = fastapi.Depends(utils.get_firestore_client),
+) -> models.LeaderboardStats:
+    logger.info("get_leaderboard_stats_endpoint_called", region=region)
+
+    league_service = service.LeagueService(
+        redis_client=redis, firestore_client=firestore
+    )
+    leaderboard_stats = await league_service.get_leaderboard_stats(region=region.value)
 
-    if not leaderboard:
+    if not leaderboard_stats.count:
         raise fastapi.HTTPException(status_code=404, detail="Leaderboard not found")
 
-    return leaderboard
+    return leaderboard_stats
@@ -1,3 +1,5 @@
+import typing
+
 import constants as shared_constants
 import utils
 
@@ -16,6 +18,7 @@ class LeagueService:
         self.cache_repo = repository.LeagueCache()
         self.redis_repo = repository.LeagueRedis(redis_client)
         self.firestore_repo = repository.LeagueFirestore(firestore_client)
+        self.stampede = utils.get_stampede_guard()
 
     async def fetch_league_entries(
         self,
@@ -28,21 +31,17 @@ class LeagueService:
         if cached_league_entries:
             return cached_league_entries
 
-        redis_league_entries = await self.redis_repo.get_league_entries(puuid=puuid)
-
-        if redis_league_entries:
-            self.cache_repo.set_league_entries(
-                puuid=puuid, league_entries=redis_league_entries
-            )
-            return redis_league_entries
-
-        league_entries = await self._fetch_league_entries(
-            puuid=puuid, region=region, riot_api=riot_api
+        league_entries = await self.stampede.fetch(
+            key=f"{repository.CACHE_SETTINGS['league_entries']['cache_prefix']}:{puuid}",
+            load=lambda: self.redis_repo.get_league_entries(puuid=puuid),
+            rebuild=lambda: self._rebuild_league_entries(
+                puuid=puuid, region=region, riot_api=riot_api
+            ),
+            soft_ttl=repository.CACHE_SETTINGS["league_entries"]["soft_ttl"],
+            ttl=repository.CACHE_SETTINGS["league_entries"]["ttl"],
         )
+
         if league_entries:
-            await self.redis_repo.set_league_entries(
-                puuid=puuid, league_entries=league_entries
-            )
             self.cache_repo.set_league_entries(
                 puuid=puuid, league_entries=league_entries
             )
@@ -55,38 +54,97 @@ class LeagueService:
         region: str,
         limit: int,
         page: int,
-    ) -> list[models.LeaderboardEntry]:
+        cursor: typing.Optional[str] = None,
+    ) -> models.LeaderboardPage:
         cached_leaderboard = self.cache_repo.get_leaderboard(
-            region=region, limit=limit, page=page
+            region=region, limit=limit, page=page, cursor=cursor
         )
 
         if cached_leaderboard:
             return cached_leaderboard
 
-        redis_leaderboard = await self.redis_repo.get_leaderboard(
-            region=region, limit=limit, page=page
+        leaderboard = await self.stampede.fetch(
+            key=repository.leaderboard_cache_key(region, limit, page, cursor),
+            load=lambda: self.redis_repo.get_leaderboard(
+                region=region, limit=limit, page=page, cursor=cursor
+            ),
+            rebuild=lambda: self._rebuild_leaderboard(
+                region=region, limit=limit, page=page, cursor=cursor
+            ),
         )
 
-        if redis_leaderboard:
+        if leaderboard.entries:
             self.cache_repo.set_leaderboard(
-                region=region, limit=limit, page=page, leaderboard=redis_leaderboard
+                region=region,
+                limit=limit,
+                page=page,
+                leaderboard=leaderboard,
+                cursor=cursor,
+            )
+
+        return leaderboard
+
+    async def get_leaderboard_stats(self, region: str) -> models.LeaderboardStats:
+        cached_stats = self.cache_repo.get_leaderboard_stats(region=region)
+
+        if cached_stats:
+            return cached_stats
+
+        redis_stats = await self.redis_repo.get_leaderboard_stats(region=region)
+
+        if redis_stats:
+            self.cache_repo.set_leaderboard_stats(
+                region=region, leaderboard_stats=redis_stats
+            )
+            return redis_stats
+
+        firestore_stats = await self.firestore_repo.get_leaderboard_stats(region=region)
+
+        if firestore_stats.count:
+            await self.redis_repo.set_leaderboard_stats(
+                region=region, leaderboard_stats=firestore_stats
             )
-            return redis_leaderboard
+            self.cache_repo.set_leaderboard_stats(
+                region=region, leaderboard_stats=firestore_stats
+            )
+
+        return firestore_stats
+
+    async def _rebuild_league_entries(
+        self, puuid: str, region: str, riot_api: utils.RiotAPIClient
+    ) -> list[models.LeagueEntry]:
+        league_entries = await self._fetch_league_entries(
+            puuid=puuid, region=region, riot_api=riot_api
+        )
+
+        if league_entries:
+            await self.redis_repo.set_league_entries(
+                puuid=puuid, league_entries=league_entries
+            )
+            # Stale-while-revalidate refreshes land here too; keep L1 current.
+            self.cache_repo.set_league_entries(
+                puuid=puuid, league_entries=league_entries
+            )
+
+        return league_entries
 
+    async def _rebuild_leaderboard(
+        self, region: str, limit: int, page: int, cursor: typing.Optional[str]
+    ) -> models.LeaderboardPage:
         firestore_leaderboard = await self.firestore_repo.get_leaderboard(
-            region=region, limit=limit, page=page
+            region=region, limit=limit, page=page, cursor=cursor
         )
 
-        if firestore_leaderboard:
+        if firestore_leaderboard.entries:
             await self.redis_repo.set_leaderboard(
-                region=region, limit=limit, page=page, leaderboard=firestore_leaderboard
+                region=region,
+                limit=limit,
+                page=page,
+                leaderboard=firestore_leaderboard,
+                cursor=cursor,
             )
-            self.cache_repo.set_leaderboard(
-                region=region, limit=limit, page=page, leaderboard=firestore_leaderboard
-            )
-            return firestore_leaderboard
 
-        return []
+        return firestore_leaderboard
 
     async def _fetch_league_entries(
         self, puuid: str, region: str, riot_api: utils.RiotAPIClient
@@ -5,18 +5,24 @@ import pydantic
 
 
 class BannedChampion(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
     pickTurn: int
     championId: int
     teamId: int
 
 
 class Perks(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
     perkIds: typing.List[int]
     perkStyle: int
     perkSubStyle: int
 
 
 class Participant(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
     championId: int
     perks: Perks
     teamId: int
@@ -40,6 +46,8 @@ class Participant(pydantic.BaseModel):
 
 
 class ActiveMatch(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
     gameId: int
     gameType: str
     gameStartTime: datetime.datetime
@@ -75,17 +83,23 @@ class ActiveMatch(pydantic.BaseModel):
 
 
 class MatchMetadata(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
     matchId: str
     participants: typing.List[str]
 
 
 class StatPerks(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
     defense: int
     flex: int
     offense: int
 
 
 class PerkSelection(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
     perk: int
     var1: int
     var2: int
@@ -93,17 +107,23 @@ class PerkSelection(pydantic.BaseModel):
 
 
 class PerkStyle(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
     description: str
     selections: typing.List[PerkSelection]
     style: int
 
 
 class MatchHistoryPerks(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
     statPerks: StatPerks
     styles: typing.List[PerkStyle]
 
 
 class ParticipantStats(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
     kills: int
     assists: int
     deaths: int
@@ -148,16 +168,22 @@ class ParticipantStats(pydantic.BaseModel):
 
 
 class Ban(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
     championId: int
     pickTurn: int
 
 
 class Objective(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
     first: bool
     kills: int
 
 
 class Objectives(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
     baron: Objective
     champion: Objective
     dragon: Objective
@@ -165,6 +191,8 @@ class Objectives(pydantic.BaseModel):
 
 
 class Team(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
     bans: typing.List[Ban]
     objectives: Objectives
     teamId: int
@@ -172,6 +200,8 @@ class Team(pydantic.BaseModel):
 
 
 class MatchInfo(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
     gameDuration: int
     gameMode: str
     gameStartTimestamp: datetime.datetime
@@ -195,5 +225,7 @@ class MatchInfo(pydantic.BaseModel):
 
 
 class MatchHistory(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
     metadata: MatchMetadata
     info: MatchInfo
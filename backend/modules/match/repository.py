@@ -7,6 +7,7 @@ from . import models
 CACHE_SETTINGS = {
     "active_match": {
         "cache_name": "active_match",
+        "soft_ttl": 120,  # 2 minutes, served stale and refreshed after this
         "ttl": 600,  # 10 minutes
         "cache_prefix": "active_match",
     },
@@ -20,9 +21,12 @@ CACHE_SETTINGS = {
 
 class MatchCache:
     def __init__(self):
+        # L1 is checked before the stampede guard, so it expires at the soft
+        # TTL; for the full ttl it would serve entries up to 10 minutes old that
+        # never reach the stale-while-revalidate check.
         self.active_match_cache = utils.get_ttl_cache_client(
             name=CACHE_SETTINGS["active_match"]["cache_name"],
-            ttl=CACHE_SETTINGS["active_match"]["ttl"],
+            ttl=CACHE_SETTINGS["active_match"]["soft_ttl"],
         )
         self.match_history_cache = utils.get_ttl_cache_client(
             name=CACHE_SETTINGS["match_history"]["cache_name"],
@@ -37,7 +41,7 @@ class MatchCache:
         cached_data = self.active_match_cache.get(cache_key)
 
         if cached_data is not None:
-            return models.ActiveMatch(**cached_data)
+            return cached_data
 
         return None
 
@@ -47,8 +51,7 @@ class MatchCache:
         active_match: models.ActiveMatch,
     ) -> None:
         cache_key = f"{CACHE_SETTINGS['active_match']['cache_prefix']}:{puuid}"
-        active_match_data = active_match.model_dump(mode='json')
-        self.active_match_cache.set(cache_key, active_match_data)
+        self.active_match_cache.set(cache_key, active_match)
 
     def get_match_history(
         self,
@@ -61,7 +64,7 @@ class MatchCache:
             cache_key = f"{cache_prefix}:{match_id}"
             cached_data = self.match_history_cache.get(cache_key)
             if cached_data is not None:
-                match_history[match_id] = models.MatchHistory(**cached_data)
+                match_history[match_id] = cached_data
 
         return match_history
 
@@ -73,8 +76,7 @@ class MatchCache:
 
         for match_history in match_histories:
             cache_key = f"{cache_prefix}:{match_history.metadata.matchId}"
-            match_history_data = match_history.model_dump(mode='json')
-            self.match_history_cache.set(cache_key, match_history_data)
+            self.match_history_cache.set(cache_key, match_history)
 
 
 class MatchRedis:
@@ -1,11 +1,20 @@
 import asyncio
+import os
 import typing
 
 import constants as shared_constants
+import structlog
 import utils
 
 from . import models, repository
 
+logger = structlog.get_logger(__name__)
+
+FETCH_SETTINGS = {
+    "match_data_deadline": float(os.getenv("MATCH_FETCH_DEADLINE", "10")),
+    "match_data_concurrency": int(os.getenv("MATCH_FETCH_CONCURRENCY", "10")),
+}
+
 
 class MatchService:
     def __init__(
@@ -21,6 +30,7 @@ class MatchService:
         self.cache_repo = repository.MatchCache()
         self.redis_repo = repository.MatchRedis(redis_client)
         self.firestore_repo = repository.MatchFirestore(firestore_client)
+        self.stampede = utils.get_stampede_guard()
 
     async def get_active_match(
         self,
@@ -32,20 +42,15 @@ class MatchService:
         if cached_active_match:
             return cached_active_match
 
-        redis_active_match = await self.redis_repo.get_active_match(puuid=puuid)
-
-        if redis_active_match:
-            self.cache_repo.set_active_match(
-                puuid=puuid, active_match=redis_active_match
-            )
-            return redis_active_match
-
-        active_match = await self._fetch_active_match(puuid=puuid, region=region)
+        active_match = await self.stampede.fetch(
+            key=f"{repository.CACHE_SETTINGS['active_match']['cache_prefix']}:{puuid}",
+            load=lambda: self.redis_repo.get_active_match(puuid=puuid),
+            rebuild=lambda: self._rebuild_active_match(puuid=puuid, region=region),
+            soft_ttl=repository.CACHE_SETTINGS["active_match"]["soft_ttl"],
+            ttl=repository.CACHE_SETTINGS["active_match"]["ttl"],
+        )
 
         if active_match:
-            await self.redis_repo.set_active_match(
-                puuid=puuid, active_match=active_match
-            )
             self.cache_repo.set_active_match(puuid=puuid, active_match=active_match)
             return active_match
 
@@ -123,12 +128,6 @@ class MatchService:
         )
         fetched_matches.update(fetched_match_histories)
         if fetched_match_histories:
-            await self.redis_repo.set_match_history(
-                match_histories=list(fetched_match_histories.values())
-            )
-            self.cache_repo.set_match_history(
-                match_histories=list(fetched_match_histories.values())
-            )
             await self.firestore_repo.set_match_history(
                 match_histories=list(fetched_match_histories.values())
             )
@@ -139,6 +138,23 @@ class MatchService:
             if match_id in fetched_matches
         ]
 
+    async def _rebuild_active_match(
+        self,
+        puuid: str,
+        region: str,
+    ) -> models.ActiveMatch | None:
+        active_match = await self._fetch_active_match(puuid=puuid, region=region)
+
+        if active_match:
+            await self.redis_repo.set_active_match(
+                puuid=puuid, active_match=active_match
+            )
+            # Also runs as a background refresh after a stale hit, which must
+            # replace the stale copy this worker keeps in L1.
+            self.cache_repo.set_active_match(puuid=puuid, active_match=active_match)
+
+        return active_match
+
     async def _fetch_active_match(
         self,
         puuid: str,
@@ -149,20 +165,12 @@ class MatchService:
         ) is None:
             return None
 
-        active_game_data = await self.riot_api.get(
+        return await self.riot_api.get_model(
+            models.ActiveMatch,
             region=mapped_region,
             endpoint=f"/lol/spectator/v5/active-games/by-summoner/{puuid}",
         )
 
-        if not active_game_data:
-            return None
-
-        active_match = models.ActiveMatch(
-            **active_game_data  # pyright: ignore[reportCallIssue]
-        )
-
-        return active_match
-
     async def _fetch_match_history_ids(
         self,
         puuid: str,
@@ -173,6 +181,7 @@ class MatchService:
         endTime: typing.Optional[str] = None,
         queue: typing.Optional[str] = None,
         type: typing.Optional[str] = None,
+        lane: utils.RequestLane = utils.RequestLane.INTERACTIVE,
     ) -> list[str]:
         if (
             mapped_region := shared_constants.REGION_TO_CONTINENT.get(region.lower())
@@ -192,6 +201,7 @@ class MatchService:
         match_ids_data = await self.riot_api.get(
             region=mapped_region,
             endpoint=f"/lol/match/v5/matches/by-puuid/{puuid}/ids",
+            lane=lane,
             **params,
         )
 
@@ -204,41 +214,74 @@ class MatchService:
         self,
         match_ids: list[str],
         region: str,
+        lane: utils.RequestLane = utils.RequestLane.INTERACTIVE,
     ) -> dict[str, models.MatchHistory]:
+        """
+        Fetches matches from the Riot API and writes each one to L1 and Redis
+        as soon as it arrives, so a slow match does not hold back the rest.
+        """
         fetched_matches = {}
 
-        fetch_tasks = [
-            self._fetch_match_data(match_id=match_id, region=region)
-            for match_id in match_ids
-        ]
-        results = await asyncio.gather(*fetch_tasks)
-
-        for match_id, match_history in zip(match_ids, results):
-            if match_history:
-                fetched_matches[match_id] = match_history
+        async for match_history in self._stream_match_data(
+            match_ids=match_ids, region=region, lane=lane
+        ):
+            self.cache_repo.set_match_history(match_histories=[match_history])
+            await self.redis_repo.set_match_history(match_histories=[match_history])
+            fetched_matches[match_history.metadata.matchId] = match_history
 
         return fetched_matches
 
+    async def _stream_match_data(
+        self,
+        match_ids: list[str],
+        region: str,
+        lane: utils.RequestLane = utils.RequestLane.INTERACTIVE,
+    ) -> typing.AsyncIterator[models.MatchHistory]:
+        """
+        Yields matches in completion order, with at most
+        FETCH_SETTINGS["match_data_concurrency"] requests in flight.
+        """
+        semaphore = asyncio.Semaphore(FETCH_SETTINGS["match_data_concurrency"])
+
+        async def fetch(match_id: str) -> models.MatchHistory | None:
+            async with semaphore:
+                try:
+                    return await self._fetch_match_data(
+                        match_id=match_id, region=region, lane=lane
+                    )
+                except utils.RateLimitDeadlineError as e:
+                    logger.warning(
+                        "match_fetch_deadline_exceeded",
+                        match_id=match_id,
+                        retry_after=e.retry_after,
+                    )
+                    return None
+
+        tasks = [asyncio.ensure_future(fetch(match_id)) for match_id in match_ids]
+
+        try:
+            for next_completed in asyncio.as_completed(tasks):
+                if match_history := await next_completed:
+                    yield match_history
+        finally:
+            for task in tasks:
+                task.cancel()
+
     async def _fetch_match_data(
         self,
         match_id: str,
         region: str,
+        lane: utils.RequestLane = utils.RequestLane.INTERACTIVE,
     ) -> models.MatchHistory | None:
         if (
             mapped_region := shared_constants.REGION_TO_CONTINENT.get(region.lower())
         ) is None:
             return None
 
-        match_data = await self.riot_api.get(
+        return await self.riot_api.get_model(
+            models.MatchHistory,
             region=mapped_region,
             endpoint=f"/lol/match/v5/matches/{match_id}",
+            lane=lane,
+            deadline=FETCH_SETTINGS["match_data_deadline"],
         )
-
-        if not match_data:
-            return None
-
-        match_history = models.MatchHistory(
-            **match_data  # pyright: ignore[reportCallIssue]
-        )
-
-        return match_history
@@ -4,6 +4,8 @@ import pydantic
 
 
 class ProPlayer(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
     player: str
     puuid: list[str]
     region: typing.Literal["LCK", "LEC", "LCS", "LPL"]
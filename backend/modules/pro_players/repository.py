@@ -49,7 +49,7 @@ class ProPlayersCache:
             cache_key = f"{self.cache_prefix}:{region}:{team}"
             cached_data = self.players_cache.get(cache_key)
             if cached_data:
-                return {region: {team: [models.ProPlayer(**p) for p in cached_data]}}
+                return {region: {team: list(cached_data)}}
         elif region:
             cache_key = f"{self.cache_prefix}:{region}"
             cached_data = self.players_cache.get(cache_key)
@@ -72,7 +72,7 @@ class ProPlayersCache:
         if region and team:
             cache_key = f"{self.cache_prefix}:{region}:{team}"
             team_players = players.get(region, {}).get(team, [])
-            self.players_cache.set(cache_key, [p.model_dump(mode='json') for p in team_players])
+            self.players_cache.set(cache_key, tuple(team_players))
         elif region:
             cache_key = f"{self.cache_prefix}:{region}"
             region_data = players.get(region, {})
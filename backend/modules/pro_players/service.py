@@ -130,11 +130,13 @@ class ProPlayerService:
         if not success:
             return None
 
-        found_player.team = to_team.upper()
-        found_player.region = to_region
+        # found_player may be the instance held in the L1 cache.
+        transferred_player = found_player.model_copy(
+            update={"team": to_team.upper(), "region": to_region}
+        )
 
-        await self.firestore_repo.set_player(player=found_player)
-        return found_player
+        await self.firestore_repo.set_player(player=transferred_player)
+        return transferred_player
 
     async def get_account_names(self) -> typing.Optional[dict[str, dict[str, str]]]:
         cached_names = self.cache_repo.get_account_names()
@@ -219,6 +221,7 @@ class ProPlayerService:
                 count=amount,
                 queue="420",
                 type="ranked",
+                lane=utils.RequestLane.BULK,
             )
             all_match_ids.extend(match_ids)
 
@@ -226,7 +229,9 @@ class ProPlayerService:
             return {}
 
         match_histories_dict = await match_service._fetch_match_data_batch(
-            match_ids=all_match_ids, region=game_region
+            match_ids=all_match_ids,
+            region=game_region,
+            lane=utils.RequestLane.BULK,
         )
 
         match_histories = sorted(
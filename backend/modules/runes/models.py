@@ -4,6 +4,8 @@ import pydantic
 
 
 class RuneData(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
     id: int
     key: str
     icon: str
@@ -13,6 +15,8 @@ class RuneData(pydantic.BaseModel):
 
 
 class Rune(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
     id: int
     key: str
     icon: str
@@ -25,12 +25,12 @@ class RunesCache:
         cache_key = f"{self.cache_prefix}:all"
         cached_data = self.runes_cache.get(cache_key)
         if cached_data:
-            return [models.Rune(**rune) for rune in cached_data]
+            return list(cached_data)
         return None
 
     def set_runes(self, runes: list[models.Rune]) -> None:
         cache_key = f"{self.cache_prefix}:all"
-        self.runes_cache.set(cache_key, [rune.model_dump(mode='json') for rune in runes])
+        self.runes_cache.set(cache_key, tuple(runes))
 
 
 class RunesRedis:
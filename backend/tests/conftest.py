@@ -0,0 +1,71 @@
+import typing
+
+import fakeredis
+import httpx
+import pytest
+
+import utils
+from utils import connection_pool
+
+
+@pytest.fixture
+def redis_server() -> fakeredis.FakeServer:
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def make_redis_client(
+    redis_server: fakeredis.FakeServer,
+) -> typing.Callable[..., utils.RedisClient]:
+    """Builds RedisClients whose connections share one in-process fake server."""
+
+    def make(**kwargs) -> utils.RedisClient:
+        client = utils.RedisClient(**kwargs)
+        client._client = fakeredis.FakeAsyncRedis(
+            server=redis_server, decode_responses=True
+        )
+        client._bytes_client = fakeredis.FakeAsyncRedis(
+            server=redis_server, decode_responses=False
+        )
+        return client
+
+    return make
+
+
+@pytest.fixture
+def redis_client(
+    make_redis_client: typing.Callable[..., utils.RedisClient],
+) -> utils.RedisClient:
+    return make_redis_client()
+
+
+@pytest.fixture
+def make_riot_client() -> typing.Callable[..., utils.RiotAPIClient]:
+    """Builds RiotAPIClients whose requests are answered by `handler`."""
+
+    def make(
+        handler: typing.Callable[[httpx.Request], typing.Any],
+        redis_client: typing.Optional[utils.RedisClient] = None,
+    ) -> utils.RiotAPIClient:
+        return utils.RiotAPIClient(
+            connection_pool=connection_pool.HostConnectionPool(
+                http2=False,
+                wrap_transport=lambda _: httpx.MockTransport(handler),
+            ),
+            api_key="test-key",
+            redis_client=redis_client,
+        )
+
+    return make
+
+
+@pytest.fixture
+def firestore_client() -> utils.InMemoryFirestoreClient:
+    return utils.InMemoryFirestoreClient()
+
+
+@pytest.fixture(autouse=True)
+def clear_caches() -> typing.Iterator[None]:
+    utils.clear_all_caches()
+    yield
+    utils.clear_all_caches()
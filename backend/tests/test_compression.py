@@ -0,0 +1,47 @@
+import pytest
+
+from utils import compression
+
+LARGE_VALUE = {"participants": [{"championName": "Ahri", "kills": 3}] * 200}
+
+
+def test_small_values_are_stored_raw():
+    compressor = compression.Compressor(threshold=1024)
+
+    stored, compressed = compressor.compress(b"{}")
+
+    assert not compressed
+    assert stored == compression.HEADER_RAW + b"{}"
+    assert compressor.decompress(stored) == b"{}"
+
+
+def test_values_compressed_by_another_codec_stay_readable():
+    data = b"x" * 4096
+    stored, compressed = compression.Compressor(codec="lz4").compress(data)
+
+    assert compressed
+    assert compression.Compressor(codec="zstd").decompress(stored) == data
+
+
+def test_corrupt_values_raise_value_error():
+    compressor = compression.Compressor()
+
+    with pytest.raises(ValueError):
+        compressor.decompress(compression.HEADER_ZSTD + b"not zstd")
+    with pytest.raises(ValueError):
+        compressor.decompress(b"\x7fpayload")
+
+
+async def test_compressed_values_round_trip_under_their_own_namespace(
+    make_redis_client,
+):
+    legacy = make_redis_client()
+    compressed = make_redis_client(
+        compressor=compression.Compressor(codec="zstd", threshold=256)
+    )
+
+    await compressed.set_json("match:EUW1_1", LARGE_VALUE)
+
+    assert await compressed.get_json("match:EUW1_1") == LARGE_VALUE
+    assert await legacy.get_json("match:EUW1_1") is None
+    assert compressed.get_compression_stats()["match"]["compressed_writes"] == 1
@@ -0,0 +1,62 @@
+import asyncio
+
+import httpx
+
+from utils import connection_pool
+
+
+async def test_every_host_gets_its_own_pool_with_the_configured_limits():
+    pools = []
+
+    def wrap(pool: httpx.AsyncHTTPTransport) -> httpx.AsyncBaseTransport:
+        pools.append(pool)
+        return httpx.MockTransport(lambda request: httpx.Response(200))
+
+    pool = connection_pool.HostConnectionPool(max_connections=3, wrap_transport=wrap)
+
+    await pool.request("GET", "https://euw1.api.riotgames.com/a")
+    await pool.request("GET", "https://euw1.api.riotgames.com/b")
+    await pool.request("GET", "https://kr.api.riotgames.com/a")
+
+    assert len(pools) == 2
+    assert [p._pool._max_connections for p in pools] == [3, 3]
+    await pool.aclose()
+
+
+async def test_stats_report_connections_in_use():
+    release = asyncio.Event()
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        while (await reader.readline()) not in (b"\r\n", b""):
+            pass
+        await release.wait()
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}")
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    pool = connection_pool.HostConnectionPool(max_connections=3, http2=False)
+
+    request = asyncio.ensure_future(pool.request("GET", f"http://127.0.0.1:{port}/"))
+    for _ in range(100):
+        await asyncio.sleep(0.01)
+        if pool.get_stats()["127.0.0.1"]["connections_in_use"]:
+            break
+
+    assert pool.get_stats()["127.0.0.1"] == {
+        "requests": 1,
+        "in_flight": 1,
+        "peak_in_flight": 1,
+        "connections": 1,
+        "connections_in_use": 1,
+        "max_connections": 3,
+    }
+
+    release.set()
+    assert (await request).status_code == 200
+    assert pool.get_stats()["127.0.0.1"]["connections_in_use"] == 0
+
+    await pool.aclose()
+    server.close()
+    await server.wait_closed()
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+from google.api_core import exceptions
+
+import utils
+from utils import deadline, in_memory_firestore, stampede
+
+
+async def test_writes_are_not_bounded_by_the_request_budget():
+    client = utils.InMemoryFirestoreClient(latency=0.02)
+
+    with utils.deadline_budget(0.01):
+        await asyncio.sleep(0.02)
+
+        assert await client.set_document("matches", "a", {"id": "a"})
+        assert await client.batch_set("matches", {"b": {"id": "b"}})
+
+    assert client.rpc_count == 2
+
+
+async def test_write_after_the_budget_is_spent_is_still_retried(
+    firestore_client, monkeypatch
+):
+    original_set = in_memory_firestore._DocumentReference.set
+    failures = [exceptions.ServiceUnavailable("unavailable")]
+
+    async def flaky_set(self, data, merge=False, timeout=None):
+        assert timeout is None
+        if failures:
+            raise failures.pop()
+        await original_set(self, data, merge)
+
+    monkeypatch.setattr(in_memory_firestore._DocumentReference, "set", flaky_set)
+
+    with utils.deadline_budget(0):
+        assert await firestore_client.set_document("matches", "a", {"id": "a"})
+
+    assert await firestore_client.get_document("matches", "a") == {"id": "a"}
+
+
+async def test_read_with_no_budget_left_fails_without_an_rpc(firestore_client):
+    with utils.deadline_budget(0):
+        with pytest.raises(exceptions.DeadlineExceeded):
+            await firestore_client.get_document("matches", "a")
+
+    assert firestore_client.rpc_count == 0
+    assert firestore_client.get_retry_stats()["gave_up"]["deadline"] == 1
+
+
+async def test_background_revalidation_runs_outside_the_budget(redis_client):
+    guard = stampede.StampedeGuard(redis_client)
+    budgets = []
+
+    async def rebuild():
+        budgets.append(deadline.remaining())
+
+    with utils.deadline_budget(1):
+        guard.revalidate("active_match:p1", rebuild)
+    await asyncio.gather(*guard._refreshing.values())
+
+    assert budgets == [None]
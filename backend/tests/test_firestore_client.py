@@ -0,0 +1,216 @@
+import datetime
+
+import pytest
+from google.api_core import datetime_helpers, exceptions
+
+from utils import firestore_client as firestore_client_module
+from utils import in_memory_firestore
+
+
+async def test_batch_get_returns_documents_in_request_order(
+    firestore_client, monkeypatch
+):
+    monkeypatch.setattr(firestore_client_module, "BATCH_GET_CHUNK_SIZE", 2)
+    for doc_id in ("a", "b", "c"):
+        await firestore_client.set_document("matches", doc_id, {"id": doc_id})
+    rpcs = firestore_client.rpc_count
+
+    documents = await firestore_client.batch_get(
+        "matches", ["c", "missing", "a", "c", "b"]
+    )
+
+    assert documents == [{"id": "c"}, None, {"id": "a"}, {"id": "c"}, {"id": "b"}]
+    # Four distinct ids in chunks of two.
+    assert firestore_client.rpc_count - rpcs == 2
+
+
+async def test_batch_get_projects_fields(firestore_client):
+    await firestore_client.set_document("matches", "a", {"id": "a", "big": "x" * 10})
+
+    assert await firestore_client.batch_get("matches", ["a"], fields=["id"]) == [
+        {"id": "a"}
+    ]
+
+
+async def test_bulk_set_commits_in_chunks(firestore_client, monkeypatch):
+    monkeypatch.setattr(firestore_client_module, "BULK_WRITE_CHUNK_SIZE", 2)
+    rpcs = firestore_client.rpc_count
+
+    result = await firestore_client.bulk_set(
+        "matches", {str(index): {"index": index} for index in range(5)}
+    )
+
+    assert (result.written, result.failed) == (5, {})
+    assert firestore_client.rpc_count - rpcs == 3
+    assert await firestore_client.get_document("matches", "4") == {"index": 4}
+
+
+async def test_failed_chunk_is_retried_document_by_document(
+    firestore_client, monkeypatch
+):
+    async def unavailable(self, timeout=None):
+        raise exceptions.ServiceUnavailable("commit failed")
+
+    async def set_document(collection, document_id, data, merge=False):
+        if document_id == "bad":
+            raise exceptions.InvalidArgument("document too large")
+        return await original_set_document(collection, document_id, data, merge)
+
+    original_set_document = firestore_client.set_document
+    monkeypatch.setattr(in_memory_firestore._WriteBatch, "commit", unavailable)
+    monkeypatch.setattr(firestore_client, "set_document", set_document)
+
+    result = await firestore_client.bulk_set(
+        "matches", {"a": {"id": "a"}, "bad": {"id": "bad"}}
+    )
+
+    assert result.written == 1
+    assert list(result.failed) == ["bad"]
+    assert await firestore_client.get_document("matches", "a") == {"id": "a"}
+
+    with pytest.raises(firestore_client_module.BulkWriteError):
+        await firestore_client.batch_set("matches", {"bad": {"id": "bad"}})
+
+
+async def test_cursor_pages_cover_the_collection_once(firestore_client):
+    # Equal order_by values make the document id the tie breaker.
+    for index in range(7):
+        await firestore_client.set_document(
+            "leaderboard", f"p{index}", {"rank": index // 2}
+        )
+
+    seen, cursor = [], None
+    while True:
+        documents, cursor = await firestore_client.query_collection_page(
+            "leaderboard", order_by="rank", limit=3, cursor=cursor
+        )
+        seen += [document["rank"] for document in documents]
+        if cursor is None:
+            break
+
+    assert seen == [0, 0, 1, 1, 2, 2, 3]
+
+
+async def test_cursor_pages_on_firestore_timestamps(firestore_client):
+    # Matches written in python mode hold their start as a Firestore Timestamp.
+    start = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    await firestore_client.bulk_set(
+        "champion_history/1/matches",
+        {
+            f"m{index}": {
+                "match": {
+                    "info": {
+                        "gameStartTimestamp": datetime_helpers.DatetimeWithNanoseconds(
+                            2024, 1, 1, index // 2, tzinfo=datetime.timezone.utc
+                        )
+                    }
+                }
+            }
+            for index in range(5)
+        },
+    )
+
+    seen, cursor = [], None
+    while True:
+        documents, cursor = await firestore_client.query_collection_page(
+            "champion_history/1/matches",
+            order_by="match.info.gameStartTimestamp",
+            order_direction="DESCENDING",
+            limit=2,
+            cursor=cursor,
+        )
+        seen += [
+            document["match"]["info"]["gameStartTimestamp"] - start
+            for document in documents
+        ]
+        if cursor is None:
+            break
+
+    assert seen == [datetime.timedelta(hours=hours) for hours in (2, 1, 1, 0, 0)]
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64!",
+        "bnVsbA==",
+        "WzFd",
+        firestore_client_module.encode_cursor([{"$type": "decimal"}, "m1"]),
+    ],
+)
+async def test_foreign_cursors_are_rejected(firestore_client, cursor):
+    with pytest.raises(firestore_client_module.InvalidCursorError):
+        await firestore_client.query_collection_page(
+            "leaderboard", order_by="rank", limit=3, cursor=cursor
+        )
+
+
+async def test_aggregate_counts_sums_and_averages_matching_documents(
+    firestore_client,
+):
+    await firestore_client.bulk_set(
+        "champion_history/1/matches",
+        {
+            "a": {"lane": "TOP", "kills": 4},
+            "b": {"lane": "TOP", "kills": 8},
+            "c": {"lane": "MIDDLE", "kills": 1},
+        },
+    )
+
+    top = await firestore_client.aggregate(
+        "champion_history/1/matches",
+        [("count", None), ("sum", "kills"), ("avg", "kills")],
+        filters=[("lane", "==", "TOP")],
+    )
+    empty = await firestore_client.aggregate(
+        "champion_history/1/matches",
+        [("count", None), ("avg", "kills")],
+        filters=[("lane", "==", "BOTTOM")],
+    )
+
+    assert top == {"count": 2, "sum_kills": 12, "avg_kills": 6}
+    assert empty == {"count": 0, "avg_kills": None}
+
+
+async def test_stream_sends_one_query_per_page_as_the_caller_asks(
+    firestore_client,
+):
+    # Ties on order_by must not drop or repeat documents across pages.
+    await firestore_client.bulk_set(
+        "matches", {f"m{index}": {"day": index // 3} for index in range(7)}
+    )
+    rpcs = firestore_client.rpc_count
+
+    pages = firestore_client.stream_collection_pages(
+        "matches", page_size=3, order_by="day"
+    )
+    first = await anext(pages)
+
+    assert firestore_client.rpc_count - rpcs == 1
+    rest = [page async for page in pages]
+    assert [len(page) for page in [first, *rest]] == [3, 3, 1]
+    assert [document["day"] for page in [first, *rest] for document in page] == [
+        0,
+        0,
+        0,
+        1,
+        1,
+        1,
+        2,
+    ]
+    assert firestore_client.rpc_count - rpcs == 3
+
+
+async def test_stream_collection_yields_projected_documents(firestore_client):
+    await firestore_client.bulk_set(
+        "matches", {f"m{index}": {"day": index, "blob": "x"} for index in range(5)}
+    )
+
+    documents = [
+        document
+        async for document in firestore_client.stream_collection(
+            "matches", page_size=2, order_by="day", fields=["day"]
+        )
+    ]
+
+    assert documents == [{"day": index} for index in range(5)]
@@ -0,0 +1,68 @@
+import json
+
+import pytest
+from google.api_core import exceptions
+
+import utils
+from utils import deadline
+
+
+async def test_queries_filter_order_and_skip_documents_without_the_field(
+    firestore_client,
+):
+    await firestore_client.bulk_set(
+        "matches",
+        {
+            "a": {"lane": "TOP", "timestamp": 1},
+            "b": {"lane": "MIDDLE", "timestamp": 3},
+            "c": {"lane": "TOP", "timestamp": 2},
+            "d": {"lane": "TOP"},
+        },
+    )
+
+    documents = await firestore_client.query_collection(
+        "matches",
+        filters=[("lane", "in", ["TOP", "MIDDLE"])],
+        order_by="timestamp",
+        order_direction="DESCENDING",
+        limit=2,
+    )
+
+    assert [document["timestamp"] for document in documents] == [3, 2]
+
+
+async def test_documents_are_copied_in_and_out(firestore_client):
+    data = {"stats": {"kills": 1}}
+    await firestore_client.set_document("matches", "a", data)
+
+    data["stats"]["kills"] = 2
+    (await firestore_client.get_document("matches", "a"))["stats"]["kills"] = 3
+
+    assert await firestore_client.get_document("matches", "a") == {
+        "stats": {"kills": 1}
+    }
+
+
+async def test_injected_failures_surface_as_service_unavailable():
+    client = utils.InMemoryFirestoreClient(failure_rate=1.0)
+
+    with pytest.raises(exceptions.ServiceUnavailable):
+        await client.get_document("matches", "a")
+
+
+async def test_rpc_slower_than_the_deadline_raises_deadline_exceeded():
+    client = utils.InMemoryFirestoreClient(latency=0.05)
+
+    with deadline.deadline_budget(0.01):
+        with pytest.raises(exceptions.DeadlineExceeded):
+            await client.get_document("matches", "a")
+
+
+async def test_seed_file_is_loaded(tmp_path):
+    seed = tmp_path / "seed.json"
+    seed.write_text(json.dumps({"leaderboard/EUW/CHALLENGER": {"p1": {"rank": 1}}}))
+
+    client = utils.InMemoryFirestoreClient(seed_path=str(seed))
+
+    assert await client.get_document("leaderboard/EUW/CHALLENGER", "p1") == {"rank": 1}
+    assert client.rpc_count == 1
@@ -0,0 +1,42 @@
+import pydantic
+import pytest
+
+from modules.league import models as league_models
+from modules.league import repository as league_repository
+
+
+def make_entry(puuid: str) -> league_models.LeagueEntry:
+    return league_models.LeagueEntry(
+        leagueId="l1",
+        queueType="RANKED_SOLO_5x5",
+        tier="CHALLENGER",
+        rank="I",
+        leaguePoints=1000,
+        wins=10,
+        losses=5,
+        hotStreak=False,
+        veteran=False,
+        freshBlood=False,
+        inactive=False,
+        puuid=puuid,
+    )
+
+
+def test_cached_instances_cannot_be_changed_by_a_caller():
+    cache = league_repository.LeagueCache()
+    cache.set_league_entries("p1", [make_entry("p1")])
+
+    entry = cache.get_league_entries("p1")[0]
+    with pytest.raises(pydantic.ValidationError):
+        entry.leaguePoints = 0
+
+    assert cache.get_league_entries("p1")[0].leaguePoints == 1000
+
+
+def test_cached_lists_are_handed_out_as_copies():
+    cache = league_repository.LeagueCache()
+    cache.set_league_entries("p1", [make_entry("p1")])
+
+    cache.get_league_entries("p1").append(make_entry("p2"))
+
+    assert [entry.puuid for entry in cache.get_league_entries("p1")] == ["p1"]
@@ -0,0 +1,53 @@
+from utils import cache_client, near_cache
+
+
+def invalidation(*keys: str) -> list:
+    return ["message", near_cache.INVALIDATION_CHANNEL, list(keys)]
+
+
+async def test_own_write_echo_keeps_the_l1_entry(make_redis_client):
+    client = make_redis_client(near_cache_prefixes=["match"])
+    client._near_cache._connected = True
+    l1 = cache_client.get_ttl_cache_client("test_near_cache")
+
+    await client.set_json("match:EUW1_1", {"a": 1})
+    l1.set("match:EUW1_1", {"a": 1})
+    client._near_cache._handle_message(invalidation("match:EUW1_1"))
+
+    assert l1.get("match:EUW1_1") == {"a": 1}
+
+    client._near_cache._handle_message(invalidation("match:EUW1_1"))
+
+    assert l1.get("match:EUW1_1") is None
+    assert client.get_near_cache_stats()["own_writes_skipped"] == 1
+
+
+async def test_skipped_write_expects_no_echo(make_redis_client):
+    client = make_redis_client(near_cache_prefixes=["match"])
+    client._near_cache._connected = True
+    l1 = cache_client.get_ttl_cache_client("test_near_cache")
+
+    await client.set_json("match:EUW1_1", {"a": 1})
+    client._near_cache._handle_message(invalidation("match:EUW1_1"))
+    assert not await client.set_json("match:EUW1_1", {"a": 2}, nx=True)
+
+    l1.set("match:EUW1_1", {"a": 1})
+    client._near_cache._handle_message(invalidation("match:EUW1_1"))
+
+    assert l1.get("match:EUW1_1") is None
+
+
+async def test_reads_are_served_locally_until_invalidated(make_redis_client):
+    client = make_redis_client(near_cache_prefixes=["match"])
+    client._near_cache._connected = True
+    await client.set_json("match:EUW1_1", {"a": 1})
+
+    assert await client.get_json("match:EUW1_1") == {"a": 1}
+    await client._client.set("match:EUW1_1", '{"a": 2}')
+    assert await client.get_json("match:EUW1_1") == {"a": 1}
+
+    # The echo of our own set_json, then the foreign write.
+    client._near_cache._handle_message(invalidation("match:EUW1_1"))
+    client._near_cache._handle_message(invalidation("match:EUW1_1"))
+
+    assert await client.get_json("match:EUW1_1") == {"a": 2}
@@ -0,0 +1,113 @@
+import asyncio
+
+import httpx
+import pytest
+
+from utils import rate_limiter
+
+
+async def acquires_within(acquire, seconds: float = 0.05) -> bool:
+    try:
+        await asyncio.wait_for(acquire(), seconds)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
+def test_parse_rate_limit_header():
+    assert rate_limiter.parse_rate_limit_header("20:1,100:120") == [
+        (20, 1.0),
+        (100, 120.0),
+    ]
+    assert rate_limiter.parse_rate_limit_header("20:1,oops") == []
+    assert rate_limiter.parse_rate_limit_header(None) == []
+
+
+async def test_routing_values_have_separate_buckets():
+    limiter = rate_limiter.RiotRateLimiter(default_app_limits="2:10")
+
+    for _ in range(2):
+        assert await acquires_within(lambda: limiter.acquire("euw1", "m"))
+
+    assert not await acquires_within(lambda: limiter.acquire("euw1", "m"))
+    assert await acquires_within(lambda: limiter.acquire("kr", "m"))
+
+
+async def test_bulk_lane_leaves_interactive_reserve():
+    limiter = rate_limiter.RiotRateLimiter(
+        default_app_limits="10:10", interactive_reserve=0.5
+    )
+    bulk = lambda: limiter.acquire("euw1", "m", rate_limiter.RequestLane.BULK)
+
+    for _ in range(5):
+        assert await acquires_within(bulk)
+
+    assert not await acquires_within(bulk)
+    assert await acquires_within(lambda: limiter.acquire("euw1", "m"))
+
+
+async def test_update_limits_keeps_spent_requests():
+    bucket = rate_limiter.RateLimitBucket(name="euw1:app", limits=[(5, 10.0)])
+
+    for _ in range(4):
+        await bucket.acquire()
+
+    bucket.update_limits([(6, 10.0)])
+
+    assert await acquires_within(bucket.acquire)
+    assert await acquires_within(bucket.acquire)
+    assert not await acquires_within(bucket.acquire)
+
+
+async def test_rate_limit_count_header_lowers_allowance():
+    limiter = rate_limiter.RiotRateLimiter(default_app_limits="5:10")
+
+    await limiter.update_from_headers(
+        "euw1", "m", {"X-App-Rate-Limit": "5:10", "X-App-Rate-Limit-Count": "4:10"}
+    )
+
+    assert await acquires_within(lambda: limiter.acquire("euw1", "m"))
+    assert not await acquires_within(lambda: limiter.acquire("euw1", "m"))
+
+
+async def test_shared_windows_are_drawn_from_by_every_process(make_redis_client):
+    first = rate_limiter.RiotRateLimiter(
+        default_app_limits="3:10", redis_client=make_redis_client()
+    )
+    second = rate_limiter.RiotRateLimiter(
+        default_app_limits="3:10", redis_client=make_redis_client()
+    )
+
+    for limiter in (first, second, first):
+        assert await acquires_within(lambda: limiter.acquire("euw1", "m"))
+
+    assert not await acquires_within(lambda: second.acquire("euw1", "m"))
+
+
+@pytest.mark.parametrize(
+    "endpoint, method_key",
+    [
+        ("/lol/match/v5/matches/EUW1_123", "match-v5.match"),
+        ("/lol/match/v5/matches/by-puuid/abc/ids", "match-v5.ids-by-puuid"),
+        ("/lol/status/v4/platform-data", rate_limiter.UNKNOWN_METHOD_KEY),
+        ("/lol/clash/v1/players/by-puuid/abc", rate_limiter.UNKNOWN_METHOD_KEY),
+    ],
+)
+async def test_method_keys_never_contain_ids(make_riot_client, endpoint, method_key):
+    client = make_riot_client(lambda request: httpx.Response(200, json={}))
+
+    assert client._get_method_key(endpoint) == method_key
+
+
+async def test_each_process_only_uses_its_share_while_redis_is_down(
+    make_redis_client, redis_server
+):
+    redis_server.connected = False
+    limiter = rate_limiter.RiotRateLimiter(
+        default_app_limits="10:10", redis_client=make_redis_client()
+    )
+
+    for _ in range(int(10 * rate_limiter.DEFAULT_FALLBACK_SHARE)):
+        assert await acquires_within(lambda: limiter.acquire("euw1", "m"))
+
+    assert not await acquires_within(lambda: limiter.acquire("euw1", "m"))
@@ -0,0 +1,37 @@
+import pytest
+
+from utils import compression
+from utils import redis_client as redis_client_module
+
+
+async def test_set_many_json_spans_pipeline_chunks(redis_client, monkeypatch):
+    monkeypatch.setattr(redis_client_module, "PIPELINE_CHUNK_SIZE", 3)
+    mapping = {f"key:{index}": {"index": index} for index in range(7)}
+
+    assert await redis_client.set_many_json(mapping, ex=60)
+
+    assert await redis_client.get_many_json(*mapping, "key:missing") == [
+        *mapping.values(),
+        None,
+    ]
+    assert 0 < await redis_client.ttl("key:0") <= 60
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+async def test_bulk_delete_and_exists_use_the_json_keys(
+    make_redis_client, monkeypatch, compressed
+):
+    monkeypatch.setattr(redis_client_module, "PIPELINE_CHUNK_SIZE", 3)
+    client = make_redis_client(
+        compressor=(
+            compression.Compressor(codec="zstd", threshold=0) if compressed else None
+        )
+    )
+    mapping = {f"key:{index}": {"index": index} for index in range(7)}
+    await client.set_many_json(mapping)
+    keys = [*mapping, "key:missing"]
+
+    assert await client.exists_many(*keys) == [True] * 7 + [False]
+    assert await client.delete_many(*keys[1:]) == 6
+    assert await client.exists_many(*keys) == [True] + [False] * 7
+    assert await client.get_many_json(*keys[:2]) == [{"index": 0}, None]
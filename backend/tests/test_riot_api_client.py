@@ -0,0 +1,179 @@
+import asyncio
+
+import httpx
+import pytest
+
+import utils
+from utils import rate_limiter
+
+
+def slow_handler(calls: list[httpx.Request], response: httpx.Response):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        await asyncio.sleep(0.05)
+        return response
+
+    return handler
+
+
+async def test_identical_requests_share_one_upstream_call(make_riot_client):
+    calls = []
+    client = make_riot_client(
+        slow_handler(calls, httpx.Response(200, json={"puuid": "abc"}))
+    )
+
+    results = await asyncio.gather(
+        *(
+            client.get("europe", "/riot/account/v1/accounts/by-puuid/abc")
+            for _ in range(5)
+        )
+    )
+
+    assert results == [{"puuid": "abc"}] * 5
+    assert len(calls) == 1
+    assert client.get_coalescing_stats() == {
+        "upstream": 1,
+        "deduplicated": 4,
+        "in_flight": 0,
+    }
+
+
+async def test_requests_in_different_lanes_are_not_shared(make_riot_client):
+    calls = []
+    client = make_riot_client(slow_handler(calls, httpx.Response(200, json={})))
+    endpoint = "/lol/match/v5/matches/EUW1_1"
+
+    await asyncio.gather(
+        client.get("europe", endpoint, lane=utils.RequestLane.BULK),
+        client.get("europe", endpoint, lane=utils.RequestLane.INTERACTIVE),
+    )
+
+    assert len(calls) == 2
+
+
+async def test_callers_keep_their_own_deadline_semantics(make_riot_client):
+    calls = []
+    client = make_riot_client(
+        slow_handler(calls, httpx.Response(429, headers={"Retry-After": "5"}))
+    )
+    endpoint = "/lol/match/v5/matches/EUW1_1"
+
+    without_deadline, with_deadline = await asyncio.gather(
+        client.get("europe", endpoint),
+        client.get("europe", endpoint, deadline=1.0),
+        return_exceptions=True,
+    )
+
+    assert without_deadline is None
+    assert isinstance(with_deadline, utils.RateLimitDeadlineError)
+    assert len(calls) == 2
+
+
+async def test_cancelled_caller_does_not_cancel_shared_request(make_riot_client):
+    calls = []
+    client = make_riot_client(slow_handler(calls, httpx.Response(200, json={"a": 1})))
+    endpoint = "/lol/match/v5/matches/EUW1_1"
+
+    first = asyncio.ensure_future(client.get("europe", endpoint))
+    second = asyncio.ensure_future(client.get("europe", endpoint))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == {"a": 1}
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert len(calls) == 1
+
+
+def sequence_handler(calls: list[httpx.Request], responses: list[httpx.Response]):
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return responses[min(len(calls), len(responses)) - 1]
+
+    return handler
+
+
+async def test_rate_limited_request_is_requeued_within_deadline(make_riot_client):
+    calls = []
+    client = make_riot_client(
+        sequence_handler(
+            calls,
+            [
+                httpx.Response(429, headers={"Retry-After": "0.05"}),
+                httpx.Response(200, json={"a": 1}),
+            ],
+        )
+    )
+
+    result = await client.get("europe", "/lol/match/v5/matches/EUW1_1", deadline=1.0)
+
+    assert result == {"a": 1}
+    assert len(calls) == 2
+
+
+async def test_malformed_retry_after_falls_back_to_default(make_riot_client):
+    client = make_riot_client(
+        lambda request: httpx.Response(429, headers={"Retry-After": "soon"})
+    )
+
+    with pytest.raises(utils.RateLimitDeadlineError) as error:
+        await client.get("europe", "/lol/match/v5/matches/EUW1_1", deadline=0.01)
+
+    assert error.value.retry_after == rate_limiter.DEFAULT_RETRY_AFTER
+
+
+async def test_circuit_breaker_opens_and_lets_one_probe_through(
+    make_riot_client, monkeypatch
+):
+    monkeypatch.setenv("RIOT_BREAKER_FAIL_MAX", "2")
+    monkeypatch.setenv("RIOT_BREAKER_RESET_TIMEOUT", "0.05")
+    calls = []
+    responses = [httpx.Response(500), httpx.Response(500)]
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        await asyncio.sleep(0.02)
+        return responses.pop(0) if responses else httpx.Response(200, json={})
+
+    client = make_riot_client(handler)
+    endpoint = "/lol/match/v5/matches/EUW1_1"
+
+    # The failure that trips the breaker already surfaces as 503.
+    statuses = []
+    for _ in range(3):
+        with pytest.raises(utils.RiotAPIError) as error:
+            await client.get("europe", endpoint)
+        statuses.append(error.value.status_code)
+
+    assert statuses == [500, 503, 503]
+    assert len(calls) == 2
+
+    await asyncio.sleep(0.05)
+    probe, rejected = await asyncio.gather(
+        client.get("europe", endpoint),
+        client.get("europe", "/lol/match/v5/matches/EUW1_2"),
+        return_exceptions=True,
+    )
+
+    assert probe == {}
+    assert isinstance(rejected, utils.RiotAPIError) and rejected.status_code == 503
+    assert len(calls) == 3
+    assert client.get_circuit_breaker_states()["europe"]["state"] == "closed"
+
+
+async def test_rate_limiter_wait_is_bounded_by_the_deadline(
+    make_riot_client, monkeypatch
+):
+    monkeypatch.setenv("RIOT_APP_RATE_LIMIT", "1:10")
+    calls = []
+    client = make_riot_client(
+        lambda request: calls.append(request) or httpx.Response(200, json={})
+    )
+
+    assert await client.get("europe", "/lol/match/v5/matches/EUW1_1") == {}
+    with pytest.raises(utils.RateLimitDeadlineError):
+        await asyncio.wait_for(
+            client.get("europe", "/lol/match/v5/matches/EUW1_2", deadline=0.05), 1
+        )
+
+    assert len(calls) == 1
@@ -0,0 +1,71 @@
+import fastapi
+import httpx
+import pytest
+
+import utils
+from modules.champions import routes as champion_routes
+from modules.league import routes as league_routes
+from utils import stampede
+
+
+@pytest.fixture
+def api(redis_client, firestore_client, monkeypatch) -> httpx.AsyncClient:
+    app = fastapi.FastAPI()
+    app.include_router(league_routes.router)
+    app.include_router(champion_routes.router)
+    app.dependency_overrides[utils.get_redis_client] = lambda: redis_client
+    app.dependency_overrides[utils.get_firestore_client] = lambda: firestore_client
+    monkeypatch.setattr(
+        stampede, "_stampede_guard", stampede.StampedeGuard(redis_client)
+    )
+
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    )
+
+
+async def seed_leaderboard(firestore_client, count: int) -> None:
+    await firestore_client.bulk_set(
+        "leaderboard/EUW/CHALLENGER",
+        {
+            f"p{rank}": {
+                "gameName": f"player{rank}",
+                "tagLine": "EUW",
+                "puuid": f"p{rank}",
+                "rank": rank,
+                "leaguePoints": 1000 - rank,
+                "wins": 10,
+                "losses": 5,
+                "league": "CHALLENGER",
+            }
+            for rank in range(1, count + 1)
+        },
+    )
+
+
+async def test_leaderboard_pages_follow_the_next_cursor(api, firestore_client):
+    await seed_leaderboard(firestore_client, 5)
+
+    first = await api.get("/v2/league/leaderboard/EUW", params={"limit": 3})
+    second = await api.get(
+        "/v2/league/leaderboard/EUW",
+        params={"limit": 3, "cursor": first.headers["X-Next-Cursor"]},
+    )
+
+    assert [entry["rank"] for entry in first.json()] == [1, 2, 3]
+    assert [entry["rank"] for entry in second.json()] == [4, 5]
+    assert "X-Next-Cursor" not in second.headers
+
+
+async def test_invalid_cursor_is_a_bad_request(api):
+    response = await api.get("/v2/league/leaderboard/EUW", params={"cursor": "nope"})
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
+
+
+async def test_invalid_versus_is_not_reported_as_a_cursor_error(api):
+    response = await api.get("/v2/champions/1/matches", params={"versus": "ahri"})
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid champion ID: ahri"}
@@ -0,0 +1,92 @@
+import asyncio
+import importlib.util
+import pathlib
+
+import fakeredis
+import httpx
+import pytest
+
+import utils
+from utils import rate_limiter
+
+SCHEDULER_RIOT_API = (
+    pathlib.Path(__file__).parents[2] / "scheduler" / "helpers" / "riot_api.py"
+)
+
+
+@pytest.fixture
+def riot_api(monkeypatch):
+    """A fresh copy of the scheduler's helpers/riot_api module."""
+    spec = importlib.util.spec_from_file_location(
+        "scheduler_riot_api", SCHEDULER_RIOT_API
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    monkeypatch.setenv("RIOT_APP_RATE_LIMIT", "2:10")
+    monkeypatch.setattr(module, "BULK_RESERVE", 0.0)
+    return module
+
+
+def test_scheduler_shares_the_backend_definitions(riot_api):
+    assert riot_api.REDIS_KEY_PREFIX == rate_limiter.REDIS_KEY_PREFIX
+    assert riot_api.UNKNOWN_METHOD_KEY == rate_limiter.UNKNOWN_METHOD_KEY
+    assert riot_api.ACQUIRE_SCRIPT == rate_limiter.ACQUIRE_SCRIPT
+    assert riot_api.SYNC_SCRIPT == rate_limiter.SYNC_SCRIPT
+    assert riot_api.DEFAULT_FALLBACK_SHARE == rate_limiter.DEFAULT_FALLBACK_SHARE
+    assert [
+        (pattern.pattern, method) for pattern, method in riot_api.METHOD_PATTERNS
+    ] == [
+        (pattern.pattern, method)
+        for pattern, method in utils.RiotAPIClient.METHOD_PATTERNS
+    ]
+
+
+async def test_scheduler_limits_locally_while_redis_is_down(riot_api, redis_server):
+    redis_server.connected = False
+    riot_api._redis_client = fakeredis.FakeAsyncRedis(server=redis_server)
+    calls = []
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(
+            lambda request: calls.append(request) or httpx.Response(200)
+        )
+    )
+    url = "https://euw1.api.riotgames.com/lol/status/v4/platform-data"
+
+    # 2:10 at the default share leaves this process a single request.
+    await riot_api.get(client, url)
+
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(riot_api.get(client, url), 0.05)
+    assert len(calls) == 1
+
+
+async def test_scheduler_syncs_counts_and_survives_bad_retry_after(
+    riot_api, redis_server
+):
+    riot_api._redis_client = fakeredis.FakeAsyncRedis(server=redis_server)
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(
+            lambda request: httpx.Response(
+                429,
+                headers={
+                    "X-App-Rate-Limit": "5:10",
+                    "X-App-Rate-Limit-Count": "4:10",
+                    "Retry-After": "soon",
+                },
+            )
+        )
+    )
+
+    response = await riot_api.get(
+        client, "https://euw1.api.riotgames.com/lol/match/v5/matches/EUW1_1"
+    )
+
+    assert response.status_code == 429
+    assert await riot_api._redis_client.zcard("riot_rate_limit:euw1:app:10") == 4
+    assert (
+        0
+        < await riot_api._redis_client.pttl(
+            "riot_rate_limit:euw1:match-v5.match:paused"
+        )
+        <= riot_api.DEFAULT_RETRY_AFTER * 1000
+    )
@@ -0,0 +1,42 @@
+import pytest
+
+from utils import serializers
+
+VALUE = {"matchId": "EUW1_1", "participants": [{"kills": 3, "win": True}]}
+
+
+def test_serializer_requires_dumps_and_loads():
+    class Incomplete(serializers.Serializer):
+        def dumps(self, value):
+            return b""
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+@pytest.mark.parametrize("name", list(serializers.SERIALIZERS))
+async def test_values_round_trip_through_every_serializer(make_redis_client, name):
+    client = make_redis_client(serializer=serializers.get_serializer(name))
+
+    await client.set_json("match:EUW1_1", VALUE, ex=60)
+
+    assert await client.get_json("match:EUW1_1") == VALUE
+    assert await client.get_many_json("match:EUW1_1", "match:missing") == [
+        VALUE,
+        None,
+    ]
+
+
+async def test_formats_do_not_read_each_others_values(make_redis_client):
+    legacy = make_redis_client()
+    msgpack = make_redis_client(serializer=serializers.MsgpackSerializer())
+
+    await legacy.set_json("match:EUW1_1", VALUE)
+
+    assert await legacy.get("match:EUW1_1") is not None
+    assert await msgpack.get_json("match:EUW1_1") is None
+
+    await msgpack.set_json("match:EUW1_1", {"other": True})
+
+    assert await legacy.get_json("match:EUW1_1") == VALUE
+    assert await msgpack.get_json("match:EUW1_1") == {"other": True}
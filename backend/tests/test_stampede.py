@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+import redis.asyncio as redis
+
+from utils import stampede
+
+
+def make_rebuild(redis_client, key: str, value, calls: list, delay: float = 0.05):
+    async def rebuild():
+        calls.append(key)
+        await asyncio.sleep(delay)
+        await redis_client.set_json(key, value, ex=600)
+        return value
+
+    return rebuild
+
+
+async def test_concurrent_misses_share_one_rebuild(redis_client):
+    guard = stampede.StampedeGuard(redis_client)
+    calls = []
+    rebuild = make_rebuild(redis_client, "league_entries:p1", ["entry"], calls)
+
+    results = await asyncio.gather(
+        *(
+            guard.fetch(
+                "league_entries:p1",
+                load=lambda: redis_client.get_json("league_entries:p1"),
+                rebuild=rebuild,
+            )
+            for _ in range(5)
+        )
+    )
+
+    assert results == [["entry"]] * 5
+    assert calls == ["league_entries:p1"]
+
+
+async def test_workers_wait_for_the_lock_holder(make_redis_client):
+    first, second = make_redis_client(), make_redis_client()
+    calls = []
+    key = "league_entries:p1"
+
+    results = await asyncio.gather(
+        *(
+            stampede.StampedeGuard(client).fetch(
+                key,
+                load=lambda client=client: client.get_json(key),
+                rebuild=make_rebuild(client, key, ["entry"], calls),
+            )
+            for client in (first, second)
+        )
+    )
+
+    assert results == [["entry"], ["entry"]]
+    assert calls == [key]
+
+
+async def test_hit_reads_value_and_pttl_in_one_round_trip(redis_client, monkeypatch):
+    guard = stampede.StampedeGuard(redis_client, beta=0.0)
+    await redis_client.set_json("league_entries:p1", ["entry"], ex=600)
+
+    async def unexpected_pttl(key: str) -> int:
+        raise AssertionError("PTTL sent as its own command")
+
+    monkeypatch.setattr(redis_client, "pttl", unexpected_pttl)
+
+    assert await guard.fetch(
+        "league_entries:p1",
+        load=lambda: redis_client.get_json("league_entries:p1"),
+        rebuild=make_rebuild(redis_client, "league_entries:p1", ["new"], []),
+    ) == ["entry"]
+
+
+async def test_redis_outage_rebuilds_without_the_lock(redis_client, monkeypatch):
+    guard = stampede.StampedeGuard(redis_client)
+
+    async def unavailable(*args, **kwargs):
+        raise redis.ConnectionError("Redis is down")
+
+    monkeypatch.setattr(redis_client, "get_bytes_with_pttl", unavailable)
+    monkeypatch.setattr(redis_client, "set", unavailable)
+
+    async def rebuild():
+        return ["entry"]
+
+    assert await guard.fetch(
+        "league_entries:p1",
+        load=lambda: redis_client.get_json("league_entries:p1"),
+        rebuild=rebuild,
+    ) == ["entry"]
+    assert guard.get_stats()["rebuilds"] == 1
+
+
+@pytest.mark.parametrize("remaining_ttl, stale", [(590, False), (100, True)])
+async def test_values_past_their_soft_ttl_are_revalidated(
+    redis_client, remaining_ttl, stale
+):
+    guard = stampede.StampedeGuard(redis_client)
+    await redis_client.set_json("active_match:p1", {"old": True}, ex=remaining_ttl)
+    calls = []
+
+    value = await guard.fetch(
+        "active_match:p1",
+        load=lambda: redis_client.get_json("active_match:p1"),
+        rebuild=make_rebuild(redis_client, "active_match:p1", {"new": True}, calls),
+        soft_ttl=120,
+        ttl=600,
+    )
+    await asyncio.gather(*guard._refreshing.values())
+
+    assert value == {"old": True}
+    assert calls == (["active_match:p1"] if stale else [])
+    assert await redis_client.get_json("active_match:p1") == (
+        {"new": True} if stale else {"old": True}
+    )
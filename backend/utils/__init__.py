@@ -7,20 +7,29 @@ from utils.cache_client import (
     get_lru_cache_client,
     get_ttl_cache_client,
 )
+from utils.connection_pool import HostConnectionPool
+from utils.deadline import DeadlineMiddleware, deadline_budget
 from utils.firestore_client import (
+    BulkWriteError,
+    BulkWriteResult,
     FirestoreClient,
+    InvalidCursorError,
     close_firestore_client,
     get_firestore_client,
 )
 from utils.http_client import HTTPClient, HTTPError, close_http_client, get_http_client
+from utils.in_memory_firestore import InMemoryFirestoreClient
+from utils.rate_limiter import RequestLane
 from utils.redis_client import RedisClient, close_redis_client, get_redis_client
 from utils.riot_api_client import (
+    RateLimitDeadlineError,
     RateLimitError,
     RiotAPIClient,
     RiotAPIError,
     close_riot_api_client,
     get_riot_api_client,
 )
+from utils.stampede import StampedeGuard, get_stampede_guard
 
 __all__ = [
     # Redis Client
@@ -29,19 +38,32 @@ __all__ = [
     "close_redis_client",
     # Firestore Client
     "FirestoreClient",
+    "BulkWriteResult",
+    "BulkWriteError",
+    "InvalidCursorError",
     "get_firestore_client",
     "close_firestore_client",
+    "InMemoryFirestoreClient",
     # HTTP Client
     "HTTPClient",
     "HTTPError",
     "get_http_client",
     "close_http_client",
+    "HostConnectionPool",
     # Riot API Client
     "RiotAPIClient",
     "RiotAPIError",
     "RateLimitError",
+    "RateLimitDeadlineError",
+    "RequestLane",
     "get_riot_api_client",
     "close_riot_api_client",
+    # Request Deadlines
+    "DeadlineMiddleware",
+    "deadline_budget",
+    # Stampede Protection
+    "StampedeGuard",
+    "get_stampede_guard",
     # Cache Clients
     "TTLCacheClient",
     "LRUCacheClient",
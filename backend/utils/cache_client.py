@@ -7,7 +7,14 @@ LRU_CACHES: dict[str, "LRUCacheClient"] = {}
 
 
 class TTLCacheClient:
-    """Time-based cache for data with known expiry"""
+    """
+    Time-based cache for data with known expiry.
+
+    Values are returned as stored, not copied: modules keep validated model
+    instances here so a hit costs no re-validation. The cached models are
+    frozen, so assigning a field raises; their list and dict fields are still
+    shared, so callers derive a changed instance with model_copy instead.
+    """
 
     def __init__(self, max_size: int, ttl: int):
         self._cache = cachetools.TTLCache(maxsize=max_size, ttl=ttl)
@@ -80,6 +87,11 @@ def clear_all_lru_caches() -> None:
         cache.clear()
 
 
+def invalidate_key(key: str) -> None:
+    for cache in [*TTL_CACHES.values(), *LRU_CACHES.values()]:
+        cache.delete(key)
+
+
 def clear_all_caches() -> None:
     clear_all_ttl_caches()
     clear_all_lru_caches()
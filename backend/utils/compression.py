@@ -0,0 +1,141 @@
+import typing
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is listed in requirements.txt
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover - lz4 is an optional dependency
+    lz4_frame = None
+
+# Every stored value starts with one of these bytes, so reads detect the
+# format on their own and values written with another codec stay readable.
+HEADER_RAW = b"\x00"
+HEADER_ZSTD = b"\x01"
+HEADER_LZ4 = b"\x02"
+
+# Part of the Redis key namespace; bump it if the framing above changes.
+FORMAT_VERSION = 1
+
+
+class Compressor:
+    def __init__(self, codec: str = "zstd", threshold: int = 1024, level: int = 3):
+        if codec == "zstd":
+            if zstandard is None:
+                raise RuntimeError("zstandard is not installed")
+            self._header = HEADER_ZSTD
+            self._compress = zstandard.ZstdCompressor(level=level).compress
+        elif codec == "lz4":
+            if lz4_frame is None:
+                raise RuntimeError("lz4 is not installed")
+            self._header = HEADER_LZ4
+            self._compress = lambda data: lz4_frame.compress(
+                data, compression_level=level
+            )
+        else:
+            raise ValueError(f"Unknown compression codec: {codec}")
+
+        self.codec = codec
+        self.threshold = threshold
+
+    def compress(self, data: bytes) -> tuple[bytes, bool]:
+        if len(data) >= self.threshold:
+            compressed = self._compress(data)
+
+            if len(compressed) < len(data):
+                return self._header + compressed, True
+
+        return HEADER_RAW + data, False
+
+    def decompress(self, data: bytes) -> bytes:
+        header, payload = data[:1], data[1:]
+
+        if header == HEADER_RAW:
+            return payload
+
+        if header == HEADER_ZSTD and zstandard is not None:
+            try:
+                return zstandard.ZstdDecompressor().decompress(payload)
+            except zstandard.ZstdError as e:
+                raise ValueError(f"Invalid zstd payload: {e}") from e
+
+        if header == HEADER_LZ4 and lz4_frame is not None:
+            try:
+                return lz4_frame.decompress(payload)
+            except RuntimeError as e:
+                raise ValueError(f"Invalid lz4 payload: {e}") from e
+
+        raise ValueError(f"Unsupported compression header: {header!r}")
+
+
+class CompressionStats:
+    """Per key prefix sizes and encode/decode timings of serialized values."""
+
+    def __init__(self):
+        self._stats: dict[str, dict[str, float]] = {}
+
+    def _get(self, key: str) -> dict[str, float]:
+        prefix = key.split(":", 1)[0]
+
+        if (stats := self._stats.get(prefix)) is None:
+            stats = {
+                "writes": 0,
+                "compressed_writes": 0,
+                "raw_bytes": 0,
+                "stored_bytes": 0,
+                "encode_seconds": 0.0,
+                "reads": 0,
+                "decode_seconds": 0.0,
+            }
+            self._stats[prefix] = stats
+
+        return stats
+
+    def record_encode(
+        self,
+        key: str,
+        raw_size: int,
+        stored_size: int,
+        compressed: bool,
+        seconds: float,
+    ) -> None:
+        stats = self._get(key)
+        stats["writes"] += 1
+        stats["compressed_writes"] += compressed
+        stats["raw_bytes"] += raw_size
+        stats["stored_bytes"] += stored_size
+        stats["encode_seconds"] += seconds
+
+    def record_decode(self, key: str, seconds: float) -> None:
+        stats = self._get(key)
+        stats["reads"] += 1
+        stats["decode_seconds"] += seconds
+
+    def get_stats(self) -> dict[str, dict[str, typing.Any]]:
+        return {
+            prefix: {
+                "writes": stats["writes"],
+                "compressed_writes": stats["compressed_writes"],
+                "reads": stats["reads"],
+                "raw_bytes": stats["raw_bytes"],
+                "stored_bytes": stats["stored_bytes"],
+                "compression_ratio": (
+                    round(stats["raw_bytes"] / stats["stored_bytes"], 2)
+                    if stats["stored_bytes"]
+                    else None
+                ),
+                "avg_encode_us": (
+                    round(stats["encode_seconds"] / stats["writes"] * 1_000_000, 1)
+                    if stats["writes"]
+                    else None
+                ),
+                "avg_decode_us": (
+                    round(stats["decode_seconds"] / stats["reads"] * 1_000_000, 1)
+                    if stats["reads"]
+                    else None
+                ),
+            }
+            for prefix, stats in self._stats.items()
+        }
@@ -0,0 +1,117 @@
+import typing
+
+import httpx
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class HostConnectionPool:
+    """
+    Keeps one pooled httpx client per host, so a slow or saturated routing
+    host cannot queue requests meant for the others. With HTTP/2 enabled a
+    single connection multiplexes concurrent requests to the same host
+    instead of opening (and TLS handshaking) a new connection per request.
+
+    Every host gets its own connection pool built from the configured limits.
+    `wrap_transport` is called with that pool once per host and may return a
+    transport layered on top of it, such as the cassette recorder.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        timeout: float = 10.0,
+        connect_timeout: float = 5.0,
+        verify: bool | str = True,
+        wrap_transport: typing.Optional[
+            typing.Callable[[httpx.AsyncHTTPTransport], httpx.AsyncBaseTransport]
+        ] = None,
+    ):
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self._http2 = http2
+        self._verify = verify
+        self._wrap_transport = wrap_transport
+
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._pools: dict[str, httpx.AsyncHTTPTransport] = {}
+        self._stats: dict[str, dict[str, int]] = {}
+
+        logger.info(
+            "host_connection_pool_initialized",
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+            http2=http2,
+        )
+
+    def _get_client(self, host: str) -> httpx.AsyncClient:
+        if (client := self._clients.get(host)) is None:
+            pool = httpx.AsyncHTTPTransport(
+                verify=self._verify, http2=self._http2, limits=self._limits
+            )
+            transport = (
+                self._wrap_transport(pool) if self._wrap_transport is not None else pool
+            )
+
+            client = httpx.AsyncClient(timeout=self._timeout, transport=transport)
+            self._clients[host] = client
+            self._pools[host] = pool
+            self._stats[host] = {"requests": 0, "in_flight": 0, "peak_in_flight": 0}
+
+        return client
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        host = httpx.URL(url).host
+        client = self._get_client(host)
+        stats = self._stats[host]
+
+        stats["requests"] += 1
+        stats["in_flight"] += 1
+        stats["peak_in_flight"] = max(stats["peak_in_flight"], stats["in_flight"])
+
+        try:
+            return await client.request(method, url, **kwargs)
+        finally:
+            stats["in_flight"] -= 1
+
+    def _get_connection_stats(self, host: str) -> dict[str, int]:
+        # httpx exposes no public view of its pool; httpcore's connections
+        # report whether they are serving a request.
+        connections = self._pools[host]._pool.connections
+
+        return {
+            "connections": len(connections),
+            "connections_in_use": sum(
+                not connection.is_idle() for connection in connections
+            ),
+            "max_connections": self._limits.max_connections or 0,
+        }
+
+    def get_stats(self) -> dict[str, dict[str, int]]:
+        return {
+            host: {
+                **stats,
+                **(self._get_connection_stats(host) if host in self._pools else {}),
+            }
+            for host, stats in self._stats.items()
+        }
+
+    async def aclose(self) -> None:
+        for client in self._clients.values():
+            await client.aclose()
+
+        # A wrapping transport does not necessarily close the pool beneath it.
+        for pool in self._pools.values():
+            await pool.aclose()
+
+        self._clients.clear()
+        self._pools.clear()
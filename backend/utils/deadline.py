@@ -0,0 +1,66 @@
+import asyncio
+import contextlib
+import contextvars
+import time
+import typing
+
+_deadline: contextvars.ContextVar[typing.Optional[float]] = contextvars.ContextVar(
+    "request_deadline", default=None
+)
+
+T = typing.TypeVar("T")
+
+
+@contextlib.contextmanager
+def deadline_budget(seconds: float) -> typing.Iterator[None]:
+    """
+    Gives the calls made inside the block `seconds` from now to finish,
+    retries included. A nested budget can only shorten the outer one.
+    """
+    deadline = time.monotonic() + seconds
+
+    if (outer := _deadline.get()) is not None:
+        deadline = min(deadline, outer)
+
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> typing.Optional[float]:
+    """Seconds left in the current budget, or None outside of one."""
+    deadline = _deadline.get()
+
+    if deadline is None:
+        return None
+
+    return max(deadline - time.monotonic(), 0.0)
+
+
+def detach(coroutine: typing.Coroutine[typing.Any, typing.Any, T]) -> asyncio.Task[T]:
+    """
+    Runs `coroutine` as a task outside of the current budget, for background
+    work that outlives the request that schedules it.
+    """
+    context = contextvars.copy_context()
+    context.run(_deadline.set, None)
+
+    return asyncio.get_running_loop().create_task(coroutine, context=context)
+
+
+class DeadlineMiddleware:
+    """Runs every HTTP request inside a deadline_budget of `seconds`."""
+
+    def __init__(self, app, seconds: float):
+        self.app = app
+        self.seconds = seconds
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with deadline_budget(self.seconds):
+            await self.app(scope, receive, send)
@@ -1,17 +1,300 @@
-import logging
+import asyncio
+import base64
+import datetime
+import json
 import os
 import typing
 
 import structlog
 import tenacity
+from google.api_core import exceptions
 from google.cloud import firestore
+from google.cloud.firestore_v1 import GeoPoint
+from google.cloud.firestore_v1 import field_path
 from google.cloud.firestore_v1.base_query import FieldFilter
 from google.oauth2 import service_account
 
+from utils import deadline, json_codec
+
 logger = structlog.get_logger(__name__)
 
 _firestore_client: typing.Optional["FirestoreClient"] = None
 
+# batch_get sends at most this many references per BatchGetDocuments call and
+# keeps at most BATCH_GET_CONCURRENCY calls in flight.
+BATCH_GET_CHUNK_SIZE = 100
+BATCH_GET_CONCURRENCY = 4
+
+# Firestore commits at most 500 writes and 10 MiB per request; match
+# documents are large enough to hit the size limit first.
+BULK_WRITE_CHUNK_SIZE = 500
+BULK_WRITE_CHUNK_BYTES = 8 * 1024 * 1024
+BULK_WRITE_CONCURRENCY = 4
+BULK_WRITE_RETRY_CONCURRENCY = 20
+
+# Documents per query when streaming a collection; at most one page is held
+# in memory at a time.
+STREAM_PAGE_SIZE = 100
+
+# Errors worth another attempt: the service is unavailable, overloaded or
+# timed out, or a transaction lost a race. Anything else (permissions,
+# invalid arguments, NotFound, failed preconditions) fails the same way again.
+RETRYABLE_ERRORS = (
+    exceptions.ServiceUnavailable,
+    exceptions.DeadlineExceeded,
+    exceptions.InternalServerError,
+    exceptions.Unknown,
+    exceptions.TooManyRequests,
+    exceptions.Aborted,
+    ConnectionError,
+)
+RETRY_ATTEMPTS = 3
+RETRY_WAIT = tenacity.wait_exponential(multiplier=0.25, max=2)
+
+
+class InvalidCursorError(ValueError):
+    """A page cursor that was not produced by query_collection_page."""
+
+
+# Cursor values JSON has no type for (Firestore timestamps, bytes and
+# geopoints) are written as {CURSOR_TYPE_KEY: type, "value": ...}.
+CURSOR_TYPE_KEY = "$type"
+
+
+def _encode_cursor_value(value: typing.Any) -> dict[str, typing.Any]:
+    if isinstance(value, datetime.datetime):
+        return {CURSOR_TYPE_KEY: "timestamp", "value": value.isoformat()}
+
+    if isinstance(value, bytes):
+        return {
+            CURSOR_TYPE_KEY: "bytes",
+            "value": base64.b64encode(value).decode("ascii"),
+        }
+
+    if isinstance(value, GeoPoint):
+        return {
+            CURSOR_TYPE_KEY: "geopoint",
+            "value": [value.latitude, value.longitude],
+        }
+
+    raise TypeError(f"Cannot use {type(value).__name__} in a cursor")
+
+
+def _decode_cursor_value(value: dict[str, typing.Any]) -> typing.Any:
+    if CURSOR_TYPE_KEY not in value:
+        return value
+
+    kind, encoded = value[CURSOR_TYPE_KEY], value.get("value")
+    if kind == "timestamp":
+        return datetime.datetime.fromisoformat(encoded)
+    if kind == "bytes":
+        return base64.b64decode(encoded, validate=True)
+    if kind == "geopoint":
+        return GeoPoint(*encoded)
+
+    raise ValueError(f"Unknown cursor value type: {kind}")
+
+
+def encode_cursor(values: list[typing.Any]) -> str:
+    """Opaque page token for the order_by value and id of a document."""
+    return base64.urlsafe_b64encode(
+        json.dumps(values, default=_encode_cursor_value).encode("utf-8")
+    ).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> list[typing.Any]:
+    try:
+        values = json.loads(
+            base64.urlsafe_b64decode(cursor.encode("ascii")),
+            object_hook=_decode_cursor_value,
+        )
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
+
+    if not isinstance(values, list) or len(values) != 2:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}")
+
+    return values
+
+
+class BulkWriteResult:
+    def __init__(self):
+        self.written = 0
+        # Document id to the error of its last attempt.
+        self.failed: dict[str, str] = {}
+
+
+class BulkWriteError(Exception):
+    def __init__(self, result: BulkWriteResult):
+        self.result = result
+        super().__init__(
+            f"{len(result.failed)} document(s) failed to write: "
+            f"{', '.join(list(result.failed)[:10])}"
+        )
+
+
+class RetryStats:
+    def __init__(self):
+        self.retries: dict[str, int] = {}
+        self.terminal_errors: dict[str, int] = {}
+        self.gave_up = {"attempts": 0, "deadline": 0}
+
+    def record_retry(self, method: str, error: BaseException) -> None:
+        key = f"{method}:{type(error).__name__}"
+        self.retries[key] = self.retries.get(key, 0) + 1
+
+    def record_terminal_error(self, method: str, error: BaseException) -> None:
+        key = f"{method}:{type(error).__name__}"
+        self.terminal_errors[key] = self.terminal_errors.get(key, 0) + 1
+
+    def get_stats(self) -> dict[str, typing.Any]:
+        return {
+            "retries": sum(self.retries.values()),
+            "retries_by_error": dict(self.retries),
+            "terminal_errors": dict(self.terminal_errors),
+            "gave_up": dict(self.gave_up),
+        }
+
+
+def _retry_stats(retry_state: tenacity.RetryCallState) -> RetryStats:
+    # Every retried method is a FirestoreClient method, so args[0] is self.
+    return retry_state.args[0]._retry_stats
+
+
+def _retry_if_transient(retry_state: tenacity.RetryCallState) -> bool:
+    if retry_state.outcome is None or not retry_state.outcome.failed:
+        return False
+
+    error = retry_state.outcome.exception()
+    if isinstance(error, RETRYABLE_ERRORS):
+        return True
+
+    _retry_stats(retry_state).record_terminal_error(retry_state.fn.__name__, error)
+    return False
+
+
+def _stop_after_attempts(retry_state: tenacity.RetryCallState) -> bool:
+    if retry_state.attempt_number >= RETRY_ATTEMPTS:
+        _retry_stats(retry_state).gave_up["attempts"] += 1
+        return True
+
+    return False
+
+
+def _stop_retrying(retry_state: tenacity.RetryCallState) -> bool:
+    if _stop_after_attempts(retry_state):
+        return True
+
+    # Sleeping past the request deadline only delays the same failure.
+    remaining = deadline.remaining()
+    if remaining is not None and remaining <= RETRY_WAIT(retry_state):
+        _retry_stats(retry_state).gave_up["deadline"] += 1
+        return True
+
+    return False
+
+
+def _read_timeout() -> typing.Optional[float]:
+    """
+    The remaining request budget, as the timeout of a read RPC. Writes are
+    not bounded: a write that outlives its request's budget still has to land.
+    """
+    remaining = deadline.remaining()
+
+    # A zero timeout would send an RPC that is bound to fail.
+    if remaining is not None and remaining <= 0:
+        raise exceptions.DeadlineExceeded("Request deadline exceeded")
+
+    return remaining
+
+
+def _before_retry(retry_state: tenacity.RetryCallState) -> None:
+    if retry_state.outcome is None:
+        return
+
+    error = retry_state.outcome.exception()
+    _retry_stats(retry_state).record_retry(retry_state.fn.__name__, error)
+
+    logger.warning(
+        "firestore_retry",
+        method=retry_state.fn.__name__,
+        attempt=retry_state.attempt_number,
+        sleep=retry_state.upcoming_sleep,
+        error=str(error),
+    )
+
+
+def _estimate_size(data: typing.Optional[dict[str, typing.Any]]) -> int:
+    if data is None:
+        return 0
+
+    try:
+        return len(json_codec.dumps(data))
+    except TypeError:
+        # Sentinels such as SERVER_TIMESTAMP; small enough to ignore.
+        return 0
+
+
+def _chunk_writes(
+    writes: list[tuple[str, typing.Optional[dict[str, typing.Any]]]],
+) -> typing.Iterator[list[tuple[str, typing.Optional[dict[str, typing.Any]]]]]:
+    chunk: list[tuple[str, typing.Optional[dict[str, typing.Any]]]] = []
+    chunk_bytes = 0
+
+    for doc_id, data in writes:
+        size = _estimate_size(data)
+
+        if chunk and (
+            len(chunk) >= BULK_WRITE_CHUNK_SIZE
+            or chunk_bytes + size > BULK_WRITE_CHUNK_BYTES
+        ):
+            yield chunk
+            chunk, chunk_bytes = [], 0
+
+        chunk.append((doc_id, data))
+        chunk_bytes += size
+
+    if chunk:
+        yield chunk
+
+
+def _aggregation_alias(function: str, field: typing.Optional[str]) -> str:
+    return function if field is None else f"{function}_{field}"
+
+
+def _aggregate_documents(
+    documents: list[dict[str, typing.Any]],
+    aggregations: list[tuple[str, typing.Optional[str]]],
+) -> dict[str, typing.Any]:
+    result = {}
+
+    for function, field in aggregations:
+        alias = _aggregation_alias(function, field)
+
+        if function == "count":
+            result[alias] = len(documents)
+            continue
+
+        if function not in ("sum", "avg"):
+            raise ValueError(f"Unknown aggregation: {function}")
+
+        # Like Firestore, skip documents where the field is missing or not a number.
+        values = []
+        for document in documents:
+            try:
+                value = field_path.get_nested_value(field, document)
+            except KeyError:
+                continue
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                values.append(value)
+
+        if function == "sum":
+            result[alias] = sum(values)
+        else:
+            result[alias] = sum(values) / len(values) if values else None
+
+    return result
+
 
 class FirestoreClient:
     def __init__(self, project_id: str, credentials: service_account.Credentials):
@@ -19,21 +302,25 @@ class FirestoreClient:
             project=project_id, credentials=credentials
         )
         self._project_id = project_id
+        self._retry_stats = RetryStats()
         logger.info("firestore_client_initialized", project=project_id)
 
     @tenacity.retry(
-        retry=tenacity.retry_if_exception_type((Exception,)),
-        stop=tenacity.stop_after_attempt(3),
-        wait=tenacity.wait_exponential(multiplier=1, min=1, max=5),
-        before_sleep=tenacity.before_sleep_log(logger, logging.WARNING),
+        retry=_retry_if_transient,
+        stop=_stop_retrying,
+        wait=RETRY_WAIT,
+        before_sleep=_before_retry,
         reraise=True,
     )
     async def get_document(
-        self, collection: str, document_id: str
+        self,
+        collection: str,
+        document_id: str,
+        fields: typing.Optional[list[str]] = None,
     ) -> typing.Optional[dict[str, typing.Any]]:
         try:
             doc_ref = self._client.collection(collection).document(document_id)
-            doc = await doc_ref.get()
+            doc = await doc_ref.get(field_paths=fields, timeout=_read_timeout())
 
             if doc.exists:
                 logger.debug(
@@ -56,10 +343,10 @@ class FirestoreClient:
             raise
 
     @tenacity.retry(
-        retry=tenacity.retry_if_exception_type((Exception,)),
-        stop=tenacity.stop_after_attempt(3),
-        wait=tenacity.wait_exponential(multiplier=1, min=1, max=5),
-        before_sleep=tenacity.before_sleep_log(logger, logging.WARNING),
+        retry=_retry_if_transient,
+        stop=_stop_after_attempts,
+        wait=RETRY_WAIT,
+        before_sleep=_before_retry,
         reraise=True,
     )
     async def set_document(
@@ -91,10 +378,10 @@ class FirestoreClient:
             raise
 
     @tenacity.retry(
-        retry=tenacity.retry_if_exception_type((Exception,)),
-        stop=tenacity.stop_after_attempt(3),
-        wait=tenacity.wait_exponential(multiplier=1, min=1, max=5),
-        before_sleep=tenacity.before_sleep_log(logger, logging.WARNING),
+        retry=_retry_if_transient,
+        stop=_stop_after_attempts,
+        wait=RETRY_WAIT,
+        before_sleep=_before_retry,
         reraise=True,
     )
     async def update_document(
@@ -122,10 +409,10 @@ class FirestoreClient:
             raise
 
     @tenacity.retry(
-        retry=tenacity.retry_if_exception_type((Exception,)),
-        stop=tenacity.stop_after_attempt(3),
-        wait=tenacity.wait_exponential(multiplier=1, min=1, max=5),
-        before_sleep=tenacity.before_sleep_log(logger, logging.WARNING),
+        retry=_retry_if_transient,
+        stop=_stop_after_attempts,
+        wait=RETRY_WAIT,
+        before_sleep=_before_retry,
         reraise=True,
     )
     async def delete_document(self, collection: str, document_id: str) -> bool:
@@ -154,31 +441,33 @@ class FirestoreClient:
         limit: typing.Optional[int] = None,
         offset: typing.Optional[int] = None,
         start_after: typing.Optional[str] = None,
+        cursor: typing.Optional[str] = None,
+        fields: typing.Optional[list[str]] = None,
         **kwargs,
     ) -> typing.Sequence[dict[str, typing.Any]]:
+        """
+        Prefer `cursor` (see query_collection_page) over `start_after`, which
+        costs an extra document read, and over `offset`, which Firestore
+        executes and bills as a read of every skipped document.
+
+        `fields` limits the returned documents to those field paths.
+        """
         try:
-            query = self._client.collection(collection)
+            query = self._build_query(
+                collection, filters, order_by, order_direction, cursor, kwargs
+            )
 
-            if filters:
-                for field, operator, value in filters:
-                    query = query.where(filter=FieldFilter(field, operator, value))
+            if fields is not None:
+                query = query.select(fields)
 
-            if order_by:
-                direction = (
-                    firestore.Query.DESCENDING
-                    if order_direction == "DESCENDING"
-                    else firestore.Query.ASCENDING
+            if order_by and start_after and not cursor:
+                start_after_doc = (
+                    await self._client.collection(collection)
+                    .document(start_after)
+                    .get()
                 )
-                query = query.order_by(order_by, direction=direction)
-
-                if start_after:
-                    start_after_doc = (
-                        await self._client.collection(collection)
-                        .document(start_after)
-                        .get()
-                    )
-                    if start_after_doc.exists:
-                        query = query.start_after(start_after_doc)
+                if start_after_doc.exists:
+                    query = query.start_after(start_after_doc)
 
             if offset:
                 query = query.offset(offset)
@@ -186,14 +475,7 @@ class FirestoreClient:
             if limit:
                 query = query.limit(limit)
 
-            if kwargs:
-                for key, value in kwargs.items():
-                    print(value)
-                    print(type(value))
-                    if value is not None:
-                        query = query.where(key, "==", value)
-
-            docs = query.stream()
+            docs = query.stream(timeout=_read_timeout())
             results = [doc.to_dict() async for doc in docs]
 
             logger.debug(
@@ -212,11 +494,116 @@ class FirestoreClient:
             )
             raise
 
+    async def query_collection_page(
+        self,
+        collection: str,
+        order_by: str,
+        limit: int,
+        filters: typing.Optional[list[tuple[str, str, typing.Any]]] = None,
+        order_direction: str = "ASCENDING",
+        cursor: typing.Optional[str] = None,
+        offset: typing.Optional[int] = None,
+        fields: typing.Optional[list[str]] = None,
+        **kwargs,
+    ) -> tuple[list[dict[str, typing.Any]], typing.Optional[str]]:
+        """
+        Returns one page of documents and the cursor of the next page, or None
+        on the last page. The cursor holds the order_by value and id of the
+        page's last document, so every page costs the same number of reads.
+        `offset` is only meant for callers that still page by number.
+
+        With `fields`, documents hold only those field paths plus order_by,
+        which the cursor is built from.
+
+        Raises InvalidCursorError for a cursor not produced by this method.
+        """
+        try:
+            query = self._build_query(
+                collection, filters, order_by, order_direction, cursor, kwargs
+            )
+
+            if fields is not None:
+                query = query.select(list(dict.fromkeys([*fields, order_by])))
+
+            if offset:
+                query = query.offset(offset)
+
+            # One extra document tells whether a next page exists.
+            docs = [
+                doc
+                async for doc in query.limit(limit + 1).stream(timeout=_read_timeout())
+            ]
+
+            next_cursor = None
+            if len(docs) > limit:
+                docs = docs[:limit]
+                next_cursor = encode_cursor([docs[-1].get(order_by), docs[-1].id])
+
+            logger.debug(
+                "collection_page_queried",
+                collection=collection,
+                count=len(docs),
+                filters=filters,
+                has_next=next_cursor is not None,
+            )
+            documents = [doc.to_dict() for doc in docs]
+            return documents, next_cursor  # pyright: ignore[reportReturnType]
+
+        except InvalidCursorError:
+            raise
+
+        except Exception as e:
+            logger.error(
+                "firestore_query_error",
+                collection=collection,
+                error=str(e),
+            )
+            raise
+
+    def _build_query(
+        self,
+        collection: str,
+        filters: typing.Optional[list[tuple[str, str, typing.Any]]],
+        order_by: typing.Optional[str],
+        order_direction: str,
+        cursor: typing.Optional[str],
+        equals: dict[str, typing.Any],
+    ):
+        query = self._client.collection(collection)
+
+        if filters:
+            for field, operator, value in filters:
+                query = query.where(filter=FieldFilter(field, operator, value))
+
+        for key, value in equals.items():
+            if value is not None:
+                query = query.where(filter=FieldFilter(key, "==", value))
+
+        if order_by:
+            direction = (
+                firestore.Query.DESCENDING
+                if order_direction == "DESCENDING"
+                else firestore.Query.ASCENDING
+            )
+            query = query.order_by(order_by, direction=direction)
+
+            if cursor:
+                # Firestore already breaks ties by document id in the direction
+                # of the last ordering; spelling it out lets the cursor use it.
+                query = query.order_by("__name__", direction=direction)
+                query = query.start_after(decode_cursor(cursor))
+
+        return query
+
     async def get_all_documents(
-        self, collection: str
+        self, collection: str, fields: typing.Optional[list[str]] = None
     ) -> typing.Sequence[dict[str, typing.Any]]:
         try:
-            docs = self._client.collection(collection).stream()
+            query = self._client.collection(collection)
+            if fields is not None:
+                query = query.select(fields)
+
+            docs = query.stream()
             results = [doc.to_dict() async for doc in docs]
 
             logger.debug(
@@ -233,29 +620,41 @@ class FirestoreClient:
             raise
 
     async def batch_get(
-        self, collection: str, document_ids: list[str]
-    ) -> list[dict[str, typing.Any]]:
+        self,
+        collection: str,
+        document_ids: list[str],
+        fields: typing.Optional[list[str]] = None,
+    ) -> list[typing.Optional[dict[str, typing.Any]]]:
+        """
+        Returns one entry per requested id, in request order, with None for
+        documents that do not exist. `fields` limits documents to those paths.
+        """
         try:
-            results = []
+            unique_ids = list(dict.fromkeys(document_ids))
+            semaphore = asyncio.Semaphore(BATCH_GET_CONCURRENCY)
 
-            for doc_id in document_ids:
-                doc_ref = self._client.collection(collection).document(doc_id)
-                doc = await doc_ref.get()
+            async def get_chunk(
+                chunk: list[str],
+            ) -> dict[str, typing.Optional[dict[str, typing.Any]]]:
+                async with semaphore:
+                    return await self._get_all(collection, chunk, fields)
 
-                if doc.exists:
-                    results.append(doc.to_dict())
-                else:
-                    logger.debug(
-                        "document_not_found_in_batch",
-                        collection=collection,
-                        doc_id=doc_id,
-                    )
+            documents: dict[str, typing.Optional[dict[str, typing.Any]]] = {}
+            for chunk_documents in await asyncio.gather(
+                *(
+                    get_chunk(unique_ids[start : start + BATCH_GET_CHUNK_SIZE])
+                    for start in range(0, len(unique_ids), BATCH_GET_CHUNK_SIZE)
+                )
+            ):
+                documents.update(chunk_documents)
+
+            results = [documents.get(doc_id) for doc_id in document_ids]
 
             logger.info(
                 "batch_get_completed",
                 collection=collection,
                 requested=len(document_ids),
-                found=len(results),
+                found=sum(result is not None for result in results),
             )
             return results
 
@@ -267,62 +666,144 @@ class FirestoreClient:
             )
             raise
 
+    @tenacity.retry(
+        retry=_retry_if_transient,
+        stop=_stop_retrying,
+        wait=RETRY_WAIT,
+        before_sleep=_before_retry,
+        reraise=True,
+    )
+    async def _get_all(
+        self,
+        collection: str,
+        document_ids: list[str],
+        fields: typing.Optional[list[str]] = None,
+    ) -> dict[str, typing.Optional[dict[str, typing.Any]]]:
+        # get_all yields snapshots in arbitrary order, one per distinct reference.
+        collection_ref = self._client.collection(collection)
+        references = [collection_ref.document(doc_id) for doc_id in document_ids]
+
+        documents = {}
+        async for doc in self._client.get_all(
+            references, field_paths=fields, timeout=_read_timeout()
+        ):
+            documents[doc.id] = doc.to_dict() if doc.exists else None
+
+        return documents
+
     async def batch_set(
         self, collection: str, documents: dict[str, dict[str, typing.Any]]
     ) -> bool:
-        try:
-            batch = self._client.batch()
+        result = await self.bulk_set(collection, documents)
 
-            for doc_id, data in documents.items():
-                doc_ref = self._client.collection(collection).document(doc_id)
-                batch.set(doc_ref, data)
+        if result.failed:
+            raise BulkWriteError(result)
 
-            await batch.commit()
+        return True
 
-            logger.info(
-                "batch_set_completed",
-                collection=collection,
-                count=len(documents),
-            )
-            return True
+    async def batch_delete(self, collection: str, document_ids: list[str]) -> bool:
+        result = await self.bulk_delete(collection, document_ids)
 
-        except Exception as e:
-            logger.error(
-                "firestore_batch_set_error",
-                collection=collection,
-                error=str(e),
-            )
-            raise
+        if result.failed:
+            raise BulkWriteError(result)
 
-    async def batch_delete(self, collection: str, document_ids: list[str]) -> bool:
-        try:
-            batch = self._client.batch()
+        return True
 
-            for doc_id in document_ids:
-                doc_ref = self._client.collection(collection).document(doc_id)
-                batch.delete(doc_ref)
+    async def bulk_set(
+        self,
+        collection: str,
+        documents: dict[str, dict[str, typing.Any]],
+        merge: bool = False,
+    ) -> BulkWriteResult:
+        """
+        Writes any number of documents in batches that stay under Firestore's
+        per-commit limits, committing up to BULK_WRITE_CONCURRENCY batches at
+        a time. A batch that fails is retried document by document; documents
+        that still fail are reported in the result instead of raising.
+        """
+        return await self._bulk_write(
+            collection,
+            [(doc_id, data) for doc_id, data in documents.items()],
+            merge,
+        )
 
-            await batch.commit()
+    async def bulk_delete(
+        self, collection: str, document_ids: list[str]
+    ) -> BulkWriteResult:
+        """Same as bulk_set, for deletes."""
+        return await self._bulk_write(
+            collection, [(doc_id, None) for doc_id in document_ids], False
+        )
 
-            logger.info(
-                "batch_delete_completed",
-                collection=collection,
-                count=len(document_ids),
-            )
-            return True
+    async def _bulk_write(
+        self,
+        collection: str,
+        writes: list[tuple[str, typing.Optional[dict[str, typing.Any]]]],
+        merge: bool,
+    ) -> BulkWriteResult:
+        result = BulkWriteResult()
+        semaphore = asyncio.Semaphore(BULK_WRITE_CONCURRENCY)
+        retry_semaphore = asyncio.Semaphore(BULK_WRITE_RETRY_CONCURRENCY)
+        collection_ref = self._client.collection(collection)
 
-        except Exception as e:
-            logger.error(
-                "firestore_batch_delete_error",
-                collection=collection,
-                error=str(e),
+        async def write_document(
+            doc_id: str, data: typing.Optional[dict[str, typing.Any]]
+        ) -> None:
+            async with retry_semaphore:
+                try:
+                    if data is None:
+                        await self.delete_document(collection, doc_id)
+                    else:
+                        await self.set_document(collection, doc_id, data, merge=merge)
+                    result.written += 1
+                except Exception as e:
+                    result.failed[doc_id] = str(e)
+
+        async def write_chunk(
+            chunk: list[tuple[str, typing.Optional[dict[str, typing.Any]]]],
+        ) -> None:
+            async with semaphore:
+                batch = self._client.batch()
+                for doc_id, data in chunk:
+                    if data is None:
+                        batch.delete(collection_ref.document(doc_id))
+                    else:
+                        batch.set(collection_ref.document(doc_id), data, merge=merge)
+
+                try:
+                    await batch.commit()
+                    result.written += len(chunk)
+                    return
+                except Exception as e:
+                    # Commits are atomic, so none of the chunk was written.
+                    logger.warning(
+                        "firestore_bulk_chunk_failed",
+                        collection=collection,
+                        count=len(chunk),
+                        error=str(e),
+                    )
+
+            await asyncio.gather(
+                *(write_document(doc_id, data) for doc_id, data in chunk)
             )
-            raise
+
+        await asyncio.gather(*(write_chunk(chunk) for chunk in _chunk_writes(writes)))
+
+        log = logger.error if result.failed else logger.info
+        log(
+            "bulk_write_completed",
+            collection=collection,
+            count=len(writes),
+            written=result.written,
+            failed=list(result.failed),
+        )
+        return result
 
     async def document_exists(self, collection: str, document_id: str) -> bool:
         try:
             doc_ref = self._client.collection(collection).document(document_id)
-            doc = await doc_ref.get()
+            # An empty projection returns the document's name but none of its data.
+            doc = await doc_ref.get(field_paths=[], timeout=_read_timeout())
             return doc.exists
 
         except Exception as e:
@@ -334,19 +815,70 @@ class FirestoreClient:
             )
             raise
 
-    async def get_collection_count(self, collection: str) -> int:
+    async def get_collection_count(
+        self,
+        collection: str,
+        filters: typing.Optional[list[tuple[str, str, typing.Any]]] = None,
+        **kwargs,
+    ) -> int:
+        result = await self.aggregate(
+            collection, [("count", None)], filters=filters, **kwargs
+        )
+        return result["count"]
+
+    async def aggregate(
+        self,
+        collection: str,
+        aggregations: list[tuple[str, typing.Optional[str]]],
+        filters: typing.Optional[list[tuple[str, str, typing.Any]]] = None,
+        **kwargs,
+    ) -> dict[str, typing.Any]:
+        """
+        Runs ("count", None), ("sum", field) and ("avg", field) aggregations
+        over the documents matching the filters in a single RPC, without
+        reading the documents. Results are keyed "count", "sum_<field>" and
+        "avg_<field>"; the average of no values is None.
+        """
         try:
-            docs = self._client.collection(collection).stream()
-            count = 0
-            async for _ in docs:
-                count += 1
+            query = self._build_query(
+                collection, filters, None, "ASCENDING", None, kwargs
+            )
+
+            if getattr(query, "count", None) is None:
+                # Stand-in clients without aggregation queries.
+                result = _aggregate_documents(
+                    [doc.to_dict() async for doc in query.stream()], aggregations
+                )
+            else:
+                aggregation_query = query
+                for function, field in aggregations:
+                    alias = _aggregation_alias(function, field)
+                    if function == "count":
+                        aggregation_query = aggregation_query.count(alias=alias)
+                    elif function in ("sum", "avg"):
+                        aggregation_query = getattr(aggregation_query, function)(
+                            field, alias=alias
+                        )
+                    else:
+                        raise ValueError(f"Unknown aggregation: {function}")
 
-            logger.debug("collection_counted", collection=collection, count=count)
-            return count
+                result = {
+                    aggregation.alias: aggregation.value
+                    for row in await aggregation_query.get(timeout=_read_timeout())
+                    for aggregation in row
+                }
+
+            logger.debug(
+                "collection_aggregated",
+                collection=collection,
+                filters=filters,
+                result=result,
+            )
+            return result
 
         except Exception as e:
             logger.error(
-                "firestore_count_error",
+                "firestore_aggregate_error",
                 collection=collection,
                 error=str(e),
             )
@@ -357,14 +889,18 @@ class FirestoreClient:
         parent_collection: str,
         parent_document: str,
         subcollection: str,
+        fields: typing.Optional[list[str]] = None,
     ) -> list[dict[str, typing.Any]]:
         try:
-            docs = (
+            query = (
                 self._client.collection(parent_collection)
                 .document(parent_document)
                 .collection(subcollection)
-                .stream()
             )
+            if fields is not None:
+                query = query.select(fields)
+
+            docs = query.stream()
             results = [doc.to_dict() async for doc in docs]
 
             logger.debug(
@@ -384,6 +920,112 @@ class FirestoreClient:
             )
             raise
 
+    async def stream_collection_pages(
+        self,
+        collection: str,
+        page_size: int = STREAM_PAGE_SIZE,
+        filters: typing.Optional[list[tuple[str, str, typing.Any]]] = None,
+        order_by: typing.Optional[str] = None,
+        order_direction: str = "ASCENDING",
+        fields: typing.Optional[list[str]] = None,
+        **kwargs,
+    ) -> typing.AsyncIterator[list[dict[str, typing.Any]]]:
+        """
+        Yields the documents of a collection a page at a time, in order_by
+        order (document id when not given).
+
+        Each page is one query that starts after the last document of the
+        previous page, and the next one is only sent once the caller asks for
+        it, so a slow consumer holds at most one page however large the
+        collection is. With `fields`, documents also hold order_by.
+        """
+        direction = (
+            firestore.Query.DESCENDING
+            if order_direction == "DESCENDING"
+            else firestore.Query.ASCENDING
+        )
+        query = self._build_query(
+            collection, filters, order_by, order_direction, None, kwargs
+        ).order_by("__name__", direction=direction)
+
+        if fields is not None:
+            query = query.select(
+                list(dict.fromkeys([*fields, *([order_by] if order_by else [])]))
+            )
+
+        count = 0
+        last_doc = None
+
+        try:
+            while True:
+                page_query = query if last_doc is None else query.start_after(last_doc)
+                docs = [doc async for doc in page_query.limit(page_size).stream()]
+
+                if not docs:
+                    break
+
+                count += len(docs)
+                last_doc = docs[-1]
+
+                documents = [doc.to_dict() for doc in docs]
+                yield documents  # pyright: ignore[reportReturnType]
+
+                if len(docs) < page_size:
+                    break
+
+            logger.debug("collection_streamed", collection=collection, count=count)
+
+        except Exception as e:
+            logger.error(
+                "firestore_stream_error",
+                collection=collection,
+                streamed=count,
+                error=str(e),
+            )
+            raise
+
+    async def stream_collection(
+        self,
+        collection: str,
+        page_size: int = STREAM_PAGE_SIZE,
+        filters: typing.Optional[list[tuple[str, str, typing.Any]]] = None,
+        order_by: typing.Optional[str] = None,
+        order_direction: str = "ASCENDING",
+        fields: typing.Optional[list[str]] = None,
+        **kwargs,
+    ) -> typing.AsyncIterator[dict[str, typing.Any]]:
+        """Document-at-a-time view of stream_collection_pages."""
+        pages = self.stream_collection_pages(
+            collection,
+            page_size=page_size,
+            filters=filters,
+            order_by=order_by,
+            order_direction=order_direction,
+            fields=fields,
+            **kwargs,
+        )
+
+        async for page in pages:
+            for document in page:
+                yield document
+
+    def stream_subcollection(
+        self,
+        parent_collection: str,
+        parent_document: str,
+        subcollection: str,
+        page_size: int = STREAM_PAGE_SIZE,
+        fields: typing.Optional[list[str]] = None,
+    ) -> typing.AsyncIterator[dict[str, typing.Any]]:
+        return self.stream_collection(
+            f"{parent_collection}/{parent_document}/{subcollection}",
+            page_size=page_size,
+            fields=fields,
+        )
+
+    def get_retry_stats(self) -> dict[str, typing.Any]:
+        return self._retry_stats.get_stats()
+
     def get_raw_client(self) -> firestore.AsyncClient:
         return self._client
 
@@ -395,6 +1037,16 @@ class FirestoreClient:
 def get_firestore_client() -> FirestoreClient:
     global _firestore_client
 
+    if _firestore_client is None and os.getenv("FIRESTORE_BACKEND") == "memory":
+        from utils import in_memory_firestore
+
+        _firestore_client = in_memory_firestore.InMemoryFirestoreClient(
+            latency=float(os.getenv("FIRESTORE_MEMORY_LATENCY", "0")),
+            jitter=float(os.getenv("FIRESTORE_MEMORY_JITTER", "0")),
+            failure_rate=float(os.getenv("FIRESTORE_MEMORY_FAILURE_RATE", "0")),
+            seed_path=os.getenv("FIRESTORE_MEMORY_SEED"),
+        )
+
     if _firestore_client is None:
         service_account_path = os.getenv(
             "SERVICE_ACCOUNT_PATH",
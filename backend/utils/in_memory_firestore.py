@@ -0,0 +1,397 @@
+import asyncio
+import copy
+import json
+import random
+import typing
+
+import structlog
+from google.api_core import exceptions
+from google.cloud.firestore_v1 import field_path
+
+from utils import firestore_client
+
+logger = structlog.get_logger(__name__)
+
+_MISSING = object()
+
+_OPERATORS: dict[str, typing.Callable[[typing.Any, typing.Any], bool]] = {
+    "==": lambda field, value: field == value,
+    "!=": lambda field, value: field != value,
+    "<": lambda field, value: field < value,
+    "<=": lambda field, value: field <= value,
+    ">": lambda field, value: field > value,
+    ">=": lambda field, value: field >= value,
+    "in": lambda field, value: field in value,
+    "not-in": lambda field, value: field not in value,
+    "array_contains": lambda field, value: (isinstance(field, list) and value in field),
+    "array_contains_any": lambda field, value: (
+        isinstance(field, list) and any(item in field for item in value)
+    ),
+}
+
+
+def _get_field(data: dict[str, typing.Any], path: str) -> typing.Any:
+    try:
+        return field_path.get_nested_value(path, data)
+    except KeyError:
+        return _MISSING
+
+
+def _project(
+    data: dict[str, typing.Any], fields: typing.Optional[list[str]]
+) -> dict[str, typing.Any]:
+    if fields is None:
+        return copy.deepcopy(data)
+
+    projected: dict[str, typing.Any] = {}
+    for path in fields:
+        value = _get_field(data, path)
+        if value is _MISSING:
+            continue
+
+        *parents, name = path.split(".")
+        target = projected
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[name] = copy.deepcopy(value)
+
+    return projected
+
+
+def _merge(target: dict[str, typing.Any], updates: dict[str, typing.Any]) -> None:
+    for key, value in updates.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = copy.deepcopy(value)
+
+
+class _Snapshot:
+    def __init__(
+        self,
+        reference: "_DocumentReference",
+        data: typing.Optional[dict[str, typing.Any]],
+    ):
+        self.reference = reference
+        self.id = reference.id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self) -> typing.Optional[dict[str, typing.Any]]:
+        return self._data
+
+    def get(self, path: str) -> typing.Any:
+        if self._data is None or (value := _get_field(self._data, path)) is _MISSING:
+            raise KeyError(path)
+
+        return value
+
+
+class _DocumentReference:
+    def __init__(self, client: "_InMemoryClient", collection: str, doc_id: str):
+        self._client = client
+        self._collection = collection
+        self.id = doc_id
+
+    def collection(self, name: str) -> "_Query":
+        return _Query(self._client, f"{self._collection}/{self.id}/{name}")
+
+    def _snapshot(self, fields: typing.Optional[list[str]] = None) -> _Snapshot:
+        data = self._client.store.get(self._collection, {}).get(self.id)
+        return _Snapshot(self, None if data is None else _project(data, fields))
+
+    def _write(self, data: typing.Optional[dict[str, typing.Any]], merge: bool) -> None:
+        documents = self._client.store.setdefault(self._collection, {})
+
+        if data is None:
+            documents.pop(self.id, None)
+        elif merge and self.id in documents:
+            _merge(documents[self.id], data)
+        else:
+            documents[self.id] = copy.deepcopy(data)
+
+    async def get(
+        self,
+        field_paths: typing.Optional[list[str]] = None,
+        timeout: typing.Optional[float] = None,
+    ) -> _Snapshot:
+        await self._client.rpc(timeout)
+        return self._snapshot(field_paths)
+
+    async def set(
+        self,
+        data: dict[str, typing.Any],
+        merge: bool = False,
+        timeout: typing.Optional[float] = None,
+    ) -> None:
+        await self._client.rpc(timeout)
+        self._write(data, merge)
+
+    async def update(
+        self, updates: dict[str, typing.Any], timeout: typing.Optional[float] = None
+    ) -> None:
+        await self._client.rpc(timeout)
+
+        document = self._client.store.get(self._collection, {}).get(self.id)
+        if document is None:
+            raise exceptions.NotFound(f"No document to update: {self.id}")
+
+        for path, value in updates.items():
+            *parents, name = path.split(".")
+            target = document
+            for parent in parents:
+                target = target.setdefault(parent, {})
+            target[name] = copy.deepcopy(value)
+
+    async def delete(self, timeout: typing.Optional[float] = None) -> None:
+        await self._client.rpc(timeout)
+        self._write(None, False)
+
+
+class _Query:
+    """Collection reference and query in one; every method returns a copy."""
+
+    def __init__(self, client: "_InMemoryClient", collection: str):
+        self._client = client
+        self._collection = collection
+        self._filters: list[tuple[str, str, typing.Any]] = []
+        self._orders: list[tuple[str, str]] = []
+        self._start_after: typing.Optional[list[typing.Any]] = None
+        self._offset = 0
+        self._limit: typing.Optional[int] = None
+        self._fields: typing.Optional[list[str]] = None
+
+    def _copy(self) -> "_Query":
+        query = copy.copy(self)
+        query._filters = list(self._filters)
+        query._orders = list(self._orders)
+        return query
+
+    def document(self, doc_id: str) -> _DocumentReference:
+        return _DocumentReference(self._client, self._collection, doc_id)
+
+    def where(self, *, filter) -> "_Query":
+        if filter.op_string not in _OPERATORS:
+            raise ValueError(f"Unsupported operator: {filter.op_string}")
+
+        query = self._copy()
+        query._filters.append((filter.field_path, filter.op_string, filter.value))
+        return query
+
+    def order_by(self, field: str, direction: str = "ASCENDING") -> "_Query":
+        query = self._copy()
+        query._orders.append((field, direction))
+        return query
+
+    def start_after(self, values: typing.Any) -> "_Query":
+        if isinstance(values, _Snapshot):
+            values = [
+                values.id if field == "__name__" else values.get(field)
+                for field, _ in self._orders
+            ]
+
+        query = self._copy()
+        query._start_after = list(values)
+        return query
+
+    def offset(self, offset: int) -> "_Query":
+        query = self._copy()
+        query._offset = offset
+        return query
+
+    def limit(self, limit: int) -> "_Query":
+        query = self._copy()
+        query._limit = limit
+        return query
+
+    def select(self, fields: list[str]) -> "_Query":
+        query = self._copy()
+        query._fields = list(fields)
+        return query
+
+    def _sort_key(self, doc_id: str, data: dict[str, typing.Any]) -> list:
+        return [
+            doc_id if field == "__name__" else _get_field(data, field)
+            for field, _ in self._orders
+        ]
+
+    def _run(self) -> list[_Snapshot]:
+        documents = [
+            (doc_id, data)
+            for doc_id, data in self._client.store.get(self._collection, {}).items()
+            if all(
+                (value := _get_field(data, field)) is not _MISSING
+                and _OPERATORS[operator](value, expected)
+                for field, operator, expected in self._filters
+            )
+            # Like Firestore, ordering by a field skips documents without it.
+            and all(
+                field == "__name__" or _get_field(data, field) is not _MISSING
+                for field, _ in self._orders
+            )
+        ]
+
+        orders = list(self._orders)
+        if not any(field == "__name__" for field, _ in orders):
+            orders.append(("__name__", orders[-1][1] if orders else "ASCENDING"))
+
+        # Stable sorts from the last ordering to the first.
+        for index in reversed(range(len(orders))):
+            field, direction = orders[index]
+            documents.sort(
+                key=lambda item: (
+                    item[0] if field == "__name__" else _get_field(item[1], field)
+                ),
+                reverse=direction == "DESCENDING",
+            )
+
+        if self._start_after is not None:
+            documents = [
+                item
+                for item in documents
+                if self._is_after(self._sort_key(*item), self._start_after)
+            ]
+
+        documents = documents[self._offset :]
+        if self._limit is not None:
+            documents = documents[: self._limit]
+
+        return [
+            _Snapshot(self.document(doc_id), _project(data, self._fields))
+            for doc_id, data in documents
+        ]
+
+    def _is_after(self, key: list, cursor: list) -> bool:
+        for (_, direction), value, bound in zip(self._orders, key, cursor):
+            if value == bound:
+                continue
+
+            return value > bound if direction != "DESCENDING" else value < bound
+
+        return False
+
+    async def stream(
+        self, timeout: typing.Optional[float] = None
+    ) -> typing.AsyncIterator[_Snapshot]:
+        await self._client.rpc(timeout)
+
+        for snapshot in self._run():
+            yield snapshot
+
+
+class _WriteBatch:
+    def __init__(self, client: "_InMemoryClient"):
+        self._client = client
+        self._writes: list[
+            tuple[_DocumentReference, typing.Optional[dict[str, typing.Any]], bool]
+        ] = []
+
+    def set(
+        self,
+        reference: _DocumentReference,
+        data: dict[str, typing.Any],
+        merge: bool = False,
+    ) -> None:
+        self._writes.append((reference, data, merge))
+
+    def delete(self, reference: _DocumentReference) -> None:
+        self._writes.append((reference, None, False))
+
+    async def commit(self, timeout: typing.Optional[float] = None) -> None:
+        await self._client.rpc(timeout)
+
+        if len(self._writes) > 500:
+            raise exceptions.InvalidArgument("maximum 500 writes allowed per request")
+
+        for reference, data, merge in self._writes:
+            reference._write(data, merge)
+
+
+class _InMemoryClient:
+    """The subset of firestore.AsyncClient that FirestoreClient uses."""
+
+    def __init__(self, latency: float, jitter: float, failure_rate: float):
+        self.store: dict[str, dict[str, dict[str, typing.Any]]] = {}
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.rpcs = 0
+
+    async def rpc(self, timeout: typing.Optional[float] = None) -> None:
+        self.rpcs += 1
+
+        delay = self.latency + random.uniform(0, self.jitter)
+        if timeout is not None and delay > timeout:
+            await asyncio.sleep(timeout)
+            raise exceptions.DeadlineExceeded("Deadline exceeded")
+
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise exceptions.ServiceUnavailable("Injected failure")
+
+    def collection(self, path: str) -> _Query:
+        return _Query(self, path)
+
+    def batch(self) -> _WriteBatch:
+        return _WriteBatch(self)
+
+    async def get_all(
+        self,
+        references: list[_DocumentReference],
+        field_paths: typing.Optional[list[str]] = None,
+        timeout: typing.Optional[float] = None,
+    ) -> typing.AsyncIterator[_Snapshot]:
+        await self.rpc(timeout)
+
+        unique = {(ref._collection, ref.id): ref for ref in references}
+        for reference in unique.values():
+            yield reference._snapshot(field_paths)
+
+    def close(self) -> None:
+        pass
+
+
+class InMemoryFirestoreClient(firestore_client.FirestoreClient):
+    """
+    FirestoreClient backed by process memory instead of a Firestore project,
+    for benchmarks and local runs without service_account.json.
+
+    Every RPC (document read or write, query, get_all, batch commit) waits
+    `latency` plus up to `jitter` seconds, failing with DeadlineExceeded when
+    its timeout is shorter, and then fails with ServiceUnavailable with
+    probability `failure_rate`. Aggregations fall back to streaming the
+    matching documents, and composite indexes are never required.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        seed_path: typing.Optional[str] = None,
+    ):
+        self._client = _InMemoryClient(latency, jitter, failure_rate)
+        self._project_id = "in-memory"
+        self._retry_stats = firestore_client.RetryStats()
+
+        if seed_path:
+            self.load(seed_path)
+
+        logger.info(
+            "firestore_client_initialized",
+            project=self._project_id,
+            latency=latency,
+            failure_rate=failure_rate,
+        )
+
+    def load(self, path: str) -> None:
+        """Loads {"collection/path": {"document_id": {...}}} from a JSON file."""
+        with open(path, encoding="utf-8") as file:
+            for collection, documents in json.load(file).items():
+                self._client.store.setdefault(collection, {}).update(documents)
+
+    @property
+    def rpc_count(self) -> int:
+        return self._client.rpcs
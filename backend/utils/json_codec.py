@@ -0,0 +1,23 @@
+import json
+import typing
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is listed in requirements.txt
+    orjson = None
+
+HAS_ORJSON = orjson is not None
+
+
+def loads(data: bytes | str) -> typing.Any:
+    if orjson is not None:
+        return orjson.loads(data)
+
+    return json.loads(data)
+
+
+def dumps(data: typing.Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
@@ -0,0 +1,230 @@
+import asyncio
+import typing
+
+import cachetools
+import redis.asyncio as redis
+import structlog
+
+from utils import cache_client
+
+logger = structlog.get_logger(__name__)
+
+INVALIDATION_CHANNEL = "__redis__:invalidate"
+
+# Invalidations are remembered for longer than any read can be in flight
+# (socket_timeout is 5 seconds), so a value read before a concurrent write
+# is never stored after that write's invalidation has already arrived.
+INVALIDATION_MEMORY_SECONDS = 30
+
+RECONNECT_DELAY_SECONDS = 1.0
+
+
+class NearCache:
+    """
+    Process-local copy of decoded Redis values, kept coherent with Redis
+    through server-assisted client-side caching (CLIENT TRACKING in BCAST
+    mode). Redis pushes the name of every modified key under the tracked
+    prefixes to the listener connection, which drops the key from this cache
+    and from the per-repository L1 caches (they use the same keys). FLUSHDB
+    clears everything, so /admin/clear-cache reaches every worker.
+
+    Values are only served while the listener is connected; on reconnect the
+    caches are cleared because invalidations may have been missed.
+
+    BCAST also reports this process's own writes, which would evict the L1
+    entry a repository fills right after writing the same value to Redis.
+    NOLOOP cannot help, as it only skips writes made on the tracking
+    connection and ours go through the pooled ones. Instead writers call
+    begin_write() before the SET, and the next invalidation of that key is
+    taken as its echo and skipped. Redis reports writes in the order it
+    applied them, so a foreign write mistaken for ours always came first and
+    the value we wrote is still the newest.
+    """
+
+    def __init__(
+        self,
+        connection_kwargs: dict[str, typing.Any],
+        prefixes: list[str],
+        namespace: str = "",
+        max_size: int = 10000,
+        ttl: int = 300,
+    ):
+        self._connection_kwargs = connection_kwargs
+        self._namespace = namespace
+        self._prefixes = [self.to_redis_key(prefix) for prefix in prefixes]
+
+        self._cache = cachetools.TTLCache(maxsize=max_size, ttl=ttl)
+        self._invalidated_at = cachetools.TTLCache(
+            maxsize=max(max_size * 10, 100000), ttl=INVALIDATION_MEMORY_SECONDS
+        )
+        self._own_writes: cachetools.TTLCache = cachetools.TTLCache(
+            maxsize=max_size, ttl=INVALIDATION_MEMORY_SECONDS
+        )
+        self._version = 0
+        self._flushed_at = 0
+
+        self._connected = False
+        self._listener_task: typing.Optional[asyncio.Task] = None
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "invalidations": 0,
+            "own_writes_skipped": 0,
+            "flushes": 0,
+            "reconnects": 0,
+        }
+
+    def to_redis_key(self, key: str) -> str:
+        return f"{self._namespace}:{key}" if self._namespace else key
+
+    def _to_key(self, redis_key: str) -> str:
+        if self._namespace and redis_key.startswith(f"{self._namespace}:"):
+            return redis_key[len(self._namespace) + 1 :]
+
+        return redis_key
+
+    def get(self, key: str) -> tuple[bool, typing.Any]:
+        if not self._connected:
+            return False, None
+
+        if key in self._cache:
+            self._stats["hits"] += 1
+            return True, self._cache[key]
+
+        self._stats["misses"] += 1
+        return False, None
+
+    def begin_read(self) -> int:
+        """Returns the version to pass to set() once the Redis read completes."""
+        return self._version
+
+    def set(self, key: str, value: typing.Any, read_version: int) -> None:
+        if (
+            not self._connected
+            or read_version < self._flushed_at
+            or self._invalidated_at.get(key, -1) > read_version
+        ):
+            return
+
+        self._cache[key] = value
+
+    def invalidate(self, key: str, include_l1: bool = True) -> None:
+        self._version += 1
+        self._invalidated_at[key] = self._version
+        self._cache.pop(key, None)
+
+        if include_l1:
+            cache_client.invalidate_key(key)
+
+    def begin_write(self, key: str) -> None:
+        """Call before writing `key`, so its invalidation echo is not applied."""
+        self._own_writes[key] = self._own_writes.get(key, 0) + 1
+
+    def cancel_write(self, key: str) -> None:
+        """Call when a write announced with begin_write() did not happen."""
+        if (pending := self._own_writes.get(key, 0) - 1) > 0:
+            self._own_writes[key] = pending
+        else:
+            self._own_writes.pop(key, None)
+
+    def flush(self) -> None:
+        self._version += 1
+        self._flushed_at = self._version
+        self._cache.clear()
+        self._own_writes.clear()
+
+        cache_client.clear_all_caches()
+
+    def _handle_message(self, message: typing.Any) -> None:
+        if not isinstance(message, list) or message[0] != "message":
+            return
+
+        keys = message[2]
+
+        if keys is None:
+            self._stats["flushes"] += 1
+            self.flush()
+            return
+
+        for redis_key in keys:
+            key = self._to_key(redis_key)
+
+            if key in self._own_writes:
+                self._stats["own_writes_skipped"] += 1
+                self.cancel_write(key)
+                continue
+
+            self._stats["invalidations"] += 1
+            self.invalidate(key)
+
+    async def _listen(self) -> None:
+        client = redis.Redis(
+            **{**self._connection_kwargs, "socket_timeout": None},
+            socket_keepalive=True,
+            decode_responses=True,
+        )
+
+        try:
+            while True:
+                connection = None
+
+                try:
+                    connection = await client.connection_pool.get_connection()
+
+                    await connection.send_command("CLIENT", "ID")
+                    client_id = await connection.read_response()
+
+                    tracking_args = ["CLIENT", "TRACKING", "ON"]
+                    tracking_args += ["REDIRECT", client_id, "BCAST"]
+                    for prefix in self._prefixes:
+                        tracking_args += ["PREFIX", prefix]
+
+                    await connection.send_command(*tracking_args)
+                    await connection.read_response()
+
+                    await connection.send_command("SUBSCRIBE", INVALIDATION_CHANNEL)
+                    await connection.read_response()
+
+                    self.flush()
+                    self._connected = True
+                    logger.info("near_cache_tracking_started", prefixes=self._prefixes)
+
+                    while True:
+                        self._handle_message(await connection.read_response())
+
+                except (redis.RedisError, OSError) as e:
+                    logger.warning("near_cache_tracking_lost", error=str(e))
+
+                finally:
+                    self._connected = False
+                    if connection is not None:
+                        await connection.disconnect()
+                        await client.connection_pool.release(connection)
+
+                self._stats["reconnects"] += 1
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+        finally:
+            await client.aclose()
+
+    def start(self) -> None:
+        if self._listener_task is None:
+            self._listener_task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+
+            self._listener_task = None
+
+    def get_stats(self) -> dict[str, typing.Any]:
+        return {
+            **self._stats,
+            "size": len(self._cache),
+            "connected": self._connected,
+        }
@@ -0,0 +1,462 @@
+import asyncio
+import enum
+import typing
+import uuid
+
+import structlog
+
+from utils import redis_client as redis_client_module
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_APP_RATE_LIMITS = "20:1,100:120"
+DEFAULT_INTERACTIVE_RESERVE = 0.2
+# Part of each window one process may use on its own while Redis is down.
+# The API workers and the scheduler all fall back at the same time, so a full
+# share would let every one of them spend the whole quota.
+DEFAULT_FALLBACK_SHARE = 0.2
+# Service rate limits may come back without a Retry-After header.
+DEFAULT_RETRY_AFTER = 1.0
+# How long a limiter keeps using its local fallback after Redis failed.
+REDIS_FALLBACK_COOLDOWN = 5.0
+REDIS_KEY_PREFIX = "riot_rate_limit"
+# Method bucket shared by endpoints that match none of the known patterns.
+UNKNOWN_METHOD_KEY = "unknown"
+
+# Sliding window log shared by every process using the same key. Returns 0 once
+# a slot was taken, otherwise the number of milliseconds to wait before retrying.
+ACQUIRE_SCRIPT = """
+local pause = redis.call('PTTL', KEYS[2])
+if pause > 0 then
+    return pause
+end
+
+local rate = tonumber(ARGV[1])
+local period_ms = tonumber(ARGV[2])
+local reserved = tonumber(ARGV[3])
+
+local now = redis.call('TIME')
+local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now_ms - period_ms)
+
+if redis.call('ZCARD', KEYS[1]) + reserved < rate then
+    redis.call('ZADD', KEYS[1], now_ms, ARGV[4])
+    redis.call('PEXPIRE', KEYS[1], period_ms)
+    return 0
+end
+
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+local wait = tonumber(oldest[2]) + period_ms - now_ms
+if wait < 1 then
+    wait = 1
+end
+return wait
+"""
+
+# Tops the shared window up to the count Riot reported, so requests made by
+# processes that do not share this limiter are accounted for as well.
+SYNC_SCRIPT = """
+local count = tonumber(ARGV[1])
+local period_ms = tonumber(ARGV[2])
+
+local now = redis.call('TIME')
+local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now_ms - period_ms)
+
+local missing = count - redis.call('ZCARD', KEYS[1])
+for i = 1, missing do
+    redis.call('ZADD', KEYS[1], now_ms, ARGV[3] .. ':' .. i)
+end
+
+if missing > 0 then
+    redis.call('PEXPIRE', KEYS[1], period_ms)
+end
+return missing
+"""
+
+
+class RequestLane(str, enum.Enum):
+    INTERACTIVE = "interactive"
+    BULK = "bulk"
+
+
+def parse_rate_limit_header(
+    header: typing.Optional[str],
+) -> list[tuple[int, float]]:
+    """Parse Riot's "<value>:<seconds>,..." rate limit headers."""
+    if not header:
+        return []
+
+    limits = []
+    for part in header.split(","):
+        try:
+            value, period = part.strip().split(":")
+            limits.append((int(value), float(period)))
+        except ValueError:
+            logger.warning("invalid_rate_limit_header", header=header)
+            return []
+
+    return limits
+
+
+class AsyncRateLimiter:
+    def __init__(self, rate: int, period: float):
+        self.rate = rate
+        self.period = period
+        self.allowance = rate
+        self.last_check = asyncio.get_event_loop().time()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        current = asyncio.get_event_loop().time()
+        time_passed = current - self.last_check
+        self.last_check = current
+        self.allowance += time_passed * (self.rate / self.period)
+
+        if self.allowance > self.rate:
+            self.allowance = self.rate
+
+    async def acquire(self, reserve: float = 0.0):
+        # Callers with a reserve only get a token while more than that share of
+        # the window is still available, keeping headroom for everyone else.
+        threshold = min(1.0 + self.rate * reserve, float(self.rate))
+
+        while True:
+            async with self._lock:
+                self._refill()
+
+                if self.allowance >= threshold:
+                    self.allowance -= 1.0
+                    return
+
+                sleep_time = (threshold - self.allowance) * (self.period / self.rate)
+
+            logger.warning(
+                "rate_limit_waiting",
+                sleep_time=sleep_time,
+                rate=self.rate,
+                period=self.period,
+                reserve=reserve,
+            )
+            await asyncio.sleep(sleep_time)
+
+    def carry_over(self, previous: "AsyncRateLimiter") -> None:
+        """Keeps the requests `previous` already spent in this window spent."""
+        previous._refill()
+
+        used = previous.rate - previous.allowance
+        self.allowance = min(max(self.rate - used, 0.0), float(self.rate))
+
+    async def sync_count(self, count: int) -> None:
+        """Lower the local allowance to what Riot reports as still available."""
+        self._refill()
+
+        remaining = float(self.rate - count)
+        if remaining < self.allowance:
+            self.allowance = max(remaining, 0.0)
+
+
+class RedisRateLimiter:
+    """
+    Sliding window limiter stored in Redis, shared by every API worker and the
+    scheduler. Falls back to a local AsyncRateLimiter while Redis is unavailable.
+    """
+
+    def __init__(
+        self,
+        redis_client: redis_client_module.RedisClient,
+        key: str,
+        pause_key: str,
+        rate: int,
+        period: float,
+        fallback_share: float = DEFAULT_FALLBACK_SHARE,
+    ):
+        self.rate = rate
+        self.period = period
+        self._redis = redis_client
+        self._key = key
+        self._pause_key = pause_key
+        self._fallback_share = fallback_share
+        self._fallback = AsyncRateLimiter(
+            rate=max(1, int(rate * fallback_share)), period=period
+        )
+        self._fallback_until = 0.0
+
+    def _use_fallback(self) -> bool:
+        return asyncio.get_event_loop().time() < self._fallback_until
+
+    def _start_fallback(self, error: Exception) -> None:
+        logger.warning(
+            "rate_limit_redis_unavailable",
+            key=self._key,
+            cooldown=REDIS_FALLBACK_COOLDOWN,
+            error=str(error),
+        )
+        self._fallback_until = asyncio.get_event_loop().time() + REDIS_FALLBACK_COOLDOWN
+
+    def carry_over(self, previous: "AsyncRateLimiter | RedisRateLimiter") -> None:
+        # The shared window lives under the same Redis key and keeps its
+        # entries; only the local fallback has state to hand over.
+        if isinstance(previous, RedisRateLimiter):
+            self._fallback.carry_over(previous._fallback)
+            self._fallback_until = previous._fallback_until
+        else:
+            self._fallback.carry_over(previous)
+
+    async def acquire(self, reserve: float = 0.0):
+        reserved = min(self.rate * reserve, self.rate - 1.0)
+
+        while not self._use_fallback():
+            try:
+                wait_ms = await self._redis.run_script(
+                    ACQUIRE_SCRIPT,
+                    keys=[self._key, self._pause_key],
+                    args=[
+                        self.rate,
+                        int(self.period * 1000),
+                        reserved,
+                        uuid.uuid4().hex,
+                    ],
+                )
+            except Exception as e:
+                self._start_fallback(e)
+                break
+
+            if not wait_ms:
+                return
+
+            logger.warning(
+                "rate_limit_waiting",
+                sleep_time=wait_ms / 1000,
+                rate=self.rate,
+                period=self.period,
+                reserve=reserve,
+                shared=True,
+            )
+            await asyncio.sleep(wait_ms / 1000)
+
+        await self._fallback.acquire(reserve)
+
+    async def sync_count(self, count: int) -> None:
+        # Riot counts the whole key; the fallback only holds this process's share.
+        await self._fallback.sync_count(int(count * self._fallback_share))
+
+        if self._use_fallback():
+            return
+
+        try:
+            await self._redis.run_script(
+                SYNC_SCRIPT,
+                keys=[self._key],
+                args=[min(count, self.rate), int(self.period * 1000), uuid.uuid4().hex],
+            )
+        except Exception as e:
+            self._start_fallback(e)
+
+
+class RateLimitBucket:
+    """All rate limit windows that apply to one (routing value, scope) pair."""
+
+    def __init__(
+        self,
+        name: str,
+        limits: list[tuple[int, float]],
+        redis_client: typing.Optional[redis_client_module.RedisClient] = None,
+        fallback_share: float = DEFAULT_FALLBACK_SHARE,
+    ):
+        self.name = name
+        self._redis = redis_client
+        self._fallback_share = fallback_share
+        self._limiters: dict[float, AsyncRateLimiter | RedisRateLimiter] = {}
+        self._paused_until = 0.0
+
+        self.update_limits(limits)
+
+    def _get_key(self, suffix: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:{self.name}:{suffix}"
+
+    def _create_limiter(
+        self, rate: int, period: float
+    ) -> AsyncRateLimiter | RedisRateLimiter:
+        if self._redis is None:
+            return AsyncRateLimiter(rate=rate, period=period)
+
+        return RedisRateLimiter(
+            redis_client=self._redis,
+            key=self._get_key(f"{period:g}"),
+            pause_key=self._get_key("paused"),
+            rate=rate,
+            period=period,
+            fallback_share=self._fallback_share,
+        )
+
+    def update_limits(self, limits: list[tuple[int, float]]) -> None:
+        if not limits:
+            return
+
+        for rate, period in limits:
+            limiter = self._limiters.get(period)
+            if limiter is not None and limiter.rate == rate:
+                continue
+
+            new_limiter = self._create_limiter(rate=rate, period=period)
+            if limiter is not None:
+                new_limiter.carry_over(limiter)  # pyright: ignore[reportArgumentType]
+
+            self._limiters[period] = new_limiter
+            logger.info(
+                "rate_limit_bucket_updated",
+                bucket=self.name,
+                rate=rate,
+                period=period,
+            )
+
+        periods = {period for _, period in limits}
+        for period in list(self._limiters):
+            if period not in periods:
+                del self._limiters[period]
+
+    async def sync_counts(self, counts: list[tuple[int, float]]) -> None:
+        for count, period in counts:
+            if (limiter := self._limiters.get(period)) is not None:
+                await limiter.sync_count(count)
+
+    async def pause(self, seconds: float) -> None:
+        paused_until = asyncio.get_event_loop().time() + seconds
+        if paused_until > self._paused_until:
+            self._paused_until = paused_until
+            logger.warning(
+                "rate_limit_bucket_paused", bucket=self.name, seconds=seconds
+            )
+
+        if self._redis is not None:
+            try:
+                await self._redis.set(
+                    self._get_key("paused"), "1", px=max(1, int(seconds * 1000))
+                )
+            except Exception as e:
+                logger.warning(
+                    "rate_limit_pause_not_shared", bucket=self.name, error=str(e)
+                )
+
+    async def acquire(self, reserve: float = 0.0) -> None:
+        while (remaining := self._paused_until - asyncio.get_event_loop().time()) > 0:
+            await asyncio.sleep(remaining)
+
+        for limiter in list(self._limiters.values()):
+            await limiter.acquire(reserve)
+
+    def get_limits(self) -> list[tuple[int, float]]:
+        return [(limiter.rate, limiter.period) for limiter in self._limiters.values()]
+
+
+class RiotRateLimiter:
+    """
+    Rate limit buckets keyed by routing value (euw1, kr, europe, ...) and method.
+
+    Every routing value gets its own application bucket, seeded with the
+    configured defaults, and every (routing value, method) pair gets its own
+    method bucket. Both tune themselves from the X-App-Rate-Limit and
+    X-Method-Rate-Limit headers (and their -Count counterparts) returned by Riot.
+
+    Bulk lane requests leave `interactive_reserve` of every window untouched,
+    so user-facing lookups are never queued behind background fan-outs.
+
+    With a `redis_client` the windows live in Redis, so every process using the
+    same API key draws from one budget; `fallback_share` is the part of each
+    window a single process may use on its own while Redis is unreachable.
+    """
+
+    def __init__(
+        self,
+        default_app_limits: str = DEFAULT_APP_RATE_LIMITS,
+        interactive_reserve: float = DEFAULT_INTERACTIVE_RESERVE,
+        redis_client: typing.Optional[redis_client_module.RedisClient] = None,
+        fallback_share: float = DEFAULT_FALLBACK_SHARE,
+    ):
+        self._default_app_limits = parse_rate_limit_header(default_app_limits)
+        self._interactive_reserve = interactive_reserve
+        self._redis = redis_client
+        self._fallback_share = fallback_share
+        if redis_client is not None and fallback_share >= 1.0:
+            logger.warning(
+                "rate_limit_fallback_share_unsafe",
+                fallback_share=fallback_share,
+                detail="every process may spend the full quota while Redis is down",
+            )
+        self._app_buckets: dict[str, RateLimitBucket] = {}
+        self._method_buckets: dict[tuple[str, str], RateLimitBucket] = {}
+
+    def _create_bucket(
+        self, name: str, limits: list[tuple[int, float]]
+    ) -> RateLimitBucket:
+        return RateLimitBucket(
+            name=name,
+            limits=limits,
+            redis_client=self._redis,
+            fallback_share=self._fallback_share,
+        )
+
+    def _get_app_bucket(self, region: str) -> RateLimitBucket:
+        if (bucket := self._app_buckets.get(region)) is None:
+            bucket = self._create_bucket(
+                name=f"{region}:app", limits=self._default_app_limits
+            )
+            self._app_buckets[region] = bucket
+
+        return bucket
+
+    def _get_method_bucket(self, region: str, method: str) -> RateLimitBucket:
+        if (bucket := self._method_buckets.get((region, method))) is None:
+            bucket = self._create_bucket(name=f"{region}:{method}", limits=[])
+            self._method_buckets[(region, method)] = bucket
+
+        return bucket
+
+    async def acquire(
+        self,
+        region: str,
+        method: str,
+        lane: RequestLane = RequestLane.INTERACTIVE,
+    ) -> None:
+        reserve = self._interactive_reserve if lane == RequestLane.BULK else 0.0
+
+        await self._get_app_bucket(region).acquire(reserve)
+        await self._get_method_bucket(region, method).acquire(reserve)
+
+    async def pause(
+        self,
+        region: str,
+        method: str,
+        seconds: float,
+        limit_type: typing.Optional[str] = None,
+    ) -> None:
+        if limit_type == "application":
+            await self._get_app_bucket(region).pause(seconds)
+        else:
+            await self._get_method_bucket(region, method).pause(seconds)
+
+    async def update_from_headers(
+        self, region: str, method: str, headers: typing.Mapping[str, str]
+    ) -> None:
+        app_bucket = self._get_app_bucket(region)
+        app_bucket.update_limits(
+            parse_rate_limit_header(headers.get("X-App-Rate-Limit"))
+        )
+        await app_bucket.sync_counts(
+            parse_rate_limit_header(headers.get("X-App-Rate-Limit-Count"))
+        )
+
+        method_bucket = self._get_method_bucket(region, method)
+        method_bucket.update_limits(
+            parse_rate_limit_header(headers.get("X-Method-Rate-Limit"))
+        )
+        await method_bucket.sync_counts(
+            parse_rate_limit_header(headers.get("X-Method-Rate-Limit-Count"))
+        )
+
+    def get_state(self) -> dict[str, list[tuple[int, float]]]:
+        buckets = [*self._app_buckets.values(), *self._method_buckets.values()]
+        return {bucket.name: bucket.get_limits() for bucket in buckets}
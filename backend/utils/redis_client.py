@@ -1,16 +1,59 @@
+import contextlib
+import contextvars
 import json
 import logging
 import os
+import time
 import typing
 
 import redis.asyncio as redis
 import structlog
 import tenacity
 
+from utils import compression, near_cache, serializers
+
 logger = structlog.get_logger(__name__)
 
 _redis_client: typing.Optional["RedisClient"] = None
 
+# Bulk commands are sent in pipelines of at most this many commands, so a very
+# large mapping does not build one huge request/response buffer.
+PIPELINE_CHUNK_SIZE = 500
+
+# Key prefixes written by the repositories; the rate limiter's keys change on
+# every Riot request and are deliberately left out of near-cache tracking.
+NEAR_CACHE_PREFIXES = ",".join(
+    [
+        "account",
+        "active_match",
+        "champion_",
+        "leaderboard",
+        "league_entries",
+        "live_streams",
+        "match_history",
+        "pro_players",
+        "runes",
+    ]
+)
+
+
+class PttlProbe:
+    """Remaining lifetime of `key`, filled in by the get_json call that reads it."""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.pttl: typing.Optional[int] = None
+
+
+_pttl_probe: contextvars.ContextVar[typing.Optional[PttlProbe]] = (
+    contextvars.ContextVar("redis_pttl_probe", default=None)
+)
+
+
+def _chunked(items: list, size: int) -> typing.Iterator[list]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
 
 class RedisClient:
 
@@ -21,25 +64,89 @@ class RedisClient:
         db: int = 0,
         password: typing.Optional[str] = None,
         decode_responses: bool = True,
+        serializer: typing.Optional[serializers.Serializer] = None,
+        compressor: typing.Optional[compression.Compressor] = None,
+        near_cache_prefixes: typing.Optional[list[str]] = None,
+        near_cache_size: int = 10000,
+        near_cache_ttl: int = 300,
     ):
+        connection_kwargs = {
+            "host": host,
+            "port": port,
+            "db": db,
+            "password": password,
+            "socket_connect_timeout": 5,
+            "socket_timeout": 5,
+            "retry_on_timeout": True,
+            "health_check_interval": 30,
+        }
         self._client = redis.Redis(
-            host=host,
-            port=port,
-            db=db,
-            password=password,
-            decode_responses=decode_responses,
-            socket_connect_timeout=5,
-            socket_timeout=5,
-            retry_on_timeout=True,
-            health_check_interval=30,
+            **connection_kwargs, decode_responses=decode_responses
         )
+        # Serialized values are read as raw bytes, skipping the UTF-8 decode
+        # that decode_responses would do on every hit.
+        self._bytes_client = redis.Redis(**connection_kwargs, decode_responses=False)
+        self._serializer = serializer or serializers.JsonSerializer()
+        self._compressor = compressor
+        self._compression_stats = compression.CompressionStats()
+
+        # Compressed values carry a header byte, so they get their own
+        # namespace and never collide with unframed values from other pods.
+        self._namespace = self._serializer.namespace
+        if compressor is not None:
+            self._namespace = (
+                f"{self._namespace or 'json'}:z{compression.FORMAT_VERSION}"
+            )
+
+        self._scripts: dict[str, typing.Any] = {}
         logger.info(
             "redis_client_initialized",
             host=host,
             port=port,
             db=db,
+            serializer=self._serializer.namespace or "json",
+            compression=compressor.codec if compressor else None,
+        )
+
+        self._near_cache = (
+            near_cache.NearCache(
+                connection_kwargs,
+                prefixes=near_cache_prefixes,
+                namespace=self._namespace,
+                max_size=near_cache_size,
+                ttl=near_cache_ttl,
+            )
+            if near_cache_prefixes is not None
+            else None
+        )
+
+    def _serialized_key(self, key: str) -> str:
+        return f"{self._namespace}:{key}" if self._namespace else key
+
+    def _encode(self, key: str, value: typing.Any) -> bytes:
+        start = time.perf_counter()
+
+        data = self._serializer.dumps(value)
+        stored, compressed = (
+            self._compressor.compress(data) if self._compressor else (data, False)
+        )
+
+        self._compression_stats.record_encode(
+            key, len(data), len(stored), compressed, time.perf_counter() - start
         )
 
+        return stored
+
+    def _decode(self, key: str, stored: bytes) -> typing.Any:
+        start = time.perf_counter()
+
+        data = self._compressor.decompress(stored) if self._compressor else stored
+        value = self._serializer.loads(data)
+
+        self._compression_stats.record_decode(key, time.perf_counter() - start)
+
+        return value
+
     @tenacity.retry(
         retry=tenacity.retry_if_exception_type(
             (redis.ConnectionError, redis.TimeoutError)
@@ -61,6 +168,60 @@ class RedisClient:
             logger.error("redis_get_error", key=key, error=str(e))
             raise
 
+    @tenacity.retry(
+        retry=tenacity.retry_if_exception_type(
+            (redis.ConnectionError, redis.TimeoutError)
+        ),
+        stop=tenacity.stop_after_attempt(3),
+        wait=tenacity.wait_exponential(multiplier=1, min=1, max=5),
+        before_sleep=tenacity.before_sleep_log(logger, logging.WARNING),
+        reraise=True,
+    )
+    async def get_bytes(self, key: str) -> typing.Optional[bytes]:
+        try:
+            value = await self._bytes_client.get(key)
+            if value is not None:
+                logger.debug("cache_hit", key=key)
+            else:
+                logger.debug("cache_miss", key=key)
+            return value
+        except Exception as e:
+            logger.error("redis_get_error", key=key, error=str(e))
+            raise
+
+    @tenacity.retry(
+        retry=tenacity.retry_if_exception_type(
+            (redis.ConnectionError, redis.TimeoutError)
+        ),
+        stop=tenacity.stop_after_attempt(3),
+        wait=tenacity.wait_exponential(multiplier=1, min=1, max=5),
+        before_sleep=tenacity.before_sleep_log(logger, logging.WARNING),
+        reraise=True,
+    )
+    async def get_bytes_with_pttl(self, key: str) -> tuple[typing.Optional[bytes], int]:
+        try:
+            async with self._bytes_client.pipeline(transaction=False) as pipe:
+                pipe.get(key)
+                pipe.pttl(key)
+                value, pttl = await pipe.execute()
+            if value is not None:
+                logger.debug("cache_hit", key=key)
+            else:
+                logger.debug("cache_miss", key=key)
+            return value, pttl
+        except Exception as e:
+            logger.error("redis_get_error", key=key, error=str(e))
+            raise
+
+    async def get_many_bytes(self, *keys: str) -> list[typing.Optional[bytes]]:
+        try:
+            values = await self._bytes_client.mget(*keys)
+            logger.debug("cache_get_many", keys=keys, found=sum(1 for v in values if v))
+            return values
+        except Exception as e:
+            logger.error("redis_get_many_error", keys=keys, error=str(e))
+            raise
+
     @tenacity.retry(
         retry=tenacity.retry_if_exception_type(
             (redis.ConnectionError, redis.TimeoutError)
@@ -73,7 +234,7 @@ class RedisClient:
     async def set(
         self,
         key: str,
-        value: str,
+        value: str | bytes,
         ex: typing.Optional[int] = None,
         px: typing.Optional[int] = None,
         nx: bool = False,
@@ -156,16 +317,66 @@ class RedisClient:
             logger.error("redis_ttl_error", key=key, error=str(e))
             raise
 
+    @tenacity.retry(
+        retry=tenacity.retry_if_exception_type(
+            (redis.ConnectionError, redis.TimeoutError)
+        ),
+        stop=tenacity.stop_after_attempt(3),
+        wait=tenacity.wait_exponential(multiplier=1, min=1, max=5),
+        before_sleep=tenacity.before_sleep_log(logger, logging.WARNING),
+        reraise=True,
+    )
+    async def pttl(self, key: str) -> int:
+        try:
+            return await self._client.pttl(key)
+        except Exception as e:
+            logger.error("redis_pttl_error", key=key, error=str(e))
+            raise
+
+    async def json_pttl(self, key: str) -> int:
+        """Remaining lifetime in milliseconds of a value written by set_json."""
+        return await self.pttl(self._serialized_key(key))
+
+    @contextlib.contextmanager
+    def probe_pttl(self, key: str) -> typing.Iterator[PttlProbe]:
+        """
+        Makes a get_json(key) inside the block read the key's PTTL in the same
+        round trip as its value and record it on the probe. The probe stays
+        empty when get_json is answered by the near cache.
+        """
+        probe = PttlProbe(key)
+        token = _pttl_probe.set(probe)
+        try:
+            yield probe
+        finally:
+            _pttl_probe.reset(token)
+
     async def get_json(self, key: str) -> typing.Optional[typing.Any]:
-        value = await self.get(key)
+        if self._near_cache is not None:
+            hit, cached_value = self._near_cache.get(key)
+            if hit:
+                return cached_value
+            read_version = self._near_cache.begin_read()
+
+        if (probe := _pttl_probe.get()) is not None and probe.key == key:
+            value, probe.pttl = await self.get_bytes_with_pttl(
+                self._serialized_key(key)
+            )
+        else:
+            value = await self.get_bytes(self._serialized_key(key))
         if value is None:
             return None
         try:
-            return json.loads(value)
-        except json.JSONDecodeError as e:
+            decoded_value = self._decode(key, value)
+        except (TypeError, ValueError) as e:
             logger.error("json_decode_error", key=key, error=str(e))
             return None
 
+        if self._near_cache is not None:
+            self._near_cache.set(key, decoded_value, read_version)
+
+        return decoded_value
+
     async def set_json(
         self,
         key: str,
@@ -176,8 +387,26 @@ class RedisClient:
         xx: bool = False,
     ) -> bool:
         try:
-            json_value = json.dumps(value)
-            return await self.set(key, json_value, ex=ex, px=px, nx=nx, xx=xx)
+            serialized_value = self._encode(key, value)
+            if self._near_cache is not None:
+                self._near_cache.begin_write(key)
+
+            result = None
+            try:
+                result = await self.set(
+                    self._serialized_key(key),
+                    serialized_value,
+                    ex=ex,
+                    px=px,
+                    nx=nx,
+                    xx=xx,
+                )
+            finally:
+                if self._near_cache is not None:
+                    if not result:
+                        self._near_cache.cancel_write(key)
+                    self._near_cache.invalidate(key, include_l1=False)
+            return result
         except (TypeError, ValueError) as e:
             logger.error("json_encode_error", key=key, error=str(e))
             raise
@@ -219,19 +448,34 @@ class RedisClient:
                 raise
 
     async def get_many_json(self, *keys: str) -> list[typing.Optional[typing.Any]]:
-        values = await self.get_many(*keys)
-        results = []
-        for idx, value in enumerate(values):
+        results: list[typing.Optional[typing.Any]] = [None] * len(keys)
+        missing_indexes = list(range(len(keys)))
+
+        if self._near_cache is not None:
+            missing_indexes = []
+            for idx, key in enumerate(keys):
+                hit, cached_value = self._near_cache.get(key)
+                if hit:
+                    results[idx] = cached_value
+                else:
+                    missing_indexes.append(idx)
+            if not missing_indexes:
+                return results
+            read_version = self._near_cache.begin_read()
+
+        values = await self.get_many_bytes(
+            *(self._serialized_key(keys[idx]) for idx in missing_indexes)
+        )
+        for idx, value in zip(missing_indexes, values):
             if value is None:
-                results.append(None)
-            else:
-                try:
-                    results.append(json.loads(value))
-                except json.JSONDecodeError as e:
-                    logger.error(
-                        "json_decode_error_in_batch", key=keys[idx], error=str(e)
-                    )
-                    results.append(None)
+                continue
+            try:
+                results[idx] = self._decode(keys[idx], value)
+            except (TypeError, ValueError) as e:
+                logger.error("json_decode_error_in_batch", key=keys[idx], error=str(e))
+                continue
+            if self._near_cache is not None:
+                self._near_cache.set(keys[idx], results[idx], read_version)
         return results
 
     async def set_many_json(
@@ -241,12 +485,82 @@ class RedisClient:
         px: typing.Optional[int] = None,
     ) -> bool:
         try:
-            json_mapping = {k: json.dumps(v) for k, v in mapping.items()}
-            return await self.set_many(json_mapping, ex=ex, px=px)
+            serialized_mapping = {
+                self._serialized_key(k): self._encode(k, v) for k, v in mapping.items()
+            }
+            if self._near_cache is not None:
+                for key in mapping:
+                    self._near_cache.begin_write(key)
+
+            result = False
+            try:
+                result = await self.set_many(serialized_mapping, ex=ex, px=px)
+            finally:
+                if self._near_cache is not None:
+                    for key in mapping:
+                        if not result:
+                            self._near_cache.cancel_write(key)
+                        self._near_cache.invalidate(key, include_l1=False)
+            return result
         except (TypeError, ValueError) as e:
             logger.error("json_encode_error_in_batch", error=str(e))
             raise
 
+    @tenacity.retry(
+        retry=tenacity.retry_if_exception_type(
+            (redis.ConnectionError, redis.TimeoutError)
+        ),
+        stop=tenacity.stop_after_attempt(3),
+        wait=tenacity.wait_exponential(multiplier=1, min=1, max=5),
+        before_sleep=tenacity.before_sleep_log(logger, logging.WARNING),
+        reraise=True,
+    )
+    async def delete_many(self, *keys: str) -> int:
+        """
+        Deletes keys written by set_json/set_many_json, one pipeline per
+        PIPELINE_CHUNK_SIZE keys, and returns how many existed.
+        """
+        try:
+            count = 0
+            for chunk in _chunked(list(keys), PIPELINE_CHUNK_SIZE):
+                async with self._client.pipeline(transaction=False) as pipe:
+                    for key in chunk:
+                        pipe.delete(self._serialized_key(key))
+                    count += sum(await pipe.execute())
+
+            if self._near_cache is not None:
+                for key in keys:
+                    self._near_cache.invalidate(key, include_l1=False)
+
+            logger.debug("cache_delete_many", count=count)
+            return count
+        except Exception as e:
+            logger.error("redis_delete_many_error", error=str(e))
+            raise
+
+    @tenacity.retry(
+        retry=tenacity.retry_if_exception_type(
+            (redis.ConnectionError, redis.TimeoutError)
+        ),
+        stop=tenacity.stop_after_attempt(3),
+        wait=tenacity.wait_exponential(multiplier=1, min=1, max=5),
+        before_sleep=tenacity.before_sleep_log(logger, logging.WARNING),
+        reraise=True,
+    )
+    async def exists_many(self, *keys: str) -> list[bool]:
+        """Same as delete_many, reporting whether each key exists instead."""
+        try:
+            results: list[bool] = []
+            for chunk in _chunked(list(keys), PIPELINE_CHUNK_SIZE):
+                async with self._client.pipeline(transaction=False) as pipe:
+                    for key in chunk:
+                        pipe.exists(self._serialized_key(key))
+                    results.extend(bool(count) for count in await pipe.execute())
+            return results
+        except Exception as e:
+            logger.error("redis_exists_many_error", error=str(e))
+            raise
+
     async def increment(self, key: str, amount: int = 1) -> int:
         try:
             result = await self._client.incrby(key, amount)
@@ -272,21 +586,59 @@ class RedisClient:
             logger.error("redis_get_many_error", keys=keys, error=str(e))
             raise
 
+    @tenacity.retry(
+        retry=tenacity.retry_if_exception_type(
+            (redis.ConnectionError, redis.TimeoutError)
+        ),
+        stop=tenacity.stop_after_attempt(3),
+        wait=tenacity.wait_exponential(multiplier=1, min=1, max=5),
+        before_sleep=tenacity.before_sleep_log(logger, logging.WARNING),
+        reraise=True,
+    )
     async def set_many(
         self,
-        mapping: dict[str, str],
+        mapping: dict[str, str] | dict[str, bytes],
         ex: typing.Optional[int] = None,
         px: typing.Optional[int] = None,
     ) -> bool:
         try:
-            for key, value in mapping.items():
-                await self.set(key, value, ex=ex, px=px)
+            for chunk in _chunked(list(mapping.items()), PIPELINE_CHUNK_SIZE):
+                async with self._client.pipeline(transaction=False) as pipe:
+                    for key, value in chunk:
+                        pipe.set(key, value, ex=ex, px=px)
+                    await pipe.execute()
             logger.debug("cache_set_many", count=len(mapping), ttl=ex or px)
             return True
         except Exception as e:
             logger.error("redis_set_many_error", error=str(e))
             raise
 
+    async def run_script(
+        self,
+        script: str,
+        keys: list[str],
+        args: list[typing.Any],
+    ) -> typing.Any:
+        try:
+            if (registered := self._scripts.get(script)) is None:
+                registered = self._client.register_script(script)
+                self._scripts[script] = registered
+
+            return await registered(keys=keys, args=args)
+        except Exception as e:
+            logger.error("redis_script_error", keys=keys, error=str(e))
+            raise
+
+    def start_near_cache(self) -> None:
+        if self._near_cache is not None:
+            self._near_cache.start()
+
+    def get_near_cache_stats(self) -> typing.Optional[dict[str, typing.Any]]:
+        return self._near_cache.get_stats() if self._near_cache else None
+
+    def get_compression_stats(self) -> dict[str, dict[str, typing.Any]]:
+        return self._compression_stats.get_stats()
+
     async def flush_db(self) -> bool:
         try:
             result = await self._client.flushdb()
@@ -308,7 +660,10 @@ class RedisClient:
 
     async def close(self) -> None:
         try:
+            if self._near_cache is not None:
+                await self._near_cache.stop()
             await self._client.aclose()
+            await self._bytes_client.aclose()
             logger.info("redis_client_closed")
         except Exception as e:
             logger.error("redis_close_error", error=str(e))
@@ -323,6 +678,25 @@ def get_redis_client() -> RedisClient:
             port=int(os.getenv("REDIS_PORT", "6379")),
             db=int(os.getenv("REDIS_DB", "0")),
             password=os.getenv("REDIS_PASSWORD"),
+            serializer=serializers.get_serializer(
+                os.getenv("REDIS_SERIALIZER", "json")
+            ),
+            compressor=(
+                compression.Compressor(
+                    codec=codec,
+                    threshold=int(os.getenv("REDIS_COMPRESSION_THRESHOLD", "1024")),
+                    level=int(os.getenv("REDIS_COMPRESSION_LEVEL", "3")),
+                )
+                if (codec := os.getenv("REDIS_COMPRESSION", "none")) != "none"
+                else None
+            ),
+            near_cache_prefixes=(
+                os.getenv("REDIS_NEAR_CACHE_PREFIXES", NEAR_CACHE_PREFIXES).split(",")
+                if os.getenv("REDIS_NEAR_CACHE", "false").lower() == "true"
+                else None
+            ),
+            near_cache_size=int(os.getenv("REDIS_NEAR_CACHE_SIZE", "10000")),
+            near_cache_ttl=int(os.getenv("REDIS_NEAR_CACHE_TTL", "300")),
         )
 
     return _redis_client
@@ -1,19 +1,41 @@
 import asyncio
 import logging
 import os
+import re
+import time
 import typing
 
 import httpx
 import pybreaker
+import pydantic
 import structlog
 import tenacity
 
+from utils import connection_pool as connection_pool_module
+from utils import json_codec
+from utils import rate_limiter
+from utils import redis_client as redis_client_module
+from utils import riot_cassette
+
 logger = structlog.get_logger(__name__)
 
 _riot_api_client: typing.Optional["RiotAPIClient"] = None
 
 
 class RateLimitError(Exception):
+    def __init__(
+        self,
+        message: str,
+        retry_after: float = rate_limiter.DEFAULT_RETRY_AFTER,
+        limit_type: typing.Optional[str] = None,
+    ):
+        self.message = message
+        self.retry_after = retry_after
+        self.limit_type = limit_type
+        super().__init__(self.message)
+
+
+class RateLimitDeadlineError(RateLimitError):
     pass
 
 
@@ -30,36 +52,31 @@ class RiotAPIError(Exception):
         super().__init__(self.message)
 
 
-class AsyncRateLimiter:
-    def __init__(self, rate: int, period: float):
-        self.rate = rate
-        self.period = period
-        self.allowance = rate
-        self.last_check = asyncio.get_event_loop().time()
-        self._lock = asyncio.Lock()
-
-    async def acquire(self):
-        async with self._lock:
-            current = asyncio.get_event_loop().time()
-            time_passed = current - self.last_check
-            self.last_check = current
-            self.allowance += time_passed * (self.rate / self.period)
-
-            if self.allowance > self.rate:
-                self.allowance = self.rate
-
-            if self.allowance < 1.0:
-                sleep_time = (1.0 - self.allowance) * (self.period / self.rate)
-                logger.warning(
-                    "rate_limit_waiting",
-                    sleep_time=sleep_time,
-                    rate=self.rate,
-                    period=self.period,
-                )
-                await asyncio.sleep(sleep_time)
-                self.allowance = 0.0
-            else:
-                self.allowance -= 1.0
+ModelT = typing.TypeVar("ModelT", bound=pydantic.BaseModel)
+
+
+class _ServerErrorResponse(Exception):
+    """Raised inside the circuit breaker so 5xx responses count as failures."""
+
+    def __init__(self, response: httpx.Response):
+        super().__init__(f"Riot API server error {response.status_code}")
+        self.response = response
+
+
+class _CircuitBreakerStateListener(pybreaker.CircuitBreakerListener):
+    def __init__(self):
+        self.opened_at: dict[str, float] = {}
+
+    def state_change(self, cb, old_state, new_state) -> None:
+        if new_state.name == pybreaker.STATE_OPEN:
+            self.opened_at[cb.name] = time.monotonic()
+
+        logger.warning(
+            "circuit_breaker_state_changed",
+            breaker=cb.name,
+            old_state=old_state.name if old_state else None,
+            new_state=new_state.name,
+        )
 
 
 class RiotAPIClient:
@@ -81,26 +98,104 @@ class RiotAPIClient:
         "sea": "https://sea.api.riotgames.com",
     }
 
+    METHOD_PATTERNS = [
+        (
+            re.compile(r"^/riot/account/v1/accounts/by-puuid/[^/]+$"),
+            "account-v1.by-puuid",
+        ),
+        (
+            re.compile(r"^/riot/account/v1/accounts/by-riot-id/[^/]+/[^/]+$"),
+            "account-v1.by-riot-id",
+        ),
+        (
+            re.compile(r"^/lol/summoner/v4/summoners/by-puuid/[^/]+$"),
+            "summoner-v4.by-puuid",
+        ),
+        (
+            re.compile(r"^/lol/league/v4/entries/by-puuid/[^/]+$"),
+            "league-v4.entries-by-puuid",
+        ),
+        (
+            re.compile(r"^/lol/league/v4/challengerleagues/by-queue/[^/]+$"),
+            "league-v4.challenger-by-queue",
+        ),
+        (
+            re.compile(r"^/lol/champion-mastery/v4/champion-masteries/by-puuid/[^/]+$"),
+            "champion-mastery-v4.by-puuid",
+        ),
+        (
+            re.compile(r"^/lol/spectator/v5/active-games/by-summoner/[^/]+$"),
+            "spectator-v5.active-games",
+        ),
+        (
+            re.compile(r"^/lol/match/v5/matches/by-puuid/[^/]+/ids$"),
+            "match-v5.ids-by-puuid",
+        ),
+        (
+            re.compile(r"^/lol/match/v5/matches/[^/]+$"),
+            "match-v5.match",
+        ),
+    ]
+
     def __init__(
-        self, http_client: httpx.AsyncClient, api_key: typing.Optional[str] = None
+        self,
+        connection_pool: connection_pool_module.HostConnectionPool,
+        api_key: typing.Optional[str] = None,
+        redis_client: typing.Optional[redis_client_module.RedisClient] = None,
+        base_urls: typing.Optional[dict[str, str]] = None,
     ):
-        self._http_client = http_client
+        self._connection_pool = connection_pool
+        self._base_urls = {**self.BASE_URLS, **(base_urls or {})}
         self._api_key = api_key or os.getenv("RIOT_API_KEY", "")
 
         if not self._api_key:
             logger.error("riot_api_key_missing")
             raise ValueError("RIOT_API_KEY environment variable is not set")
 
-        self._rate_limiter_per_second = AsyncRateLimiter(rate=20, period=1.0)
-        self._rate_limiter_per_two_minutes = AsyncRateLimiter(rate=100, period=120.0)
-
-        self._circuit_breaker = pybreaker.CircuitBreaker(
-            fail_max=5,
-            reset_timeout=60,
-            name="riot_api_circuit_breaker",
+        self._rate_limiter = rate_limiter.RiotRateLimiter(
+            default_app_limits=os.getenv(
+                "RIOT_APP_RATE_LIMIT", rate_limiter.DEFAULT_APP_RATE_LIMITS
+            ),
+            interactive_reserve=float(
+                os.getenv(
+                    "RIOT_INTERACTIVE_RESERVE",
+                    str(rate_limiter.DEFAULT_INTERACTIVE_RESERVE),
+                )
+            ),
+            redis_client=redis_client,
+            fallback_share=float(
+                os.getenv(
+                    "RIOT_RATE_LIMIT_FALLBACK_SHARE",
+                    str(rate_limiter.DEFAULT_FALLBACK_SHARE),
+                )
+            ),
         )
 
-        logger.info("riot_api_client_initialized")
+        self._in_flight: dict[tuple, asyncio.Future] = {}
+        self._coalescing_stats = {"upstream": 0, "deduplicated": 0}
+
+        fail_max = int(os.getenv("RIOT_BREAKER_FAIL_MAX", "5"))
+        reset_timeout = float(os.getenv("RIOT_BREAKER_RESET_TIMEOUT", "60"))
+        half_open_probes = int(os.getenv("RIOT_BREAKER_HALF_OPEN_PROBES", "1"))
+
+        self._breaker_listener = _CircuitBreakerStateListener()
+        self._circuit_breakers = {
+            region: pybreaker.CircuitBreaker(
+                fail_max=fail_max,
+                reset_timeout=reset_timeout,
+                listeners=[self._breaker_listener],
+                name=f"riot_api_circuit_breaker:{region}",
+            )
+            for region in self._base_urls
+        }
+        self._probe_semaphores = {
+            region: asyncio.Semaphore(half_open_probes) for region in self._base_urls
+        }
+
+        logger.info(
+            "riot_api_client_initialized",
+            shared_rate_limits=redis_client is not None,
+        )
 
     def _get_headers(self) -> dict[str, str]:
         return {
@@ -108,9 +203,82 @@ class RiotAPIClient:
             "Accept": "application/json",
         }
 
-    async def _apply_rate_limiting(self):
-        await self._rate_limiter_per_second.acquire()
-        await self._rate_limiter_per_two_minutes.acquire()
+    def _get_method_key(self, endpoint: str) -> str:
+        for pattern, method_key in self.METHOD_PATTERNS:
+            if pattern.match(endpoint):
+                return method_key
+
+        # The raw path holds puuids and match ids, so keying by it would create
+        # a bucket (and a Redis key) per id; unknown methods share one instead.
+        logger.debug("riot_method_unknown", endpoint=endpoint)
+        return rate_limiter.UNKNOWN_METHOD_KEY
+
+    async def _apply_rate_limiting(
+        self,
+        region: str,
+        method_key: str,
+        lane: rate_limiter.RequestLane,
+        give_up_at: typing.Optional[float] = None,
+    ):
+        if give_up_at is None:
+            await self._rate_limiter.acquire(region, method_key, lane)
+            return
+
+        try:
+            await asyncio.wait_for(
+                self._rate_limiter.acquire(region, method_key, lane),
+                max(give_up_at - time.monotonic(), 0.0),
+            )
+        except asyncio.TimeoutError:
+            logger.warning(
+                "rate_limit_wait_deadline_exceeded", region=region, method=method_key
+            )
+            raise RateLimitDeadlineError(
+                "Rate limiter wait does not fit in the deadline"
+            ) from None
+
+    async def _send(self, method: str, url: str, **kwargs) -> httpx.Response:
+        response = await self._connection_pool.request(
+            method, url, headers=self._get_headers(), **kwargs
+        )
+
+        if response.status_code >= 500:
+            raise _ServerErrorResponse(response)
+
+        return response
+
+    async def _call_through_breaker(
+        self, region: str, method: str, url: str, **kwargs
+    ) -> httpx.Response:
+        circuit_breaker = self._circuit_breakers[region]
+
+        if circuit_breaker.current_state == pybreaker.STATE_CLOSED:
+            return await circuit_breaker.call_async(
+                self._send, method, url, **kwargs
+            )  # pyright: ignore[reportGeneralTypeIssues]
+
+        opened_at = self._breaker_listener.opened_at.get(circuit_breaker.name, 0.0)
+        if (
+            circuit_breaker.current_state == pybreaker.STATE_OPEN
+            and time.monotonic() - opened_at < circuit_breaker.reset_timeout
+        ):
+            raise pybreaker.CircuitBreakerError("Circuit breaker is open")
+
+        # After reset_timeout only a limited number of probe requests reach the
+        # host, everything else keeps failing fast until a probe succeeds.
+        probe_semaphore = self._probe_semaphores[region]
+        if probe_semaphore.locked():
+            raise pybreaker.CircuitBreakerError("Half-open probe already in flight")
+
+        async with probe_semaphore:
+            # pybreaker's own open -> half-open transition calls the guarded
+            # function synchronously, which never awaits a coroutine.
+            if circuit_breaker.current_state == pybreaker.STATE_OPEN:
+                circuit_breaker.half_open()
+
+            return await circuit_breaker.call_async(
+                self._send, method, url, **kwargs
+            )  # pyright: ignore[reportGeneralTypeIssues]
 
     @tenacity.retry(
         retry=tenacity.retry_if_exception_type(
@@ -125,24 +293,31 @@ class RiotAPIClient:
         self,
         method: str,
         url: str,
+        region: str,
+        method_key: str,
+        lane: rate_limiter.RequestLane,
+        give_up_at: typing.Optional[float] = None,
         **kwargs,
     ) -> httpx.Response:
         try:
-            await self._apply_rate_limiting()
-
-            response = await self._circuit_breaker.call_async(
-                self._http_client.request,
-                method,
-                url,
-                headers=self._get_headers(),
-                **kwargs,
-            )  # pyright: ignore[reportGeneralTypeIssues]
+            await self._apply_rate_limiting(region, method_key, lane, give_up_at)
+
+            try:
+                response = await self._call_through_breaker(
+                    region, method, url, **kwargs
+                )
+            except _ServerErrorResponse as e:
+                response = e.response
+
+            await self._rate_limiter.update_from_headers(
+                region, method_key, response.headers
+            )
 
             return response
 
         except pybreaker.CircuitBreakerError:
-            logger.error("circuit_breaker_open", url=url)
-            raise RiotAPIError("Circuit breaker is open", 503)
+            logger.error("circuit_breaker_open", url=url, region=region)
+            raise RiotAPIError(f"Circuit breaker is open for {region}", 503)
         except httpx.TimeoutException as e:
             logger.error("request_timeout", url=url, error=str(e))
             raise
@@ -151,11 +326,18 @@ class RiotAPIClient:
             raise
 
     async def _handle_response(
-        self, response: httpx.Response, url: str
-    ) -> dict[str, typing.Any]:
+        self,
+        response: httpx.Response,
+        url: str,
+        model: typing.Optional[type[pydantic.BaseModel]] = None,
+    ) -> typing.Any:
         if response.status_code == 200:
             try:
-                data = response.json()
+                data = (
+                    model.model_validate_json(response.content)
+                    if model is not None
+                    else json_codec.loads(response.content)
+                )
                 logger.debug("request_success", url=url, status=200)
                 return data
             except Exception as e:
@@ -169,9 +351,23 @@ class RiotAPIClient:
             raise RiotAPIError("Resource not found", 404)
 
         elif response.status_code == 429:
-            retry_after = response.headers.get("Retry-After", "60")
-            logger.warning("rate_limited_by_api", url=url, retry_after=retry_after)
-            raise RateLimitError(f"Rate limited. Retry after {retry_after} seconds")
+            try:
+                retry_after = float(response.headers["Retry-After"])
+            except (KeyError, ValueError):
+                retry_after = rate_limiter.DEFAULT_RETRY_AFTER
+
+            limit_type = response.headers.get("X-Rate-Limit-Type")
+            logger.warning(
+                "rate_limited_by_api",
+                url=url,
+                retry_after=retry_after,
+                limit_type=limit_type,
+            )
+            raise RateLimitError(
+                f"Rate limited. Retry after {retry_after} seconds",
+                retry_after=retry_after,
+                limit_type=limit_type,
+            )
 
         elif response.status_code == 403:
             logger.error("forbidden_invalid_api_key", url=url)
@@ -189,43 +385,184 @@ class RiotAPIClient:
             )
 
     async def get(
-        self, region: str, endpoint: str, **params
+        self,
+        region: str,
+        endpoint: str,
+        lane: rate_limiter.RequestLane = rate_limiter.RequestLane.INTERACTIVE,
+        deadline: typing.Optional[float] = None,
+        **params,
     ) -> typing.Optional[dict[str, typing.Any] | list[typing.Any]]:
-        if region not in self.BASE_URLS:
+        """
+        Without a deadline a 429 response returns None. With a deadline (in
+        seconds) the request is requeued after Retry-After for as long as the
+        deadline allows, and RateLimitDeadlineError is raised once it cannot be
+        met, whether by Retry-After or by the wait for a local rate limit slot.
+        """
+        return await self._coalesce(region, endpoint, lane, deadline, None, params)
+
+    async def get_model(
+        self,
+        model: type[ModelT],
+        region: str,
+        endpoint: str,
+        lane: rate_limiter.RequestLane = rate_limiter.RequestLane.INTERACTIVE,
+        deadline: typing.Optional[float] = None,
+        **params,
+    ) -> typing.Optional[ModelT]:
+        """
+        Same as get, but validates the raw response bytes straight into model,
+        skipping the intermediate dict. Worth it for large payloads like match-v5.
+        """
+        return await self._coalesce(region, endpoint, lane, deadline, model, params)
+
+    async def _coalesce(
+        self,
+        region: str,
+        endpoint: str,
+        lane: rate_limiter.RequestLane,
+        deadline: typing.Optional[float],
+        model: typing.Optional[type[pydantic.BaseModel]],
+        params: dict[str, typing.Any],
+    ) -> typing.Any:
+        # Lane and deadline decide how the shared request queues and what a 429
+        # returns, so only callers that agree on both can share one.
+        request_key = (
+            region,
+            endpoint,
+            model,
+            lane,
+            deadline,
+            tuple(sorted(params.items())),
+        )
+
+        if (in_flight := self._in_flight.get(request_key)) is not None:
+            self._coalescing_stats["deduplicated"] += 1
+            logger.debug("request_coalesced", region=region, endpoint=endpoint)
+            return await asyncio.shield(in_flight)
+
+        task = asyncio.ensure_future(
+            self._get(region, endpoint, lane, deadline, model, params)
+        )
+        self._in_flight[request_key] = task
+        self._coalescing_stats["upstream"] += 1
+
+        def _release(_: asyncio.Future) -> None:
+            if self._in_flight.get(request_key) is task:
+                del self._in_flight[request_key]
+
+        task.add_done_callback(_release)
+
+        return await asyncio.shield(task)
+
+    async def _get(
+        self,
+        region: str,
+        endpoint: str,
+        lane: rate_limiter.RequestLane,
+        deadline: typing.Optional[float],
+        model: typing.Optional[type[pydantic.BaseModel]],
+        params: dict[str, typing.Any],
+    ) -> typing.Any:
+        if region not in self._base_urls:
             logger.error("invalid_region", region=region)
             raise ValueError(f"Invalid region: {region}")
 
-        base_url = self.BASE_URLS[region]
+        base_url = self._base_urls[region]
         url = f"{base_url}{endpoint}"
+        method_key = self._get_method_key(endpoint)
+        give_up_at = time.monotonic() + deadline if deadline is not None else None
 
-        try:
-            response = await self._make_request("GET", url, params=params)
-            return await self._handle_response(response, url)
+        while True:
+            try:
+                response = await self._make_request(
+                    "GET",
+                    url,
+                    region=region,
+                    method_key=method_key,
+                    lane=lane,
+                    give_up_at=give_up_at,
+                    params=params,
+                )
+                return await self._handle_response(response, url, model)
 
-        except RateLimitError as e:
-            logger.warning("rate_limit_error", url=url, error=str(e))
-            return None
+            except RateLimitDeadlineError:
+                raise
 
-        except RiotAPIError as e:
-            if e.status_code == 404:
+            except RateLimitError as e:
+                await self._rate_limiter.pause(
+                    region, method_key, e.retry_after, limit_type=e.limit_type
+                )
+
+                if give_up_at is None:
+                    logger.warning("rate_limit_error", url=url, error=str(e))
+                    return None
+
+                if time.monotonic() + e.retry_after > give_up_at:
+                    logger.warning(
+                        "rate_limit_deadline_exceeded",
+                        url=url,
+                        retry_after=e.retry_after,
+                        deadline=deadline,
+                    )
+                    raise RateLimitDeadlineError(
+                        f"Rate limited and deadline of {deadline} seconds cannot be met",
+                        retry_after=e.retry_after,
+                        limit_type=e.limit_type,
+                    ) from e
+
+                logger.info("rate_limit_requeued", url=url, retry_after=e.retry_after)
+
+            except RiotAPIError as e:
+                if e.status_code == 404:
+                    return None
+                raise
+
+            except Exception as e:
+                logger.exception("unexpected_error", url=url, error=str(e))
                 return None
-            raise
 
-        except Exception as e:
-            logger.exception("unexpected_error", url=url, error=str(e))
-            return None
+    def get_coalescing_stats(self) -> dict[str, int]:
+        return {**self._coalescing_stats, "in_flight": len(self._in_flight)}
+
+    def get_connection_pool_stats(self) -> dict[str, dict[str, int]]:
+        return self._connection_pool.get_stats()
+
+    def get_circuit_breaker_states(self) -> dict[str, dict[str, typing.Any]]:
+        return {
+            region: {
+                "state": circuit_breaker.current_state,
+                "fail_counter": circuit_breaker.fail_counter,
+            }
+            for region, circuit_breaker in self._circuit_breakers.items()
+        }
+
+    def get_rate_limit_state(self) -> dict[str, list[tuple[int, float]]]:
+        return self._rate_limiter.get_state()
 
 
 def get_riot_api_client() -> RiotAPIClient:
     global _riot_api_client
     if _riot_api_client is None:
-        httpx_client = httpx.AsyncClient(timeout=10.0)
-        _riot_api_client = RiotAPIClient(httpx_client)
+        connection_pool = connection_pool_module.HostConnectionPool(
+            max_connections=int(os.getenv("RIOT_HTTP_MAX_CONNECTIONS", "20")),
+            max_keepalive_connections=int(
+                os.getenv("RIOT_HTTP_MAX_KEEPALIVE_CONNECTIONS", "10")
+            ),
+            keepalive_expiry=float(os.getenv("RIOT_HTTP_KEEPALIVE_EXPIRY", "30")),
+            http2=os.getenv("RIOT_HTTP2", "true").lower() == "true",
+            wrap_transport=riot_cassette.get_cassette_transport_factory(),
+        )
+        redis_client = (
+            redis_client_module.get_redis_client()
+            if os.getenv("RIOT_RATE_LIMIT_BACKEND", "redis") == "redis"
+            else None
+        )
+        _riot_api_client = RiotAPIClient(connection_pool, redis_client=redis_client)
     return _riot_api_client
 
 
 async def close_riot_api_client() -> None:
     global _riot_api_client
     if _riot_api_client is not None:
-        await _riot_api_client._http_client.aclose()
+        await _riot_api_client._connection_pool.aclose()
         _riot_api_client = None
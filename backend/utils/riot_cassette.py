@@ -0,0 +1,222 @@
+import asyncio
+import enum
+import hashlib
+import json
+import os
+import random
+import typing
+
+import httpx
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+RECORDED_HEADERS = (
+    "Content-Type",
+    "Retry-After",
+    "X-App-Rate-Limit",
+    "X-App-Rate-Limit-Count",
+    "X-Method-Rate-Limit",
+    "X-Method-Rate-Limit-Count",
+    "X-Rate-Limit-Type",
+)
+
+RATE_LIMIT_HEADERS = (
+    "X-App-Rate-Limit",
+    "X-App-Rate-Limit-Count",
+    "X-Method-Rate-Limit",
+    "X-Method-Rate-Limit-Count",
+)
+
+
+class CassetteMode(str, enum.Enum):
+    OFF = "off"
+    RECORD = "record"
+    REPLAY = "replay"
+
+
+class CassetteTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport that records Riot API responses to disk, or replays them
+    without touching the network. One JSON file is written per request, named
+    after a hash of its host, path and sorted query parameters.
+
+    Replay can add latency (plus jitter) and answer a share of requests with
+    429 to exercise the rate limit handling under load. Requests that were
+    never recorded are answered with 404.
+    """
+
+    def __init__(
+        self,
+        mode: CassetteMode,
+        directory: str,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_limit_probability: float = 0.0,
+        retry_after: float = 1.0,
+        replay_rate_limit_headers: bool = True,
+        transport: typing.Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        if mode == CassetteMode.OFF:
+            raise ValueError("CassetteTransport requires record or replay mode")
+
+        self._mode = mode
+        self._directory = directory
+        self._latency = latency
+        self._jitter = jitter
+        self._rate_limit_probability = rate_limit_probability
+        self._retry_after = retry_after
+        self._replay_rate_limit_headers = replay_rate_limit_headers
+        self._transport = transport or httpx.AsyncHTTPTransport(http2=True)
+
+        self._cassettes: dict[str, typing.Optional[dict[str, typing.Any]]] = {}
+        self._stats = {"recorded": 0, "replayed": 0, "missing": 0, "injected_429": 0}
+
+        os.makedirs(directory, exist_ok=True)
+
+        logger.info(
+            "riot_cassette_initialized",
+            mode=mode.value,
+            directory=directory,
+            latency=latency,
+            rate_limit_probability=rate_limit_probability,
+        )
+
+    def _get_path(self, request: httpx.Request) -> str:
+        query = sorted(request.url.params.multi_items())
+        key = f"{request.method} {request.url.host}{request.url.path}?{query}"
+        digest = hashlib.sha1(key.encode()).hexdigest()
+
+        return os.path.join(self._directory, request.url.host, f"{digest}.json")
+
+    def _load(self, path: str) -> typing.Optional[dict[str, typing.Any]]:
+        if path not in self._cassettes:
+            try:
+                with open(path, encoding="utf-8") as file:
+                    self._cassettes[path] = json.load(file)
+            except FileNotFoundError:
+                self._cassettes[path] = None
+
+        return self._cassettes[path]
+
+    def _save(self, path: str, cassette: dict[str, typing.Any]) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(cassette, file)
+
+        self._cassettes[path] = cassette
+
+    async def _record(self, request: httpx.Request) -> httpx.Response:
+        response = await self._transport.handle_async_request(request)
+        body = await response.aread()
+        await response.aclose()
+
+        headers = {
+            name: response.headers[name]
+            for name in RECORDED_HEADERS
+            if name in response.headers
+        }
+
+        # Rate limited responses are not recorded, so replay never gets stuck
+        # on a 429 captured by accident.
+        if response.status_code != 429:
+            self._save(
+                self._get_path(request),
+                {
+                    "url": str(request.url),
+                    "status_code": response.status_code,
+                    "headers": headers,
+                    "body": body.decode("utf-8"),
+                },
+            )
+            self._stats["recorded"] += 1
+
+        return httpx.Response(
+            response.status_code, headers=headers, content=body, request=request
+        )
+
+    async def _replay(self, request: httpx.Request) -> httpx.Response:
+        delay = self._latency + random.uniform(0, self._jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if random.random() < self._rate_limit_probability:
+            self._stats["injected_429"] += 1
+
+            return httpx.Response(
+                429,
+                headers={
+                    "Retry-After": f"{self._retry_after:g}",
+                    "X-Rate-Limit-Type": "method",
+                },
+                request=request,
+            )
+
+        cassette = self._load(self._get_path(request))
+
+        if cassette is None:
+            self._stats["missing"] += 1
+            logger.warning("riot_cassette_missing", url=str(request.url))
+
+            return httpx.Response(
+                404,
+                json={"status": {"message": "Not recorded", "status_code": 404}},
+                request=request,
+            )
+
+        headers = {
+            name: value
+            for name, value in cassette["headers"].items()
+            if self._replay_rate_limit_headers or name not in RATE_LIMIT_HEADERS
+        }
+        self._stats["replayed"] += 1
+
+        return httpx.Response(
+            cassette["status_code"],
+            headers=headers,
+            content=cassette["body"].encode("utf-8"),
+            request=request,
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self._mode == CassetteMode.RECORD:
+            return await self._record(request)
+
+        return await self._replay(request)
+
+    def get_stats(self) -> dict[str, int]:
+        return dict(self._stats)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def get_cassette_transport_factory() -> (
+    typing.Optional[typing.Callable[[httpx.AsyncBaseTransport], CassetteTransport]]
+):
+    """
+    Returns a function that layers a CassetteTransport over a host's
+    connection pool, or None when RIOT_API_CASSETTE_MODE is off.
+    """
+    mode = CassetteMode(os.getenv("RIOT_API_CASSETTE_MODE", CassetteMode.OFF.value))
+
+    if mode == CassetteMode.OFF:
+        return None
+
+    def wrap(transport: httpx.AsyncBaseTransport) -> CassetteTransport:
+        return CassetteTransport(
+            mode,
+            directory=os.getenv("RIOT_API_CASSETTE_DIR", "cassettes"),
+            latency=float(os.getenv("RIOT_API_CASSETTE_LATENCY", "0")),
+            jitter=float(os.getenv("RIOT_API_CASSETTE_JITTER", "0")),
+            rate_limit_probability=float(os.getenv("RIOT_API_CASSETTE_429_RATE", "0")),
+            retry_after=float(os.getenv("RIOT_API_CASSETTE_RETRY_AFTER", "1")),
+            replay_rate_limit_headers=os.getenv(
+                "RIOT_API_CASSETTE_RATE_LIMIT_HEADERS", "true"
+            ).lower()
+            == "true",
+            transport=transport,
+        )
+
+    return wrap
@@ -0,0 +1,91 @@
+import abc
+import json
+import typing
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is listed in requirements.txt
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack is listed in requirements.txt
+    msgpack = None
+
+
+class Serializer(abc.ABC):
+    """
+    Encodes values stored through the RedisClient JSON helpers.
+
+    Every format other than the legacy JSON one writes under its own
+    `<name>:<version>` key namespace, so pods running different encodings can
+    share one Redis during a rollout without reading each other's values.
+    Bump the version whenever the stored bytes change shape.
+    """
+
+    name: str = ""
+    version: int = 0
+
+    @property
+    def namespace(self) -> str:
+        return f"{self.name}:{self.version}" if self.name else ""
+
+    @abc.abstractmethod
+    def dumps(self, value: typing.Any) -> bytes: ...
+
+    @abc.abstractmethod
+    def loads(self, data: bytes) -> typing.Any: ...
+
+
+class JsonSerializer(Serializer):
+    """Stdlib JSON under unprefixed keys, the format used before serializers existed."""
+
+    def dumps(self, value: typing.Any) -> bytes:
+        return json.dumps(value).encode("utf-8")
+
+    def loads(self, data: bytes) -> typing.Any:
+        return json.loads(data)
+
+
+class OrjsonSerializer(Serializer):
+    name = "orjson"
+    version = 1
+
+    def __init__(self):
+        if orjson is None:
+            raise RuntimeError("orjson is not installed")
+
+    def dumps(self, value: typing.Any) -> bytes:
+        return orjson.dumps(value)
+
+    def loads(self, data: bytes) -> typing.Any:
+        return orjson.loads(data)
+
+
+class MsgpackSerializer(Serializer):
+    name = "msgpack"
+    version = 1
+
+    def __init__(self):
+        if msgpack is None:
+            raise RuntimeError("msgpack is not installed")
+
+    def dumps(self, value: typing.Any) -> bytes:
+        return msgpack.packb(value)
+
+    def loads(self, data: bytes) -> typing.Any:
+        return msgpack.unpackb(data)
+
+
+SERIALIZERS: dict[str, type[Serializer]] = {
+    "json": JsonSerializer,
+    "orjson": OrjsonSerializer,
+    "msgpack": MsgpackSerializer,
+}
+
+
+def get_serializer(name: str) -> Serializer:
+    if name not in SERIALIZERS:
+        raise ValueError(f"Unknown serializer: {name}")
+
+    return SERIALIZERS[name]()
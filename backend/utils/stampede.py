@@ -0,0 +1,312 @@
+import asyncio
+import math
+import os
+import random
+import time
+import typing
+import uuid
+
+import cachetools
+import redis.asyncio as redis
+import structlog
+
+from utils import deadline
+from utils import redis_client as redis_client_module
+
+logger = structlog.get_logger(__name__)
+
+_stampede_guard: typing.Optional["StampedeGuard"] = None
+
+T = typing.TypeVar("T")
+
+LOCK_KEY_PREFIX = "rebuild_lock"
+
+# Deletes the lock only if it still holds our token, so a rebuild that outlived
+# its lock never releases the lock another worker has acquired since.
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Rebuild time assumed for XFetch until this process has rebuilt the key once.
+DEFAULT_REBUILD_SECONDS = 0.1
+
+POLL_INTERVAL_SECONDS = 0.05
+MAX_POLL_INTERVAL_SECONDS = 0.4
+
+
+class StampedeGuard:
+    """
+    Keeps concurrent cache misses for the same key from all falling through to
+    Firestore and Riot.
+
+    - Requests for a key within one worker share a single lookup.
+    - Across workers a Redis lock (SET NX PX) lets one of them rebuild while
+      the others poll Redis for the value it writes. A waiter that runs out of
+      time rebuilds without the lock rather than failing the request.
+    - Before a value expires it is refreshed early with a probability that
+      grows as the expiry approaches (XFetch, Vattani et al.), scaled by how
+      long the rebuild took last time, so hot keys are usually rebuilt while
+      the old value is still being served.
+    - Keys with a soft TTL are served stale once it has passed, while a
+      single background rebuild refreshes them (stale-while-revalidate).
+    - When Redis itself fails, reads count as misses and rebuilds run
+      without the lock, so an outage costs extra rebuilds, not errors.
+    """
+
+    def __init__(
+        self,
+        redis_client: redis_client_module.RedisClient,
+        lock_ttl_ms: int = 10000,
+        wait_timeout: float = 5.0,
+        beta: float = 1.0,
+    ):
+        self._redis = redis_client
+        self._lock_ttl_ms = lock_ttl_ms
+        self._wait_timeout = wait_timeout
+        self._beta = beta
+
+        self._in_flight: dict[str, asyncio.Future] = {}
+        self._rebuild_seconds = cachetools.TTLCache(maxsize=10000, ttl=86400)
+        self._stats = {
+            "rebuilds": 0,
+            "early_refreshes": 0,
+            "lock_waits": 0,
+            "wait_timeouts": 0,
+            "coalesced": 0,
+            "stale_hits": 0,
+            "background_refreshes": 0,
+        }
+        self._refreshing: dict[str, asyncio.Future] = {}
+
+    async def fetch(
+        self,
+        key: str,
+        load: typing.Callable[[], typing.Awaitable[T]],
+        rebuild: typing.Callable[[], typing.Awaitable[T]],
+        soft_ttl: typing.Optional[int] = None,
+        ttl: typing.Optional[int] = None,
+    ) -> T:
+        """
+        Returns the value cached under `key`, rebuilding it when missing.
+
+        `load` reads the Redis tier and returns a falsy value on a miss.
+        `rebuild` reads the lower tiers, writes the result back to Redis under
+        the same `key` and returns it.
+
+        With `soft_ttl` and `ttl` (the expiry `rebuild` writes with), a value
+        older than `soft_ttl` seconds is returned as is and refreshed in the
+        background instead of early.
+        """
+        value, pttl = await self._load(key, load)
+
+        if value:
+            if soft_ttl is not None and ttl is not None:
+                # The age follows from the remaining lifetime, so values keep
+                # their format and need no timestamp of their own.
+                if 0 <= pttl <= (ttl - soft_ttl) * 1000:
+                    self._stats["stale_hits"] += 1
+                    self.revalidate(key, rebuild)
+
+                return value
+
+            if self._should_refresh_early(key, pttl):
+                return await self._refresh_early(key, value, rebuild)
+
+            return value
+
+        if (in_flight := self._in_flight.get(key)) is not None:
+            self._stats["coalesced"] += 1
+            return await asyncio.shield(in_flight)
+
+        task = asyncio.ensure_future(self._rebuild_locked(key, load, rebuild))
+        self._in_flight[key] = task
+
+        def _release(_: asyncio.Future) -> None:
+            if self._in_flight.get(key) is task:
+                del self._in_flight[key]
+
+        task.add_done_callback(_release)
+
+        return await asyncio.shield(task)
+
+    async def _load(
+        self, key: str, load: typing.Callable[[], typing.Awaitable[T]]
+    ) -> tuple[typing.Optional[T], int]:
+        """Runs `load`, reading the key's PTTL in the same Redis round trip."""
+        try:
+            with self._redis.probe_pttl(key) as probe:
+                value = await load()
+
+            if value and probe.pttl is None:
+                # Answered by the near cache, without a Redis read.
+                probe.pttl = await self._redis.json_pttl(key)
+
+        except redis.RedisError as e:
+            logger.warning("stampede_redis_read_error", key=key, error=str(e))
+            return None, -2
+
+        return value, probe.pttl if probe.pttl is not None else -2
+
+    def _should_refresh_early(self, key: str, pttl: int) -> bool:
+        # -2: the key is gone, -1: it never expires.
+        if pttl < 0:
+            return False
+
+        delta = self._rebuild_seconds.get(key, DEFAULT_REBUILD_SECONDS)
+
+        return -delta * self._beta * math.log(1.0 - random.random()) >= pttl / 1000
+
+    async def _refresh_early(
+        self,
+        key: str,
+        value: T,
+        rebuild: typing.Callable[[], typing.Awaitable[T]],
+    ) -> T:
+        try:
+            token = await self._acquire(key)
+        except redis.RedisError as e:
+            logger.warning("stampede_lock_error", key=key, error=str(e))
+            return value
+
+        if token is None:
+            # Another worker is already refreshing; the current value is fine.
+            return value
+
+        self._stats["early_refreshes"] += 1
+        logger.debug("stampede_early_refresh", key=key)
+
+        try:
+            return await self._timed_rebuild(key, rebuild) or value
+        finally:
+            await self._release(key, token)
+
+    def revalidate(
+        self,
+        key: str,
+        rebuild: typing.Callable[[], typing.Awaitable[typing.Any]],
+    ) -> None:
+        """Schedules a background rebuild of `key` unless one is already running."""
+        if key in self._refreshing:
+            return
+
+        # The request that noticed the stale value may be nearly out of budget.
+        task = deadline.detach(self._revalidate(key, rebuild))
+        self._refreshing[key] = task
+
+        def _release(_: asyncio.Future) -> None:
+            if self._refreshing.get(key) is task:
+                del self._refreshing[key]
+
+        task.add_done_callback(_release)
+
+    async def _revalidate(
+        self,
+        key: str,
+        rebuild: typing.Callable[[], typing.Awaitable[typing.Any]],
+    ) -> None:
+        try:
+            if (token := await self._acquire(key)) is None:
+                return
+
+            try:
+                self._stats["background_refreshes"] += 1
+                await self._timed_rebuild(key, rebuild)
+            finally:
+                await self._release(key, token)
+
+        except Exception as e:
+            # The stale value keeps being served until its hard TTL.
+            logger.warning("stampede_revalidate_error", key=key, error=str(e))
+
+    async def _rebuild_locked(
+        self,
+        key: str,
+        load: typing.Callable[[], typing.Awaitable[T]],
+        rebuild: typing.Callable[[], typing.Awaitable[T]],
+    ) -> T:
+        wait_until = time.monotonic() + self._wait_timeout
+        interval = POLL_INTERVAL_SECONDS
+
+        while True:
+            try:
+                token = await self._acquire(key)
+            except redis.RedisError as e:
+                logger.warning("stampede_lock_error", key=key, error=str(e))
+                return await self._timed_rebuild(key, rebuild)
+
+            if token is not None:
+                try:
+                    # The previous holder may have finished between our miss
+                    # and acquiring the lock.
+                    if value := (await self._load(key, load))[0]:
+                        return value
+
+                    return await self._timed_rebuild(key, rebuild)
+                finally:
+                    await self._release(key, token)
+
+            if time.monotonic() >= wait_until:
+                self._stats["wait_timeouts"] += 1
+                logger.warning("stampede_lock_wait_timeout", key=key)
+                return await self._timed_rebuild(key, rebuild)
+
+            self._stats["lock_waits"] += 1
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, MAX_POLL_INTERVAL_SECONDS)
+
+            if value := (await self._load(key, load))[0]:
+                return value
+
+    async def _timed_rebuild(
+        self,
+        key: str,
+        rebuild: typing.Callable[[], typing.Awaitable[T]],
+    ) -> T:
+        start = time.perf_counter()
+        value = await rebuild()
+
+        self._rebuild_seconds[key] = time.perf_counter() - start
+        self._stats["rebuilds"] += 1
+
+        return value
+
+    async def _acquire(self, key: str) -> typing.Optional[str]:
+        token = uuid.uuid4().hex
+        acquired = await self._redis.set(
+            f"{LOCK_KEY_PREFIX}:{key}", token, px=self._lock_ttl_ms, nx=True
+        )
+
+        return token if acquired else None
+
+    async def _release(self, key: str, token: str) -> None:
+        try:
+            await self._redis.run_script(
+                RELEASE_LOCK_SCRIPT, keys=[f"{LOCK_KEY_PREFIX}:{key}"], args=[token]
+            )
+        except Exception as e:
+            # The lock expires on its own after lock_ttl_ms.
+            logger.warning("stampede_lock_release_error", key=key, error=str(e))
+
+    def get_stats(self) -> dict[str, typing.Any]:
+        return {
+            **self._stats,
+            "in_flight": len(self._in_flight),
+            "refreshing": len(self._refreshing),
+        }
+
+
+def get_stampede_guard() -> StampedeGuard:
+    global _stampede_guard
+
+    if _stampede_guard is None:
+        _stampede_guard = StampedeGuard(
+            redis_client=redis_client_module.get_redis_client(),
+            lock_ttl_ms=int(os.getenv("STAMPEDE_LOCK_TTL_MS", "10000")),
+            wait_timeout=float(os.getenv("STAMPEDE_WAIT_TIMEOUT", "5")),
+            beta=float(os.getenv("STAMPEDE_XFETCH_BETA", "1.0")),
+        )
+
+    return _stampede_guard
@@ -1,7 +1,379 @@
+import asyncio
 import os
+import re
+import time
+import typing
+import uuid
+
+import httpx
+import redis.asyncio as redis
+
+# Copied from backend/utils/rate_limiter.py and RiotAPIClient.METHOD_PATTERNS:
+# both processes share the same Redis windows for a single API key, and
+# backend/tests/test_scheduler_rate_limits.py fails once the copies drift apart.
+REDIS_KEY_PREFIX = "riot_rate_limit"
+DEFAULT_RETRY_AFTER = 1.0
+REDIS_FALLBACK_COOLDOWN = 5.0
+UNKNOWN_METHOD_KEY = "unknown"
+
+ACQUIRE_SCRIPT = """
+local pause = redis.call('PTTL', KEYS[2])
+if pause > 0 then
+    return pause
+end
+
+local rate = tonumber(ARGV[1])
+local period_ms = tonumber(ARGV[2])
+local reserved = tonumber(ARGV[3])
+
+local now = redis.call('TIME')
+local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now_ms - period_ms)
+
+if redis.call('ZCARD', KEYS[1]) + reserved < rate then
+    redis.call('ZADD', KEYS[1], now_ms, ARGV[4])
+    redis.call('PEXPIRE', KEYS[1], period_ms)
+    return 0
+end
+
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+local wait = tonumber(oldest[2]) + period_ms - now_ms
+if wait < 1 then
+    wait = 1
+end
+return wait
+"""
+
+SYNC_SCRIPT = """
+local count = tonumber(ARGV[1])
+local period_ms = tonumber(ARGV[2])
+
+local now = redis.call('TIME')
+local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now_ms - period_ms)
+
+local missing = count - redis.call('ZCARD', KEYS[1])
+for i = 1, missing do
+    redis.call('ZADD', KEYS[1], now_ms, ARGV[3] .. ':' .. i)
+end
+
+if missing > 0 then
+    redis.call('PEXPIRE', KEYS[1], period_ms)
+end
+return missing
+"""
+
+METHOD_PATTERNS = [
+    (
+        re.compile(r"^/riot/account/v1/accounts/by-puuid/[^/]+$"),
+        "account-v1.by-puuid",
+    ),
+    (
+        re.compile(r"^/riot/account/v1/accounts/by-riot-id/[^/]+/[^/]+$"),
+        "account-v1.by-riot-id",
+    ),
+    (
+        re.compile(r"^/lol/summoner/v4/summoners/by-puuid/[^/]+$"),
+        "summoner-v4.by-puuid",
+    ),
+    (
+        re.compile(r"^/lol/league/v4/entries/by-puuid/[^/]+$"),
+        "league-v4.entries-by-puuid",
+    ),
+    (
+        re.compile(r"^/lol/league/v4/challengerleagues/by-queue/[^/]+$"),
+        "league-v4.challenger-by-queue",
+    ),
+    (
+        re.compile(r"^/lol/champion-mastery/v4/champion-masteries/by-puuid/[^/]+$"),
+        "champion-mastery-v4.by-puuid",
+    ),
+    (
+        re.compile(r"^/lol/spectator/v5/active-games/by-summoner/[^/]+$"),
+        "spectator-v5.active-games",
+    ),
+    (
+        re.compile(r"^/lol/match/v5/matches/by-puuid/[^/]+/ids$"),
+        "match-v5.ids-by-puuid",
+    ),
+    (
+        re.compile(r"^/lol/match/v5/matches/[^/]+$"),
+        "match-v5.match",
+    ),
+]
+
+# Background jobs always run in the bulk lane and leave this share of every
+# window to the user-facing API.
+BULK_RESERVE = float(os.getenv("RIOT_INTERACTIVE_RESERVE", "0.2"))
+# Share of every window this process may use on its own while Redis is down.
+# The API workers fall back at the same time, so this stays well below 1.
+DEFAULT_FALLBACK_SHARE = 0.2
+FALLBACK_SHARE = float(
+    os.getenv("RIOT_RATE_LIMIT_FALLBACK_SHARE", str(DEFAULT_FALLBACK_SHARE))
+)
+if FALLBACK_SHARE >= 1.0:
+    print(
+        f"RIOT_RATE_LIMIT_FALLBACK_SHARE={FALLBACK_SHARE}: every process may spend "
+        "the full quota while Redis is down"
+    )
+
+
+class _LocalLimiter:
+    """Per-process token bucket used while the shared Redis windows are unreachable."""
+
+    def __init__(self, rate: int, period: float):
+        self.rate = rate
+        self.period = period
+        self.allowance = float(rate)
+        self.last_check = time.monotonic()
+
+    def _refill(self) -> None:
+        current = time.monotonic()
+        self.allowance = min(
+            self.allowance + (current - self.last_check) * (self.rate / self.period),
+            float(self.rate),
+        )
+        self.last_check = current
+
+    def resize(self, rate: int) -> None:
+        """Change the rate without forgetting the requests already spent."""
+        self._refill()
+        used = self.rate - self.allowance
+        self.rate = rate
+        self.allowance = min(max(rate - used, 0.0), float(rate))
+
+    def sync_count(self, count: int) -> None:
+        self._refill()
+        self.allowance = min(self.allowance, max(float(self.rate - count), 0.0))
+
+    async def acquire(self, reserved: float) -> None:
+        threshold = min(1.0 + reserved, float(self.rate))
+
+        while True:
+            self._refill()
+
+            if self.allowance >= threshold:
+                self.allowance -= 1.0
+                return
+
+            await asyncio.sleep(
+                (threshold - self.allowance) * (self.period / self.rate)
+            )
+
+
+_redis_client: typing.Optional[redis.Redis] = None
+_app_limits: typing.Dict[str, typing.List[typing.Tuple[int, float]]] = {}
+_method_limits: typing.Dict[str, typing.List[typing.Tuple[int, float]]] = {}
+_local_limiters: typing.Dict[typing.Tuple[str, float], _LocalLimiter] = {}
+_local_pauses: typing.Dict[str, float] = {}
+_fallback_until = 0.0
 
 
 def get_headers() -> dict[str, str]:
     return {
         "X-Riot-Token": os.getenv("RIOT_API_KEY", ""),
     }
+
+
+def _parse_limits(
+    header: typing.Optional[str],
+) -> typing.List[typing.Tuple[int, float]]:
+    if not header:
+        return []
+
+    try:
+        return [
+            (int(value), float(period))
+            for value, period in (part.split(":") for part in header.split(","))
+        ]
+    except ValueError:
+        return []
+
+
+def _parse_retry_after(header: typing.Optional[str]) -> float:
+    try:
+        return float(header) if header is not None else DEFAULT_RETRY_AFTER
+    except ValueError:
+        return DEFAULT_RETRY_AFTER
+
+
+def _get_redis_client() -> redis.Redis:
+    global _redis_client
+
+    if _redis_client is None:
+        _redis_client = redis.Redis(
+            host=os.getenv("REDIS_HOST", "localhost"),
+            port=int(os.getenv("REDIS_PORT", "6379")),
+            db=int(os.getenv("REDIS_DB", "0")),
+            password=os.getenv("REDIS_PASSWORD"),
+            socket_connect_timeout=5,
+            socket_timeout=5,
+        )
+
+    return _redis_client
+
+
+def _use_fallback() -> bool:
+    return time.monotonic() < _fallback_until
+
+
+def _start_fallback(error: Exception) -> None:
+    global _fallback_until
+
+    print(
+        "Shared rate limiter unavailable, limiting locally for "
+        f"{REDIS_FALLBACK_COOLDOWN:g}s: {error}"
+    )
+    _fallback_until = time.monotonic() + REDIS_FALLBACK_COOLDOWN
+
+
+def _get_local_limiter(bucket: str, rate: int, period: float) -> _LocalLimiter:
+    rate = max(1, int(rate * FALLBACK_SHARE))
+
+    if (limiter := _local_limiters.get((bucket, period))) is None:
+        limiter = _local_limiters[(bucket, period)] = _LocalLimiter(rate, period)
+    elif limiter.rate != rate:
+        limiter.resize(rate)
+
+    return limiter
+
+
+def _get_bucket_names(url: httpx.URL) -> typing.Tuple[str, str]:
+    region = url.host.split(".")[0].lower()
+    method = next(
+        (name for pattern, name in METHOD_PATTERNS if pattern.match(url.path)),
+        UNKNOWN_METHOD_KEY,
+    )
+
+    return f"{region}:app", f"{region}:{method}"
+
+
+async def _acquire_shared(
+    bucket: str, limits: typing.List[typing.Tuple[int, float]]
+) -> None:
+    script = _get_redis_client().register_script(ACQUIRE_SCRIPT)
+
+    for rate, period in limits:
+        while True:
+            wait_ms = await script(
+                keys=[
+                    f"{REDIS_KEY_PREFIX}:{bucket}:{period:g}",
+                    f"{REDIS_KEY_PREFIX}:{bucket}:paused",
+                ],
+                args=[
+                    rate,
+                    int(period * 1000),
+                    min(rate * BULK_RESERVE, rate - 1.0),
+                    uuid.uuid4().hex,
+                ],
+            )
+
+            if not wait_ms:
+                break
+
+            await asyncio.sleep(wait_ms / 1000)
+
+
+async def _acquire(bucket: str, limits: typing.List[typing.Tuple[int, float]]):
+    if not _use_fallback():
+        try:
+            await _acquire_shared(bucket, limits)
+            return
+        except redis.RedisError as e:
+            _start_fallback(e)
+
+    while (pause := _local_pauses.get(bucket, 0.0) - time.monotonic()) > 0:
+        await asyncio.sleep(pause)
+
+    for rate, period in limits:
+        limiter = _get_local_limiter(bucket, rate, period)
+        await limiter.acquire(min(limiter.rate * BULK_RESERVE, limiter.rate - 1.0))
+
+
+async def _sync_counts(
+    bucket: str,
+    limits: typing.List[typing.Tuple[int, float]],
+    counts: typing.List[typing.Tuple[int, float]],
+) -> None:
+    """Tops the windows up to the counts Riot reported in X-*-Rate-Limit-Count."""
+    rates = {period: rate for rate, period in limits}
+
+    for count, period in counts:
+        if (rate := rates.get(period)) is None:
+            continue
+
+        _get_local_limiter(bucket, rate, period).sync_count(int(count * FALLBACK_SHARE))
+
+        if _use_fallback():
+            continue
+
+        try:
+            await _get_redis_client().eval(
+                SYNC_SCRIPT,
+                1,
+                f"{REDIS_KEY_PREFIX}:{bucket}:{period:g}",
+                min(count, rate),
+                int(period * 1000),
+                uuid.uuid4().hex,
+            )
+        except redis.RedisError as e:
+            _start_fallback(e)
+
+
+async def _pause(bucket: str, seconds: float) -> None:
+    _local_pauses[bucket] = max(
+        _local_pauses.get(bucket, 0.0), time.monotonic() + seconds
+    )
+
+    if _use_fallback():
+        return
+
+    try:
+        await _get_redis_client().set(
+            f"{REDIS_KEY_PREFIX}:{bucket}:paused",
+            "1",
+            px=max(1, int(seconds * 1000)),
+        )
+    except redis.RedisError as e:
+        _start_fallback(e)
+
+
+async def get(client: httpx.AsyncClient, request_url: str) -> httpx.Response:
+    """GET a Riot API url after drawing from the rate limit budget shared with the API."""
+    app_bucket, method_bucket = _get_bucket_names(httpx.URL(request_url))
+    app_limits = _app_limits.get(app_bucket) or _parse_limits(
+        os.getenv("RIOT_APP_RATE_LIMIT", "20:1,100:120")
+    )
+
+    await _acquire(app_bucket, app_limits)
+    await _acquire(method_bucket, _method_limits.get(method_bucket, []))
+
+    response = await client.get(request_url, headers=get_headers())
+
+    if app_limits := _parse_limits(response.headers.get("X-App-Rate-Limit")):
+        _app_limits[app_bucket] = app_limits
+    if method_limits := _parse_limits(response.headers.get("X-Method-Rate-Limit")):
+        _method_limits[method_bucket] = method_limits
+
+    await _sync_counts(
+        app_bucket,
+        _app_limits.get(app_bucket, []),
+        _parse_limits(response.headers.get("X-App-Rate-Limit-Count")),
+    )
+    await _sync_counts(
+        method_bucket,
+        _method_limits.get(method_bucket, []),
+        _parse_limits(response.headers.get("X-Method-Rate-Limit-Count")),
+    )
+
+    if response.status_code == 429:
+        bucket = (
+            app_bucket
+            if response.headers.get("X-Rate-Limit-Type") == "application"
+            else method_bucket
+        )
+        await _pause(bucket, _parse_retry_after(response.headers.get("Retry-After")))
+
+    return response
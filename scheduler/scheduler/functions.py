@@ -148,7 +148,7 @@ async def _get_account_details(
         return None
 
     try:
-        response = await client.get(request_url, headers=riot_api.get_headers())
+        response = await riot_api.get(client, request_url)
 
         if response.status_code == 200:
             return response.json()
@@ -173,7 +173,7 @@ async def get_active_match(
     request_url = f"https://{request_region}.api.riotgames.com/lol/spectator/v5/active-games/by-summoner/{puuid}"
 
     try:
-        response = await client.get(request_url, headers=riot_api.get_headers())
+        response = await riot_api.get(client, request_url)
 
         if response.status_code == 200:
             model = models.ActiveMatch(**response.json())
@@ -241,7 +241,7 @@ async def get_match_history(
     request_url = f"https://{request_region}.api.riotgames.com/lol/match/v5/matches/by-puuid/{puuid}/ids?{string_params}"
 
     try:
-        response = await client.get(request_url, headers=riot_api.get_headers())
+        response = await riot_api.get(client, request_url)
 
         if response.status_code == 200:
             return response.json()
@@ -266,7 +266,7 @@ async def get_match_data(
     )
 
     try:
-        response = await client.get(request_url, headers=riot_api.get_headers())
+        response = await riot_api.get(client, request_url)
 
         if response.status_code == 200:
             model = models.MatchHistory(**response.json())
@@ -577,7 +577,7 @@ async def _update_leaderboard_for_region(region):
     request_url = f"https://{request_region}.api.riotgames.com/lol/league/v4/challengerleagues/by-queue/RANKED_SOLO_5x5"
 
     httpx_client = httpx.AsyncClient()
-    response = await httpx_client.get(request_url, headers=riot_api.get_headers())
+    response = await riot_api.get(httpx_client, request_url)
 
     if response.status_code != 200:
         return